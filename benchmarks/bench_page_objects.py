@@ -0,0 +1,193 @@
+"""
+Benchmarks for the page-object operations, run against the local static copy of the search form.
+
+Usage:
+    python benchmarks/bench_page_objects.py --save            # measure and store the baseline
+    python benchmarks/bench_page_objects.py --compare         # measure and fail on regressions
+    python benchmarks/bench_page_objects.py --only enter_origin --trials 20
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from drivers.driver_factory import create_driver
+from pages.home_page import HomePage
+from utils.data_provider import DataProvider
+from utils.instrumentation import percentile
+from utils.replay_server import StaticServer
+
+DEFAULT_BASELINE = os.path.join(project_root, "benchmarks", "baseline.json")
+EXCEL_PATH = os.path.join(project_root, "data", "Iberia_Flight_Data.xlsx")
+
+logger = logging.getLogger(__name__)
+
+
+class Benchmark:
+    """An operation to time. `setup` runs before every trial and is not timed."""
+
+    def __init__(self, name, run, setup=None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+
+
+def _fresh_page(page):
+    """Load the search form again so every trial starts from the same state (cold element cache)."""
+    page.navigate_home()
+
+
+def _accepted_page(page):
+    _fresh_page(page)
+    page.click(page.COOKIE_BTN)
+    page.wait_to_darkfilter()
+
+
+def _open_passengers_with(adult, child, baby):
+    def setup(page):
+        _accepted_page(page)
+        page.click(page.PASSENGERS)
+        page.set_passengers(adult, child, baby)
+    return setup
+
+
+def _warm_origin(page):
+    _accepted_page(page)
+    page.find_object(page.ORIGIN_TXTBOX)
+
+
+def _full_row(page, record):
+    page.enter_origin(record.origin)
+    page.enter_destiny(record.destiny)
+    page.enter_stardate(record.start_date)
+    page.enter_enddate(record.end_date)
+    page.enter_passengers(record.adult, record.child, record.baby)
+    assert page.get_passenger_counts() == (record.adult, record.child, record.baby)
+
+
+def build_benchmarks():
+    """Return the benchmark list. The Excel row is the first row of the project's workbook."""
+    record = next(DataProvider.iter_records(EXCEL_PATH))
+    return [
+        Benchmark("enter_origin", lambda page: page.enter_origin(record.origin), _accepted_page),
+        Benchmark("enter_destiny", lambda page: page.enter_destiny(record.destiny), _accepted_page),
+        Benchmark("enter_dates", lambda page: (page.enter_stardate(record.start_date),
+                                               page.enter_enddate(record.end_date)), _accepted_page),
+        Benchmark("enter_passengers", lambda page: page.enter_passengers(record.adult, record.child, record.baby),
+                  _accepted_page),
+        Benchmark("clear_passengers", lambda page: page.clear_passengers(), _open_passengers_with(4, 2, 2)),
+        Benchmark("find_object_hit", lambda page: page.find_object(page.ORIGIN_TXTBOX), _warm_origin),
+        Benchmark("find_object_miss", lambda page: page.find_object(page.ORIGIN_TXTBOX), _accepted_page),
+        Benchmark("fast_fill", lambda page: page.fast_fill(record.origin, record.destiny,
+                                                          record.start_date, record.end_date), _accepted_page),
+        Benchmark("excel_row", lambda page: _full_row(page, record), _accepted_page),
+    ]
+
+
+def summarize(durations):
+    """Statistics of a list of durations in seconds, reported in milliseconds."""
+    return {
+        "trials": len(durations),
+        "mean_ms": round(statistics.mean(durations) * 1000, 2),
+        "median_ms": round(statistics.median(durations) * 1000, 2),
+        "stdev_ms": round(statistics.stdev(durations) * 1000, 2) if len(durations) > 1 else 0.0,
+        "min_ms": round(min(durations) * 1000, 2),
+        "p95_ms": round(percentile(durations, 0.95) * 1000, 2),
+        "max_ms": round(max(durations) * 1000, 2),
+    }
+
+
+def run_benchmark(page, benchmark, warmup, trials):
+    """Run `warmup` untimed and `trials` timed iterations and return their statistics."""
+    durations = []
+    for iteration in range(warmup + trials):
+        if benchmark.setup:
+            benchmark.setup(page)
+        start = time.perf_counter()
+        benchmark.run(page)
+        elapsed = time.perf_counter() - start
+        if iteration >= warmup:
+            durations.append(elapsed)
+    return summarize(durations)
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare medians with the baseline. Returns the list of regressions: metrics whose median
+    grew more than `threshold` (a fraction, 0.10 = 10 %).
+    """
+    regressions = []
+    print(f"{'benchmark':<20}{'baseline ms':>14}{'current ms':>14}{'change':>10}")
+    for name, stats in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            print(f"{name:<20}{'-':>14}{stats['median_ms']:>14}{'new':>10}")
+            continue
+        change = (stats["median_ms"] - reference["median_ms"]) / reference["median_ms"]
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<20}{reference['median_ms']:>14}{stats['median_ms']:>14}{change:>+10.1%}{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de los page objects contra la copia local del formulario.")
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox"])
+    parser.add_argument("--headed", action="store_true", help="Mostrar el navegador (por defecto headless)")
+    parser.add_argument("--warmup", type=int, default=3, help="Iteraciones sin medir por benchmark")
+    parser.add_argument("--trials", type=int, default=10, help="Iteraciones medidas por benchmark")
+    parser.add_argument("--only", action="append", help="Ejecutar solo estos benchmarks (repetible)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Fichero de baseline")
+    parser.add_argument("--save", action="store_true", help="Guardar los resultados como baseline")
+    parser.add_argument("--compare", action="store_true", help="Comparar con la baseline y fallar si hay regresiones")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Regresión máxima tolerada de la mediana (0.10 = 10%%)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    benchmarks = [b for b in build_benchmarks() if not args.only or b.name in args.only]
+    server = StaticServer().start()
+    driver = create_driver(args.browser, headless=not args.headed)
+    results = {}
+    try:
+        page = HomePage(driver)
+        page.URL = server.url + "index.html"
+        for benchmark in benchmarks:
+            results[benchmark.name] = run_benchmark(page, benchmark, args.warmup, args.trials)
+            stats = results[benchmark.name]
+            print(f"{benchmark.name:<20} median {stats['median_ms']:>9} ms  p95 {stats['p95_ms']:>9} ms  "
+                  f"stdev {stats['stdev_ms']:>8} ms")
+    finally:
+        driver.quit()
+        server.stop()
+
+    exit_code = 0
+    if args.compare:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print(f"Regresiones por encima del {args.threshold:.0%}: {', '.join(regressions)}")
+            exit_code = 1
+
+    if args.save:
+        baseline = {
+            "meta": {"browser": args.browser, "python": platform.python_version(), "platform": platform.platform(),
+                     "warmup": args.warmup, "trials": args.trials, "date": time.strftime("%Y-%m-%d %H:%M:%S")},
+            "results": results,
+        }
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=2)
+        print(f"Baseline guardada en {args.baseline}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+import asyncio
+import json
+import logging
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.by import By
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+from drivers.driver_factory import SUPPORTED_BROWSERS, build_options, resolve_driver_path
+from drivers.resource_policy import PageStats, ResourcePolicy
+from utils.instrumentation import recorder
+
+logger = logging.getLogger(__name__)
+
+# Key the W3C protocol uses to serialize element references
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+SERVICES = {"chrome": ChromeService, "firefox": FirefoxService}
+
+
+def _w3c_locator(by, value):
+    """Translate the locator strategies W3C does not define to CSS, as selenium does."""
+    if by == By.ID:
+        return By.CSS_SELECTOR, f'[id="{value}"]'
+    if by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f".{value}"
+    if by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{value}"]'
+    return by, value
+
+
+class AsyncWebElement:
+    """Reference to an element of an AsyncWebDriver session."""
+
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.id = element_id
+
+    def _path(self, command):
+        return f"/element/{self.id}/{command}"
+
+    async def click(self):
+        await self.driver.execute("POST", self._path("click"), {})
+
+    async def clear(self):
+        await self.driver.execute("POST", self._path("clear"), {})
+
+    async def send_keys(self, text):
+        await self.driver.execute("POST", self._path("value"), {"text": str(text)})
+
+    async def text(self):
+        return await self.driver.execute("GET", self._path("text"))
+
+    async def get_attribute(self, name):
+        """Same rule as WebElement.get_attribute: prefer the DOM property, fall back to the attribute."""
+        value = await self.driver.execute("GET", self._path(f"property/{name}"))
+        if value is None or isinstance(value, (dict, list)):
+            return await self.driver.execute("GET", self._path(f"attribute/{name}"))
+        if isinstance(value, bool):
+            return "true" if value else None
+        return str(value)
+
+    async def is_displayed(self):
+        return await self.driver.execute("GET", self._path("displayed"))
+
+    async def is_enabled(self):
+        return await self.driver.execute("GET", self._path("enabled"))
+
+    def __eq__(self, other):
+        return isinstance(other, AsyncWebElement) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class AsyncWebDriver:
+    """
+    One browser session driven over the W3C WebDriver HTTP protocol with a shared aiohttp client.
+    Commands are coroutines, so a single event loop can drive many sessions while they wait.
+    """
+
+    def __init__(self, http, service_url, session_id, capabilities):
+        """
+        Args:
+            http (aiohttp.ClientSession): Pooled HTTP client shared by all sessions of a service.
+            service_url (str): Base URL of the driver service.
+            session_id (str): WebDriver session id.
+            capabilities (dict): Capabilities returned by the driver.
+        """
+        self.http = http
+        self.session_url = f"{service_url}/session/{session_id}"
+        self.session_id = session_id
+        self.capabilities = capabilities
+        self.name = capabilities.get("browserName")
+        self._error_handler = ErrorHandler()
+
+    async def execute(self, method, path, payload=None):
+        """
+        Send a command for this session and return its 'value'.
+
+        Raises:
+            WebDriverException: The selenium exception matching the W3C error (NoSuchElementException, ...).
+        """
+        if recorder.enabled:
+            recorder.count_command()
+        return await _request(self.http, self._error_handler, method, self.session_url + path, payload, self)
+
+    async def get(self, url):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def current_url(self):
+        return await self.execute("GET", "/url")
+
+    async def maximize_window(self):
+        await self.execute("POST", "/window/maximize", {})
+
+    async def set_script_timeout(self, seconds):
+        await self.execute("POST", "/timeouts", {"script": int(seconds * 1000)})
+
+    async def find_element(self, by, value):
+        using, value = _w3c_locator(by, value)
+        return await self.execute("POST", "/element", {"using": using, "value": value})
+
+    async def find_elements(self, by, value):
+        using, value = _w3c_locator(by, value)
+        return await self.execute("POST", "/elements", {"using": using, "value": value})
+
+    async def execute_script(self, script, *args):
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": _encode(args)})
+
+    async def execute_async_script(self, script, *args):
+        return await self.execute("POST", "/execute/async", {"script": script, "args": _encode(args)})
+
+    async def execute_cdp_cmd(self, cmd, params=None):
+        """Run a Chrome DevTools command (chromedriver only)."""
+        if self.name != "chrome":
+            raise WebDriverException(f"CDP is not available for {self.name}")
+        return await self.execute("POST", "/goog/cdp/execute", {"cmd": cmd, "params": params or {}})
+
+    async def quit(self):
+        await self.execute("DELETE", "")
+
+
+def _encode(value):
+    """Serialize AsyncWebElements in script arguments as W3C element references."""
+    if isinstance(value, AsyncWebElement):
+        return {ELEMENT_KEY: value.id}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value, driver):
+    """Turn W3C element references in a response into AsyncWebElements."""
+    if isinstance(value, dict):
+        if ELEMENT_KEY in value and driver is not None:
+            return AsyncWebElement(driver, value[ELEMENT_KEY])
+        return {key: _decode(item, driver) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item, driver) for item in value]
+    return value
+
+
+async def _request(http, error_handler, method, url, payload, driver=None):
+    async with http.request(method, url, json=payload) as response:
+        body = await response.text()
+    if response.status >= 400:
+        # Same mapping from W3C error codes to selenium exceptions as the blocking client
+        error_handler.check_response({"status": response.status, "value": body})
+    return _decode(json.loads(body).get("value") if body else None, driver)
+
+
+class AsyncDriverService:
+    """
+    A driver process (chromedriver/geckodriver) and a pooled aiohttp client, shared by every
+    session started from it. Use it as an async context manager:
+
+        async with AsyncDriverService("chrome", headless=True) as service:
+            drivers = await asyncio.gather(*(service.new_session() for _ in range(10)))
+    """
+
+    def __init__(self, browser_choice, browser_version=None, fetch_drivers=False, resource_policy=None,
+                 headless=False, max_connections=100):
+        """
+        Args:
+            browser_choice (str): 'chrome' or 'firefox'.
+            browser_version (str): Browser major version used to pick the cached driver (detected when None).
+            fetch_drivers (bool): Allow downloading the driver when it is not cached.
+            resource_policy (ResourcePolicy): Request blocking and page-load strategy (defaults to none).
+            headless (bool): Run the browsers without UI.
+            max_connections (int): Size of the HTTP connection pool to the driver.
+
+        Raises:
+            ValueError: If the browser is not supported.
+        """
+        if browser_choice not in SUPPORTED_BROWSERS:
+            raise ValueError(f"Unsupported browser: {browser_choice}")
+        self.browser_choice = browser_choice
+        self.browser_version = browser_version
+        self.fetch_drivers = fetch_drivers
+        self.resource_policy = resource_policy or ResourcePolicy()
+        self.headless = headless
+        self.max_connections = max_connections
+        self.http = None
+        self._service = None
+        self._error_handler = ErrorHandler()
+        self._sessions = set()
+
+    async def start(self):
+        """Start the driver process and open the HTTP connection pool."""
+        import aiohttp  # Only needed by the async page objects
+
+        driver_path = resolve_driver_path(self.browser_choice, self.browser_version, self.fetch_drivers)
+        self._service = SERVICES[self.browser_choice](driver_path)
+        await asyncio.get_running_loop().run_in_executor(None, self._service.start)
+        self.http = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.max_connections))
+        logger.info("Started %s service at %s", self.browser_choice, self._service.service_url)
+        return self
+
+    async def new_session(self):
+        """Open a new browser session on this service."""
+        options = build_options(self.browser_choice, self.resource_policy, self.headless)
+        payload = {"capabilities": {"firstMatch": [{}], "alwaysMatch": options.to_capabilities()}}
+        value = await _request(self.http, self._error_handler, "POST",
+                               f"{self._service.service_url}/session", payload)
+        driver = AsyncWebDriver(self.http, self._service.service_url, value["sessionId"], value["capabilities"])
+        driver.resource_policy = self.resource_policy
+        driver.page_stats = PageStats()
+        if self.resource_policy.blocks_requests and self.browser_choice == "chrome":
+            await driver.execute_cdp_cmd("Network.enable")
+            await driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.resource_policy.url_patterns()})
+        self._sessions.add(driver)
+        return driver
+
+    async def close(self):
+        """Quit the remaining sessions, close the HTTP pool and stop the driver process."""
+        results = await asyncio.gather(*(driver.quit() for driver in self._sessions), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Error quitting session: %s", result)
+        self._sessions.clear()
+        if self.http is not None:
+            await self.http.close()
+        if self._service is not None:
+            self._service.stop()
+
+    async def release(self, driver):
+        """Quit one session."""
+        self._sessions.discard(driver)
+        await driver.quit()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -1,21 +1,35 @@
+import argparse
 import os
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
+import sys
 
-# Define the path where the drivers will be stored (assuming a "drivers" folder)
-DRIVER_PATH = os.path.join(os.getcwd(), "drivers")
+# Allow running this file directly as a script from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Ensure the "drivers" folder exists, create it if not
-if not os.path.exists(DRIVER_PATH):
-    os.makedirs(DRIVER_PATH)
+from drivers.driver_resolver import DriverResolver
 
-def download_chrome_driver():
-    chrome_driver_path = ChromeDriverManager().install()
+
+def download_chrome_driver(browser_version=None, expected_sha256=None, driver_version=None):
+    chrome_driver_path = DriverResolver().fetch("chrome", browser_version, expected_sha256, driver_version)
     print(f"ChromeDriver descargado en: {chrome_driver_path}")
     return chrome_driver_path
 
-def download_gecko_driver():
-    gecko_driver_path = GeckoDriverManager().install()
+
+def download_gecko_driver(browser_version=None, expected_sha256=None, driver_version=None):
+    gecko_driver_path = DriverResolver().fetch("firefox", browser_version, expected_sha256, driver_version)
     print(f"GeckoDriver descargado en: {gecko_driver_path}")
     return gecko_driver_path
 
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Descarga los drivers y los guarda en la caché local de drivers/cache.")
+    parser.add_argument("--browser", choices=["chrome", "firefox", "all"], default="all")
+    parser.add_argument("--browser-version", help="Versión mayor del navegador (por defecto se detecta la instalada)")
+    parser.add_argument("--sha256", help="Checksum esperado del driver descargado; si coincide, queda fijado en manifest.json")
+    parser.add_argument("--driver-version",
+                        help="Versión exacta del driver (por defecto la de la versión de Chrome; para geckodriver, la más reciente fijada)")
+    args = parser.parse_args()
+
+    if args.browser in ("chrome", "all"):
+        download_chrome_driver(args.browser_version, args.sha256, args.driver_version)
+    if args.browser in ("firefox", "all"):
+        download_gecko_driver(args.browser_version, args.sha256, args.driver_version)
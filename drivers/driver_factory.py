@@ -0,0 +1,89 @@
+import logging
+import os
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+from drivers.driver_resolver import DriverNotCachedError, DriverResolver, DRIVERS_DIR, DRIVER_NAMES
+from drivers.resource_policy import ResourcePolicy
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BROWSERS = tuple(DRIVER_NAMES)
+
+
+def resolve_driver_path(browser_choice, browser_version=None, fetch_drivers=False):
+    """
+    Return the driver binary for a browser.
+
+    The driver comes from the local version-pinned cache (no network on a hit). On a miss it is
+    downloaded into the cache only if `fetch_drivers` is set. Otherwise the legacy driver in the
+    'drivers' directory is used if present, and else None so Selenium Manager resolves it.
+    """
+    try:
+        return DriverResolver().resolve(browser_choice, browser_version, fetch=fetch_drivers)
+    except DriverNotCachedError as e:
+        local_driver_path = os.path.join(DRIVERS_DIR, DRIVER_NAMES[browser_choice])
+        if os.path.exists(local_driver_path):
+            logger.warning("%s Using local driver from: %s", e, local_driver_path)
+            return local_driver_path
+        logger.warning("%s Leaving the driver to Selenium Manager.", e)
+        return None
+
+
+def build_options(browser_choice, resource_policy=None, headless=False, profile_dir=None):
+    """Return the browser Options for a new session, with the resource policy applied."""
+    if browser_choice == "chrome":
+        options = ChromeOptions()
+        if headless:
+            options.add_argument("--headless=new")
+        if profile_dir:
+            options.add_argument(f"--user-data-dir={profile_dir}")
+    else:
+        options = FirefoxOptions()
+        if headless:
+            options.add_argument("--headless")
+        if profile_dir:
+            # Use the directory in place; Options.profile would zip it and copy it over the wire
+            options.add_argument("-profile")
+            options.add_argument(profile_dir)
+    (resource_policy or ResourcePolicy()).apply_options(options, browser_choice)
+    return options
+
+
+def create_driver(browser_choice, browser_version=None, fetch_drivers=False, resource_policy=None, headless=False,
+                  profile_dir=None):
+    """
+    Starts a new WebDriver for the given browser.
+
+    Args:
+        browser_choice (str): 'chrome' or 'firefox'.
+        browser_version (str): Browser major version used to pick the cached driver (detected when None).
+        fetch_drivers (bool): Allow downloading the driver when it is not cached.
+        resource_policy (ResourcePolicy): Request blocking and page-load strategy (defaults to none).
+        headless (bool): Run the browser without UI.
+        profile_dir (str): Browser profile directory to start from (a fresh temporary profile when None).
+
+    Returns:
+        WebDriver: A started WebDriver instance.
+
+    Raises:
+        ValueError: If the browser is not supported.
+    """
+    if browser_choice not in SUPPORTED_BROWSERS:
+        raise ValueError(f"Unsupported browser: {browser_choice}")
+
+    resource_policy = resource_policy or ResourcePolicy()
+    driver_path = resolve_driver_path(browser_choice, browser_version, fetch_drivers)
+    options = build_options(browser_choice, resource_policy, headless, profile_dir)
+    if browser_choice == "chrome":
+        driver = webdriver.Chrome(service=ChromeService(driver_path), options=options)
+    else:
+        driver = webdriver.Firefox(service=FirefoxService(driver_path), options=options)
+    resource_policy.apply(driver)
+    logger.info("Started %s with driver: %s", browser_choice, driver_path)
+
+    return driver
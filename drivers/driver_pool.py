@@ -0,0 +1,205 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Clears Web Storage for the origin currently loaded in the browser
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class DriverPool:
+    """
+    Pool of pre-launched WebDriver instances handed out one test at a time.
+
+    Browsers are started up front and kept warm. Between leases a browser is reset
+    (cookies, storage, about:blank) instead of being relaunched; with a profile snapshot
+    the snapshot's cookies and storage are put back after clearing. Dead sessions are
+    replaced on acquire, and a browser is retired after `max_uses` leases.
+
+    The pool never owns more than `size` browsers: retired browsers are replaced, and
+    acquire waits for a leased one to come back instead of launching extra ones.
+    """
+
+    def __init__(self, factory, size=1, max_uses=25, acquire_timeout=60, snapshot=None):
+        """
+        Launch `size` browsers with `factory` and keep them idle in the pool.
+
+        Args:
+            factory (callable): Function with no arguments that returns a new WebDriver.
+            size (int): Number of browsers kept warm.
+            max_uses (int): Number of leases after which a browser is retired and replaced.
+            acquire_timeout (int): Seconds to wait for an idle browser before giving up.
+            snapshot (ProfileSnapshot): Profile whose consent cookies and storage survive a reset.
+                A browser's `profile_dir` attribute, if set, is the snapshot clone deleted when it retires.
+        """
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {size}")
+        if max_uses < 1:
+            raise ValueError(f"max_uses must be at least 1, got {max_uses}")
+
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.snapshot = snapshot
+        self._idle = queue.Queue()
+        self._drivers = {}  # id(driver) -> driver, every browser owned by the pool
+        self._uses = {}  # id(driver) -> number of leases
+        self._lock = threading.Lock()
+        self._launchers = []
+        self._launching = 0  # Replacement launches in progress, counted against `size`
+        self._closed = False
+
+        for _ in range(size):
+            self._idle.put(self._launch())
+
+    def _launch(self):
+        """Start a new browser and register it in the pool."""
+        driver = self.factory()
+        with self._lock:
+            self._drivers[id(driver)] = driver
+            self._uses[id(driver)] = 0
+        logger.info("Launched pooled browser %s", id(driver))
+        return driver
+
+    def _replenish(self):
+        """Launch a replacement browser and leave it idle (runs in a background thread)."""
+        try:
+            driver = self._launch()
+        except Exception as e:
+            logger.error("Error launching replacement browser: %s", e)
+            return
+        finally:
+            with self._lock:
+                self._launching -= 1
+        if self._closed:
+            self._retire(driver)
+        else:
+            self._idle.put(driver)
+
+    def _replenish_in_background(self):
+        """Start a replacement browser without blocking the test thread."""
+        with self._lock:
+            self._launching += 1
+        launcher = threading.Thread(target=self._replenish, name="driver-pool-launcher", daemon=True)
+        launcher.start()
+        self._launchers.append(launcher)
+
+    def _retire(self, driver):
+        """Quit a browser and forget it, ignoring errors from already dead sessions."""
+        with self._lock:
+            self._drivers.pop(id(driver), None)
+            uses = self._uses.pop(id(driver), 0)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning("Error quitting browser %s: %s", id(driver), e)
+        profile_dir = getattr(driver, "profile_dir", None)
+        if profile_dir and self.snapshot is not None:
+            self.snapshot.discard(profile_dir)
+        logger.info("Retired pooled browser %s after %s uses", id(driver), uses)
+
+    @staticmethod
+    def is_alive(driver):
+        """Health check: return True if the browser session still answers commands."""
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def reset(self, driver):
+        """Clear cookies and storage, restore the snapshot state if any, and leave the browser on about:blank."""
+        if driver.capabilities.get("browserName") == "chrome":
+            # CDP clears cookies for every domain, not only the current one
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            driver.delete_all_cookies()
+        driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        if self.snapshot is not None:
+            # Done before leaving the page: outside Chrome cookies can only be set for the current domain
+            self.snapshot.restore(driver)
+        driver.get("about:blank")
+
+    def acquire(self):
+        """
+        Take a healthy browser out of the pool.
+
+        Waits up to `acquire_timeout` seconds for an idle browser. If none shows up, a browser is
+        launched only when the pool owns fewer than `size` (a replacement failed to start).
+        A dead session is retired and replaced before being handed out.
+
+        Raises:
+            TimeoutError: If all `size` browsers stay leased for `acquire_timeout` seconds.
+        """
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+        try:
+            driver = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            with self._lock:
+                owned = len(self._drivers) + self._launching
+            if owned >= self.size:
+                raise TimeoutError(
+                    f"No idle browser after {self.acquire_timeout}s: all {self.size} pooled browsers are leased"
+                )
+            logger.warning("No idle browser and the pool owns %s of %s browsers, launching one.", owned, self.size)
+            driver = self._launch()
+
+        if not self.is_alive(driver):
+            logger.warning("Pooled browser %s is dead, replacing it.", id(driver))
+            self._retire(driver)
+            driver = self._launch()
+
+        with self._lock:
+            self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver, retire=False):
+        """
+        Give a browser back to the pool.
+
+        The browser is reset for the next lease, or retired and replaced in the background
+        when `retire` is set, when it reached `max_uses` or when the reset fails.
+        """
+        if self._closed:
+            self._retire(driver)
+            return
+
+        if retire or self._uses.get(id(driver), 0) >= self.max_uses:
+            self._retire(driver)
+            self._replenish_in_background()
+            return
+
+        try:
+            self.reset(driver)
+        except Exception as e:
+            logger.warning("Error resetting browser %s, replacing it: %s", id(driver), e)
+            self._retire(driver)
+            self._replenish_in_background()
+            return
+
+        self._idle.put(driver)
+
+    @contextmanager
+    def lease(self):
+        """Context manager that acquires a browser and always releases it."""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quit every browser owned by the pool, idle or leased."""
+        self._closed = True
+        for launcher in self._launchers:
+            launcher.join(timeout=self.acquire_timeout)
+        with self._lock:
+            drivers = list(self._drivers.values())
+        for driver in drivers:
+            self._retire(driver)
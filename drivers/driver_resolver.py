@@ -0,0 +1,250 @@
+import hashlib
+import json
+import logging
+import os
+import platform
+import re
+import shutil
+import stat
+import subprocess
+import sys
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+DRIVERS_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(DRIVERS_DIR, "cache")
+MANIFEST_NAME = "manifest.json"
+# Manifest section with the trusted driver checksums: driver -> driver version -> platform -> sha256
+PINS_KEY = "pins"
+
+# Driver executable name and candidate browser binaries for each supported browser
+DRIVER_NAMES = {"chrome": "chromedriver", "firefox": "geckodriver"}
+BROWSER_BINARIES = {
+    "chrome": ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"),
+    "firefox": ("firefox",),
+}
+VERSION_PATTERN = re.compile(r"(\d+)\.\d+")
+
+# Chrome for Testing: newest chromedriver of each Chrome milestone (115 and later)
+CHROME_MILESTONES_URL = "https://googlechromelabs.github.io/chrome-for-testing/latest-versions-per-milestone.json"
+# Older Chrome majors: newest chromedriver of the major, as plain text
+CHROME_LEGACY_RELEASE_URL = "https://chromedriver.storage.googleapis.com/LATEST_RELEASE_{}"
+
+
+class DriverNotCachedError(RuntimeError):
+    """Raised when no cached driver matches the browser and fetching was not requested."""
+
+
+class ChecksumMismatchError(RuntimeError):
+    """Raised when a fetched driver does not match the checksum pinned in the manifest."""
+
+
+class DriverNotPinnedError(RuntimeError):
+    """Raised when a driver would be fetched without a pinned checksum to verify it against."""
+
+
+def driver_platform():
+    """Return the key the driver pins are recorded under for this machine, e.g. 'linux-x86_64'."""
+    return f"{sys.platform}-{platform.machine().lower()}"
+
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detect_browser_version(browser):
+    """
+    Return the major version of the locally installed browser (e.g. '130'), or None if not found.
+    Runs the browser binary with '--version', which takes milliseconds and needs no network.
+    """
+    for binary in BROWSER_BINARIES.get(browser, ()):
+        executable = shutil.which(binary)
+        if not executable:
+            continue
+        try:
+            output = subprocess.run(
+                [executable, "--version"], capture_output=True, text=True, timeout=5
+            ).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning("Could not read version from %s: %s", executable, e)
+            continue
+        match = VERSION_PATTERN.search(output)
+        if match:
+            return match.group(1)
+    return None
+
+
+def chromedriver_version(major):
+    """Return the full chromedriver version that matches a Chrome major version, e.g. '130' -> '130.0.6723.116'."""
+    if int(major) >= 115:
+        with urllib.request.urlopen(CHROME_MILESTONES_URL, timeout=30) as response:
+            milestones = json.load(response)["milestones"]
+        if major not in milestones:
+            raise DriverNotCachedError(f"Chrome for Testing has no chromedriver for Chrome {major}")
+        return milestones[major]["version"]
+    with urllib.request.urlopen(CHROME_LEGACY_RELEASE_URL.format(major), timeout=30) as response:
+        return response.read().decode("ascii").strip()
+
+
+def install_with_webdriver_manager(browser, driver_version=None):
+    """
+    Download a driver with webdriver_manager and return its path (needs network).
+    Without driver_version webdriver_manager picks the driver for the installed browser.
+    """
+    # webdriver_manager is only needed when downloading, keep it off the resolve path
+    if browser == "chrome":
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager(driver_version=driver_version).install()
+    from webdriver_manager.firefox import GeckoDriverManager
+    return GeckoDriverManager(version=driver_version).install()
+
+
+class DriverResolver:
+    """
+    Resolves the driver binary for a browser from a local, version-pinned cache.
+
+    The manifest maps browser -> browser major version -> cached driver binary and its
+    SHA-256 checksum. Resolution on a cache hit is a file lookup and needs no network.
+    Downloading only happens when explicitly requested with `fetch=True`.
+
+    Downloads are never trusted blindly: the committed manifest pins the checksum of each driver
+    version per platform, and a driver without a pin is only fetched when `expected_sha256` is given,
+    which then pins it for later downloads.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        """Load the manifest, or return an empty one if it does not exist yet."""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logger.error("Ignoring corrupt driver manifest %s: %s", self.manifest_path, e)
+            return {}
+
+    def _save_manifest(self):
+        """Write the manifest atomically so a killed process never leaves it half written."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.manifest, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _entry(self, browser, version):
+        """Return the manifest entry for a browser version, or the newest one when version is None."""
+        entries = self.manifest.get(browser, {})
+        if version is not None:
+            return entries.get(version)
+        if not entries:
+            return None
+        return entries[max(entries, key=int)]
+
+    def resolve(self, browser, browser_version=None, fetch=False, verify=False):
+        """
+        Return the absolute path of the driver binary for `browser`.
+
+        Args:
+            browser (str): 'chrome' or 'firefox'.
+            browser_version (str): Browser major version to resolve. Detected locally when None.
+            fetch (bool): Download and cache the driver on a cache miss (needs network).
+            verify (bool): Re-check the cached binary against its recorded checksum.
+
+        Raises:
+            DriverNotCachedError: On a cache miss when `fetch` is False.
+        """
+        if browser not in DRIVER_NAMES:
+            raise ValueError(f"Unsupported browser: {browser}")
+
+        version = browser_version or detect_browser_version(browser)
+        entry = self._entry(browser, version)
+        if entry:
+            path = os.path.join(self.cache_dir, entry["path"])
+            if os.path.exists(path) and (not verify or file_sha256(path) == entry["sha256"]):
+                logger.info("Resolved %s for %s %s from cache: %s", DRIVER_NAMES[browser], browser, version or 'latest', path)
+                return path
+            logger.warning("Cached driver for %s %s is missing or does not match its checksum.", browser, version)
+
+        if not fetch:
+            raise DriverNotCachedError(
+                f"No cached {DRIVER_NAMES[browser]} for {browser} {version or '(unknown version)'}. "
+                f"Run 'python drivers/download_drivers.py --browser {browser}' or pass --fetch-drivers."
+            )
+        return self.fetch(browser, version)
+
+    def _pins(self, browser):
+        """Return the pinned checksums of a browser's driver for this platform, keyed by driver version."""
+        versions = self.manifest.get(PINS_KEY, {}).get(DRIVER_NAMES[browser], {})
+        current_platform = driver_platform()
+        return {version: sums[current_platform] for version, sums in versions.items() if current_platform in sums}
+
+    def _pin(self, browser, driver_version, checksum):
+        """Record a verified checksum in the manifest pins."""
+        versions = self.manifest.setdefault(PINS_KEY, {}).setdefault(DRIVER_NAMES[browser], {})
+        versions.setdefault(driver_version, {})[driver_platform()] = checksum
+
+    def fetch(self, browser, browser_version=None, expected_sha256=None, driver_version=None):
+        """
+        Download the driver for a browser version with webdriver_manager, verify it and store it in the cache.
+
+        Chrome gets the chromedriver of the requested major version. geckodriver releases are not tied
+        to a Firefox version, so without `driver_version` the newest pinned geckodriver is cached for it.
+
+        The checksum is compared with `expected_sha256` or, if not given, with the one pinned in the
+        manifest for that driver version and platform. `expected_sha256` is pinned once it matches.
+
+        Raises:
+            DriverNotPinnedError: If there is neither `expected_sha256` nor a pinned checksum.
+            ChecksumMismatchError: If the downloaded binary does not match the pinned checksum.
+        """
+        version = browser_version or detect_browser_version(browser)
+        if version is None:
+            raise RuntimeError(f"Cannot detect the installed {browser} version, pass it explicitly.")
+
+        driver_name = DRIVER_NAMES[browser]
+        pins = self._pins(browser)
+        if browser == "chrome" and driver_version is None:
+            driver_version = chromedriver_version(version)
+        elif browser == "firefox" and driver_version is None and pins:
+            driver_version = max(pins, key=lambda pinned: tuple(int(part) for part in pinned.split(".")))
+            logger.info("Caching geckodriver %s, the newest pinned one, for Firefox %s.", driver_version, version)
+
+        pinned = expected_sha256 or pins.get(driver_version)
+        if not pinned:
+            raise DriverNotPinnedError(
+                f"No pinned checksum for {driver_name} {driver_version or '(any version)'} on {driver_platform()}. "
+                f"Run 'python drivers/download_drivers.py --browser {browser} --driver-version <version> "
+                f"--sha256 <checksum>' to pin it in {self.manifest_path}."
+            )
+        downloaded_path = install_with_webdriver_manager(browser, driver_version)
+
+        checksum = file_sha256(downloaded_path)
+        if pinned != checksum:
+            raise ChecksumMismatchError(
+                f"Checksum mismatch for {downloaded_path}: expected {pinned}, got {checksum}"
+            )
+
+        relative_path = os.path.join(browser, version, driver_name)
+        cached_path = os.path.join(self.cache_dir, relative_path)
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        shutil.copy2(downloaded_path, cached_path)
+        os.chmod(cached_path, os.stat(cached_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+        self._pin(browser, driver_version, checksum)
+        self.manifest.setdefault(browser, {})[version] = {
+            "path": relative_path, "sha256": checksum, "driver_version": driver_version,
+        }
+        self._save_manifest()
+        logger.info("Cached %s %s for %s %s at %s", driver_name, driver_version, browser, version, cached_path)
+        return cached_path
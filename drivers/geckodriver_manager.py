@@ -23,7 +23,7 @@ def get_firefox_driver():
 
     # Configure Firefox options
     options = Options()
-    options.add_argument("--headless") = True  # Run Firefox in headless mode (without UI)
+    options.add_argument("--headless")  # Run Firefox in headless mode (without UI)
     options.add_argument("--disable-gpu")  # Disable GPU hardware acceleration (useful for headless mode)
     options.add_argument("--no-sandbox")  # Disable the sandbox for Docker environments
 
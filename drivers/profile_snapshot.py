@@ -0,0 +1,210 @@
+"""
+Browser profile snapshot taken after accepting the cookie banner, so later sessions start with the
+consent cookies, localStorage and a warm disk cache.
+
+Usage:
+    python drivers/profile_snapshot.py --browser chrome      # (re)capture the snapshot
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from drivers.driver_resolver import DRIVERS_DIR
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = os.path.join(DRIVERS_DIR, "profiles")
+SNAPSHOT_META = "snapshot.json"
+
+# Lock files a browser leaves in its profile; a clone carrying them refuses to start
+PROFILE_LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lock", ".parentlock", "parent.lock")
+
+# Reads localStorage of the current origin
+DUMP_STORAGE_SCRIPT = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return {origin: window.location.origin, items: items};
+"""
+
+# Writes the snapshot's localStorage back when the current page has the same origin
+RESTORE_STORAGE_SCRIPT = """
+if (window.location.origin !== arguments[0]) { return false; }
+var items = arguments[1];
+Object.keys(items).forEach(function (key) { window.localStorage.setItem(key, items[key]); });
+return true;
+"""
+
+# Settle time after consent so deferred scripts and assets land in the disk cache
+SETTLE_SECONDS = 3
+
+
+def _cdp_cookie(cookie):
+    """Convert a selenium cookie to a CDP Network.CookieParam."""
+    param = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly") if key in cookie}
+    if "expiry" in cookie:
+        param["expires"] = cookie["expiry"]
+    if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+        param["sameSite"] = cookie["sameSite"]
+    return param
+
+
+def _copy_tree(source, destination):
+    """Copy a directory, sharing blocks with the source where the filesystem supports reflinks."""
+    try:
+        subprocess.run(["cp", "-a", "--reflink=auto", source, destination],
+                       check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError):
+        shutil.copytree(source, destination, symlinks=True, dirs_exist_ok=True)
+
+
+def _remove_locks(profile_dir):
+    for name in PROFILE_LOCK_FILES:
+        path = os.path.join(profile_dir, name)
+        if os.path.lexists(path):
+            os.remove(path)
+
+
+class ProfileSnapshot:
+    """
+    A captured browser profile in drivers/profiles/<browser>/, plus the consent cookies and
+    localStorage recorded at capture time. Each browser gets its own clone of the profile.
+
+    Snapshots of a local copy of the site ('replay', 'local-site') live in drivers/profiles/<browser>-<site>/,
+    since their cookies belong to the local server and not to iberia.com.
+    """
+
+    def __init__(self, browser_choice, site="live", root=PROFILES_DIR):
+        self.browser_choice = browser_choice
+        self.site = site
+        self.directory = os.path.join(root, browser_choice if site == "live" else f"{browser_choice}-{site}")
+        self.profile_dir = os.path.join(self.directory, "profile")
+        self.meta_path = os.path.join(self.directory, SNAPSHOT_META)
+        self.meta = None
+        self._clones_dir = None
+        if self.exists():
+            with open(self.meta_path, encoding="utf-8") as file:
+                self.meta = json.load(file)
+
+    def exists(self):
+        return os.path.isdir(self.profile_dir) and os.path.exists(self.meta_path)
+
+    @property
+    def age(self):
+        """Seconds since the snapshot was captured (None when there is no snapshot)."""
+        return time.time() - self.meta["captured_at"] if self.meta else None
+
+    def capture(self, url, driver_factory):
+        """
+        Accept the cookie banner on a fresh profile and store the profile as the snapshot.
+
+        Args:
+            url (str): Home page URL.
+            driver_factory (callable): profile_dir -> WebDriver started on that profile.
+        """
+        from pages.home_page import HomePage
+
+        os.makedirs(self.directory, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="profile-", dir=self.directory)
+        driver = driver_factory(work_dir)
+        try:
+            page = HomePage(driver)
+            page.URL = url
+            page.navigate_home()
+            if page.find_object(page.COOKIE_BTN):
+                page.click(page.COOKIE_BTN)
+                page.wait_to_darkfilter()
+            time.sleep(SETTLE_SECONDS)
+            meta = {
+                "browser": self.browser_choice,
+                "url": url,
+                "captured_at": time.time(),
+                "cookies": driver.get_cookies(),
+                "local_storage": driver.execute_script(DUMP_STORAGE_SCRIPT),
+            }
+        finally:
+            # Quitting flushes cookies and cache to disk
+            driver.quit()
+
+        _remove_locks(work_dir)
+        old_profile = self.profile_dir + ".old"
+        if os.path.exists(self.profile_dir):
+            os.replace(self.profile_dir, old_profile)
+        os.replace(work_dir, self.profile_dir)
+        shutil.rmtree(old_profile, ignore_errors=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(meta, file, indent=2)
+        os.replace(tmp_path, self.meta_path)
+        self.meta = meta
+        logger.info("Captured %s profile snapshot with %s cookies", self.browser_choice, len(meta["cookies"]))
+
+    def clone(self):
+        """Return a private copy of the snapshot profile for one browser."""
+        if self._clones_dir is None:
+            self._clones_dir = tempfile.mkdtemp(prefix=f"{self.browser_choice}-profiles-")
+        clone_dir = tempfile.mkdtemp(dir=self._clones_dir)
+        os.rmdir(clone_dir)
+        _copy_tree(self.profile_dir, clone_dir)
+        _remove_locks(clone_dir)
+        return clone_dir
+
+    def discard(self, clone_dir):
+        """Delete one clone once its browser has quit."""
+        if self._clones_dir and os.path.dirname(os.path.abspath(clone_dir)) == os.path.abspath(self._clones_dir):
+            shutil.rmtree(clone_dir, ignore_errors=True)
+
+    def restore(self, driver):
+        """Put the snapshot cookies and the current origin's localStorage back after a reset."""
+        if not self.meta:
+            return
+        cookies = self.meta["cookies"]
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": [_cdp_cookie(cookie) for cookie in cookies]})
+        else:
+            for cookie in cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except Exception:
+                    pass  # Cookie of another domain than the current page
+        storage = self.meta.get("local_storage") or {}
+        if storage.get("items"):
+            driver.execute_script(RESTORE_STORAGE_SCRIPT, storage["origin"], storage["items"])
+
+    def cleanup(self):
+        """Delete every clone handed out by this snapshot."""
+        if self._clones_dir:
+            shutil.rmtree(self._clones_dir, ignore_errors=True)
+            self._clones_dir = None
+
+
+def main():
+    from drivers.driver_factory import create_driver
+    from pages.home_page import HomePage
+
+    parser = argparse.ArgumentParser(description="Captura un perfil de navegador con las cookies ya aceptadas.")
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox"])
+    parser.add_argument("--url", default=HomePage.URL)
+    parser.add_argument("--headed", action="store_true", help="Mostrar el navegador (por defecto headless)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    snapshot = ProfileSnapshot(args.browser)
+    snapshot.capture(args.url, lambda profile_dir: create_driver(
+        args.browser, headless=not args.headed, profile_dir=profile_dir))
+    print(f"Perfil guardado en {snapshot.profile_dir}")
+
+
+if __name__ == "__main__":
+    main()
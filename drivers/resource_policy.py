@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import sys
+from collections import deque
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logger = logging.getLogger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Bytes each page transfers with nothing blocked, measured with `python drivers/resource_policy.py`
+DEFAULT_PAGE_WEIGHTS = os.path.join(project_root, "data", ".cache", "page_weights.json")
+
+# Third-party analytics, tag managers and ad networks loaded by iberia.com.
+# The OneTrust consent banner (cookielaw.org) is deliberately not blocked: the tests click it.
+DEFAULT_BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "demdex.net",
+    "omtrdc.net",
+    "everesttech.net",
+    "criteo.com",
+    "criteo.net",
+    "bing.com",
+    "tiktok.com",
+    "quantummetric.com",
+)
+
+# URL patterns for each blockable resource type. Network.setBlockedURLs matches URLs, not types, so
+# assets served without an extension (e.g. '/image?id=1' from an image CDN) are not blocked. Blocking
+# by type would take Fetch.requestPaused events, which the WebDriver CDP command bridge cannot receive.
+RESOURCE_TYPE_PATTERNS = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*"),
+    "font": ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.mp3*", "*.m4a*", "*.ogg*"),
+    "stylesheet": ("*.css*",),
+}
+
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+MAX_PAGE_STATS = 100  # Latest pages whose stats are kept; totals covers every page
+
+
+def load_page_weights(path=DEFAULT_PAGE_WEIGHTS):
+    """URL -> bytes transferred with nothing blocked, or an empty dict when never measured."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        logger.error("Ignoring corrupt page weights %s: %s", path, e)
+        return {}
+
+
+class PageStats:
+    """Resource stats of the pages loaded by one driver."""
+
+    def __init__(self):
+        self.pages = deque(maxlen=MAX_PAGE_STATS)  # Latest collected pages
+        self.totals = {"pages": 0, "blocked_requests": 0, "transferred_bytes": 0, "saved_bytes": 0}
+
+    def add(self, stats):
+        self.pages.append(stats)
+        self.totals["pages"] += 1
+        for name in ("blocked_requests", "transferred_bytes", "saved_bytes"):
+            self.totals[name] += stats[name] or 0
+
+
+class ResourcePolicy:
+    """
+    Network resource policy applied by the driver factory.
+
+    Blocks requests by domain and by resource type through CDP network interception (Chrome only)
+    and selects the page-load strategy. When blocking is active, it also reports for each page how
+    many requests were blocked and how many bytes that saved, kept per driver in `driver.page_stats`.
+    """
+
+    def __init__(self, blocked_domains=(), blocked_types=(), page_load_strategy="normal", collect_stats=None,
+                 page_weights=None):
+        """
+        Args:
+            collect_stats (bool): Record page stats; by default only when blocking.
+            page_weights (dict): URL -> bytes with nothing blocked, the reference for the bytes saved
+                (read from DEFAULT_PAGE_WEIGHTS when None).
+        """
+        unknown_types = set(blocked_types) - set(RESOURCE_TYPE_PATTERNS)
+        if unknown_types:
+            raise ValueError(f"Unknown resource types {sorted(unknown_types)}, use: {sorted(RESOURCE_TYPE_PATTERNS)}")
+        if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(f"Unknown page load strategy {page_load_strategy}, use: {PAGE_LOAD_STRATEGIES}")
+
+        self.blocked_domains = tuple(blocked_domains)
+        self.blocked_types = tuple(blocked_types)
+        self.page_load_strategy = page_load_strategy
+        self.collect_stats = self.blocks_requests if collect_stats is None else collect_stats
+        if page_weights is None and self.blocks_requests:
+            page_weights = load_page_weights()
+        self.page_weights = page_weights or {}
+
+    @classmethod
+    def from_options(cls, domains="", types="", page_load_strategy="normal"):
+        """
+        Build a policy from comma-separated command-line values.
+        The domain value 'default' expands to DEFAULT_BLOCKED_DOMAINS.
+        """
+        blocked_domains = []
+        for domain in filter(None, (item.strip() for item in (domains or "").split(","))):
+            blocked_domains.extend(DEFAULT_BLOCKED_DOMAINS if domain == "default" else [domain])
+        blocked_types = [item.strip() for item in (types or "").split(",") if item.strip()]
+        return cls(blocked_domains, blocked_types, page_load_strategy)
+
+    @property
+    def blocks_requests(self):
+        return bool(self.blocked_domains or self.blocked_types)
+
+    def url_patterns(self):
+        """
+        Return the URL patterns passed to Network.setBlockedURLs.
+        Domains are anchored to the host, so 'bing.com' blocks bing.com and its subdomains but not 'notbing.com'.
+        """
+        patterns = []
+        for domain in self.blocked_domains:
+            patterns.extend((f"*://{domain}/*", f"*://*.{domain}/*"))
+        for resource_type in self.blocked_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        return patterns
+
+    def apply_options(self, options, browser_choice):
+        """Set the page-load strategy and, when collecting stats on Chrome, the network event log they come from."""
+        options.page_load_strategy = self.page_load_strategy
+        if browser_choice == "chrome" and self.collect_stats:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def apply(self, driver):
+        """Install the block list on a started driver."""
+        driver.resource_policy = self
+        driver.page_stats = PageStats()
+        if not self.blocks_requests:
+            return
+        if not hasattr(driver, "execute_cdp_cmd"):
+            logger.warning("Request blocking needs CDP, not available for %s. Blocking disabled.", driver.name)
+            return
+        patterns = self.url_patterns()
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        logger.info("Blocking %s URL patterns: %s", len(patterns), patterns)
+
+    def collect_page_stats(self, driver, url):
+        """
+        Read the network events since the last call and record the stats for `url` in `driver.page_stats`.
+
+        Blocked requests never reach the network, so their size cannot be read from the events. The bytes
+        saved are the page weight measured with nothing blocked minus the bytes transferred now; they are
+        None for a page whose weight was never measured.
+        """
+        if not self.collect_stats or not hasattr(driver, "execute_cdp_cmd"):
+            return None
+
+        blocked_requests = 0
+        transferred_bytes = 0
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            params = message.get("params", {})
+            if message.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+                blocked_requests += 1
+            elif message.get("method") == "Network.loadingFinished":
+                transferred_bytes += int(params.get("encodedDataLength", 0))
+
+        weight = self.page_weights.get(url)
+        saved_bytes = max(weight - transferred_bytes, 0) if weight is not None else None
+        stats = {
+            "url": url, "blocked_requests": blocked_requests, "transferred_bytes": transferred_bytes,
+            "saved_bytes": saved_bytes,
+        }
+        page_stats = getattr(driver, "page_stats", None)
+        if page_stats is None:
+            page_stats = driver.page_stats = PageStats()
+        page_stats.add(stats)
+        if saved_bytes is None:
+            logger.info("Resource policy for %s: blocked %s requests, transferred %s bytes (page weight not measured)",
+                        url, blocked_requests, transferred_bytes)
+        else:
+            logger.info("Resource policy for %s: blocked %s requests, saved %s of %s bytes",
+                        url, blocked_requests, saved_bytes, weight)
+        return stats
+
+
+def main():
+    import argparse
+
+    from drivers.driver_factory import create_driver
+    from pages.home_page import HomePage
+
+    parser = argparse.ArgumentParser(
+        description="Mide los bytes que transfiere cada página sin bloquear nada (referencia del ahorro por página).")
+    parser.add_argument("urls", nargs="*", default=[HomePage.URL])
+    parser.add_argument("--weights", default=DEFAULT_PAGE_WEIGHTS)
+    parser.add_argument("--browser-version", help="Versión mayor de Chrome (por defecto se detecta la instalada)")
+    args = parser.parse_args()
+
+    policy = ResourcePolicy(collect_stats=True, page_weights={})
+    weights = load_page_weights(args.weights)
+    driver = create_driver("chrome", args.browser_version, resource_policy=policy, headless=True)
+    try:
+        for url in args.urls:
+            driver.get(url)
+            weights[url] = policy.collect_page_stats(driver, url)["transferred_bytes"]
+            print(f"{weights[url]:>12} bytes  {url}")
+    finally:
+        driver.quit()
+    os.makedirs(os.path.dirname(os.path.abspath(args.weights)), exist_ok=True)
+    with open(args.weights, "w", encoding="utf-8") as file:
+        json.dump(weights, file, indent=1, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
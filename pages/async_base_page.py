@@ -0,0 +1,181 @@
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+from utils.instrumentation import instrumented
+
+from .base_page import PageCore
+from .read_batch import READ_BATCH_SCRIPT
+from .wait_engine import AsyncWaitEngine
+
+
+class AsyncBasePage(PageCore):
+    """
+    Base class for asyncio page objects driven by an AsyncWebDriver.
+    Shares timeouts, element cache and return conventions with BasePage, with awaitable actions.
+    """
+
+    def __init__(self, driver):
+        """Initialize the AsyncWebDriver session and set up logging."""
+        super().__init__(driver, AsyncWaitEngine(driver))
+
+    async def _locate(self, locator, condition="visible", timeout=None):
+        """
+        Return the element for a locator; the cache serves visibility and clickability like BasePage._locate.
+
+        Raises:
+            TimeoutException: If the element does not satisfy the condition within the timeout.
+        """
+        name = self._cacheable(condition)
+        element = self._element_cache.get(locator) if name else None
+        if element is not None:
+            try:
+                if await element.is_displayed() and (name == "visible" or await element.is_enabled()):
+                    return self._cache_hit(locator)
+                self._forget(locator, stale=False)
+            except StaleElementReferenceException:
+                self._forget(locator)
+
+        element = await self.waits.until_element(locator, condition, self._wait_timeout(locator, timeout))
+        return self._cache_miss(locator, element) if name else element
+
+    async def _with_element(self, locator, action, condition="visible"):
+        """Await action(element) and retry once with a freshly located element if it went stale."""
+        try:
+            return await action(await self._locate(locator, condition))
+        except StaleElementReferenceException:
+            self._forget(locator)
+            return await action(await self._locate(locator, condition))
+
+    @instrumented
+    async def navigate_to(self, url):
+        """
+        Navigate to a specified URL and wait until the page is ready.
+        With the 'eager' page-load strategy the page is ready once READY_LOCATORS are visible,
+        otherwise when document.readyState is 'complete'.
+        """
+        self.invalidate_cache()
+        await self.driver.get(url)
+        if self.READY_LOCATORS and self.driver.capabilities.get("pageLoadStrategy") == "eager":
+            for locator in self.READY_LOCATORS:
+                await self.waits.until_element(locator, "visible", self.PAGE_LOAD_TIMEOUT)
+        else:
+            async def loaded(driver):
+                return await driver.execute_script("return document.readyState") == "complete"
+            await self.waits.poll(loaded, self.PAGE_LOAD_TIMEOUT, f"Timeout waiting for {url} to load")
+
+    async def maximize_window(self):
+        """Maximize the browser window."""
+        await self.driver.maximize_window()
+
+    async def get_page_urlbase(self):
+        """Get and log the current URL of the page."""
+        url = await self.driver.current_url()
+        self.logger.info("URL is: %s", url)
+        return url
+
+    @instrumented
+    async def find_object(self, locator):
+        """Find an element and return it if found, otherwise return False."""
+        try:
+            element = await self._locate(locator)
+            self.logger.info("Element found: %s", locator)
+        except (TimeoutException, NoSuchElementException):
+            self.logger.error("Error finding element: %s", locator)
+            return False
+        return element
+
+    @instrumented
+    async def wait_for_element(self, locator, timeout=None, condition="visible"):
+        """Wait for an element to match a condition ('present', 'visible', 'clickable', 'invisible')."""
+        try:
+            await self.waits.until_element(locator, condition, self._wait_timeout(locator, timeout))
+            self.logger.info("Element located: %s", locator)
+        except TimeoutException:
+            self.logger.error("Timeout waiting for element: %s", locator)
+            return False
+        return True
+
+    @instrumented
+    async def click(self, locator):
+        """
+        Click on an element after ensuring it is clickable.
+        If an exception occurs, stop the execution by raising the exception.
+        """
+        async def click_element(element):
+            await element.click()
+            self.logger.info("Clicked on: %s", locator)
+
+        try:
+            await self._with_element(locator, click_element, "clickable")
+        except TimeoutException:
+            self.logger.error("Error waiting for element to be clickable: %s", locator)
+            raise
+        return True
+
+    @instrumented
+    async def type_text(self, locator, text):
+        """Type text into an input field after clearing any existing content."""
+        async def type_into(element):
+            await element.clear()
+            await element.send_keys(text)
+            self.logger.info("Text: %s typed into element %s", text, locator)
+
+        try:
+            await self._with_element(locator, type_into)
+        except (TimeoutException, NoSuchElementException):
+            self.logger.error("Cannot find element to type text into: %s", locator)
+        except Exception as e:
+            self.logger.error("Error typing text into locator %s: %s", locator, e)
+
+    @instrumented
+    async def get_locator_attribute(self, locator, attribute):
+        """Retrieve an attribute from an element located by a locator."""
+        try:
+            value = await self._with_element(locator, lambda element: element.get_attribute(attribute))
+        except (TimeoutException, NoSuchElementException):
+            self.logger.error("Cannot extract attribute. %s not found", locator)
+            return False
+        self.logger.info("Retrieved %s: %s for %s", attribute, value, locator)
+        return value
+
+    @instrumented
+    async def get_element_text(self, locator):
+        """Retrieve the text content from an element."""
+        try:
+            text = await self._with_element(locator, lambda element: element.text())
+        except (TimeoutException, NoSuchElementException):
+            self.logger.error("Cannot extract text. %s not found", locator)
+            return False
+        self.logger.info("Retrieved text: %s for %s", text, locator)
+        return text
+
+    @instrumented
+    async def get_elements_text(self, *locators):
+        """Retrieve the text of several elements in a single WebDriver call (None for missing elements)."""
+        queries = [["text", by, value, None] for by, value in locators]
+        texts = await self.driver.execute_script(READ_BATCH_SCRIPT, queries)
+        self.logger.info("Retrieved texts: %s for %s", texts, locators)
+        return texts
+
+    @instrumented
+    async def click_count_times(self, locator, count):
+        """Click an element a specified number of times."""
+        count = self._click_count(locator, count)
+        if count is None:
+            return False
+
+        element = await self.find_object(locator)
+        if not element:
+            self.logger.error("Element not found: %s", locator)
+            return False
+
+        self.logger.info("Starting to click %s times on: %s", count, locator)
+        for _ in range(count):
+            try:
+                await element.click()
+            except StaleElementReferenceException:
+                self._forget(locator)
+                element = await self.find_object(locator)
+                if not element:
+                    self.logger.error("Element not found: %s", locator)
+                    return False
+                await element.click()
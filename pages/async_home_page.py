@@ -0,0 +1,198 @@
+"""
+Asyncio page object for the home page, plus a runner that fills the search form for many flight
+rows concurrently from one event loop.
+
+Usage:
+    python -m pages.async_home_page --sessions 10          # against the local copy of the form
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+from utils.instrumentation import instrumented
+
+from .async_base_page import AsyncBasePage
+from .home_page import HomeForm
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHomePage(HomeForm, AsyncBasePage):
+    """Async page object for the home page; locators and passenger rules are shared with HomePage."""
+
+    @instrumented
+    async def navigate_home(self):
+        """Navigate to the home page and maximize the browser window."""
+        await self.navigate_to(self.URL)
+        await self.maximize_window()
+
+    async def accept_cookies(self):
+        """Accept the cookie banner if it is shown and wait for the dark filter to go away."""
+        if await self.find_object(self.COOKIE_BTN):
+            await self.click(self.COOKIE_BTN)
+            await self.wait_to_darkfilter()
+
+    @instrumented
+    async def wait_to_darkfilter(self):
+        """Wait for the dark filter (cookie banner) to disappear."""
+        try:
+            await self.waits.until_element(self.DARK_FILTER, "invisible", self.timeout_for(self.DARK_FILTER))
+        except TimeoutException:
+            self.logger.error("Timeout: Element %s is still visible.", self.DARK_FILTER)
+
+    @instrumented
+    async def enter_origin(self, origin):
+        """Enter the origin location in the flight search form."""
+        await self.click(self.ORIGIN_TXTBOX)
+        await self.type_text(self.ORIGIN_TXTBOX, origin)
+
+    @instrumented
+    async def enter_destiny(self, destiny):
+        """Enter the destination location in the flight search form."""
+        await self.click(self.DESTINY_TXTBOX_CLICK)
+        await self.type_text(self.DESTINY_TXTBOX_TYPE, destiny)
+
+    @instrumented
+    async def enter_stardate(self, start_date):
+        """Enter the start date for the flight search."""
+        await self.click(self.START_DATE_TXTBOX_CLICK)
+        await self.type_text(self.START_DATE_TXTBOX_TYPE, start_date)
+
+    @instrumented
+    async def enter_enddate(self, end_date):
+        """Enter the end date for the flight search."""
+        await self.click(self.END_DATE_TXTBOX_CLICK)
+        await self.type_text(self.END_DATE_TXTBOX_TYPE, end_date)
+
+    @instrumented
+    async def enter_passengers(self, adult_number, child_number, baby_number):
+        """Select the number of passengers for the flight search. Returns True if the counters match."""
+        await self.click(self.PASSENGERS)
+        return await self.set_passengers(adult_number, child_number, baby_number)
+
+    @instrumented
+    async def clear_passengers(self):
+        """Reset the passenger count to default (1 adult, 0 children, 0 babies)."""
+        return await self.set_passengers(self.MIN_ADULTS, 0, 0)
+
+    @instrumented
+    async def get_passenger_counts(self):
+        """Read the adult, child and baby counters in a single WebDriver call (None if one cannot be read)."""
+        texts = await self.get_elements_text(self.ADULT_COUNT, self.CHILD_COUNT, self.BABY_COUNT)
+        return self.parse_passenger_counts(texts)
+
+    @instrumented
+    async def set_passengers(self, adult, child, baby):
+        """
+        Set the passenger counters to a target state, clicking only the difference with the current counts.
+        The passengers panel must be open. Returns True if the counters match the target afterwards.
+
+        Raises:
+            ValueError: If the target is outside the widget limits.
+        """
+        target = self.passenger_target(adult, child, baby)
+        current = await self.get_passenger_counts()
+        if current is None:
+            return False
+        for button, clicks in self.passenger_steps(current, target):
+            await self.click_count_times(button, clicks)
+
+        result = await self.get_passenger_counts()
+        if result != target:
+            self.logger.error("Passenger counters are %s, expected %s", result, target)
+            return False
+        return True
+
+    async def fill_search(self, record):
+        """Fill the whole search form from a FlightRecord. Returns True if the passengers were set."""
+        await self.enter_origin(record.origin)
+        await self.enter_destiny(record.destiny)
+        await self.enter_stardate(record.start_date)
+        await self.enter_enddate(record.end_date)
+        return await self.enter_passengers(record.adult, record.child, record.baby)
+
+
+async def run_searches(service, records, sessions, url=None):
+    """
+    Fill the search form for every record, spreading them over `sessions` concurrent browsers.
+
+    Args:
+        service (AsyncDriverService): Started driver service the sessions are opened on.
+        records (list[FlightRecord]): Rows to search.
+        sessions (int): Number of browser sessions driven at the same time.
+        url (str): Home page URL (defaults to AsyncHomePage.URL).
+
+    A row that raises (invalid passengers, a WebDriver error) counts as failed and is logged; the
+    session moves on to the next row. Rows left when a session itself fails stay False.
+
+    Returns:
+        list[bool]: One result per record, in order.
+    """
+    pending = asyncio.Queue()
+    for index, record in enumerate(records):
+        pending.put_nowait((index, record))
+    results = [False] * len(records)
+
+    async def worker():
+        driver = await service.new_session()
+        try:
+            page = AsyncHomePage(driver)
+            if url:
+                page.URL = url
+            while not pending.empty():
+                index, record = pending.get_nowait()
+                try:
+                    await page.navigate_home()
+                    await page.accept_cookies()
+                    results[index] = await page.fill_search(record)
+                except ValueError as e:
+                    page.logger.error("Row %s skipped: %s", index, e)
+                except Exception:
+                    page.logger.exception("Row %s failed", index)
+        finally:
+            await service.release(driver)
+
+    outcomes = await asyncio.gather(*(worker() for _ in range(min(sessions, len(records)))), return_exceptions=True)
+    for error in outcomes:
+        if error is not None:
+            logger.error("Search session failed: %r", error)
+    return results
+
+
+async def _main(args):
+    from drivers.async_webdriver import AsyncDriverService
+    from utils.data_provider import DataProvider
+    from utils.replay_server import StaticServer
+
+    records = list(DataProvider.iter_records(args.data))
+    server = None if args.url else StaticServer().start()
+    try:
+        async with AsyncDriverService(args.browser, headless=not args.headed) as service:
+            start = time.perf_counter()
+            results = await run_searches(service, records, args.sessions, args.url or server.url + "index.html")
+            elapsed = time.perf_counter() - start
+    finally:
+        if server:
+            server.stop()
+    print(f"{sum(results)}/{len(results)} búsquedas correctas en {elapsed:.2f} s con {args.sessions} sesiones")
+
+
+def main():
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Rellena el formulario de búsqueda para muchas filas a la vez con asyncio.")
+    parser.add_argument("--data", default=os.path.join(project_root, "data", "Iberia_Flight_Data.xlsx"))
+    parser.add_argument("--url", help="URL de la home (por defecto la copia local del formulario)")
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox"])
+    parser.add_argument("--sessions", type=int, default=4, help="Navegadores controlados a la vez")
+    parser.add_argument("--headed", action="store_true", help="Mostrar los navegadores (por defecto headless)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
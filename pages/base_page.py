@@ -1,27 +1,141 @@
 import logging
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 from selenium.webdriver.common.by import By
 
+from utils.instrumentation import instrumented
 
-class BasePage:
-    """Base class for page objects with common Selenium methods."""
+from .read_batch import ReadBatch
+from .wait_engine import CONDITION_NAMES, WaitEngine
+
+# Conditions a cached element can be re-checked against without waiting
+CACHEABLE_CONDITIONS = ("visible", "clickable")
+
+
+class PageCore:
+    """
+    Timeouts, element cache bookkeeping and argument checks shared by BasePage and AsyncBasePage.
+    Subclasses only add the WebDriver calls, plain or awaited.
+    """
 
     ATR_VALUE = "value"  # Constant attribute name for element value
+    TIMEOUT = 5  # Default seconds to wait for an element on this page
+    PAGE_LOAD_TIMEOUT = 10  # Seconds to wait for the page to finish loading
+    LOCATOR_TIMEOUTS = {}  # Per-locator overrides of TIMEOUT: {locator: seconds}
+    READY_LOCATORS = ()  # Elements that make the page usable, checked instead of a full load with 'eager'
 
-    def __init__(self, driver):
-        """Initialize the WebDriver instance and set up logging."""
+    def __init__(self, driver, waits):
         self.driver = driver
         self.logger = logging.getLogger(__name__)
+        self.waits = waits
+        self._element_cache = {}  # locator -> element found on the current page
+        self.cache_stats = {"hits": 0, "misses": 0, "stale": 0}
+
+    def invalidate_cache(self):
+        """Forget every cached element, e.g. after the page changed."""
+        self._element_cache.clear()
+
+    def timeout_for(self, locator):
+        """Return the wait timeout for a locator: its LOCATOR_TIMEOUTS entry or the page TIMEOUT."""
+        return self.LOCATOR_TIMEOUTS.get(locator, self.TIMEOUT)
+
+    def _wait_timeout(self, locator, timeout):
+        """The explicit timeout, even 0, or the locator's default."""
+        return self.timeout_for(locator) if timeout is None else timeout
+
+    @staticmethod
+    def _cacheable(condition):
+        """Name of the condition if the element cache serves it ('visible', 'clickable'), else None."""
+        name = CONDITION_NAMES.get(condition, condition)
+        return name if name in CACHEABLE_CONDITIONS else None
+
+    def _cache_hit(self, locator):
+        self.cache_stats["hits"] += 1
+        return self._element_cache[locator]
+
+    def _cache_miss(self, locator, element):
+        """Count a lookup that had to wait for the element and remember the element."""
+        self.cache_stats["misses"] += 1
+        self._element_cache[locator] = element
+        return element
+
+    def _forget(self, locator, stale=True):
+        """Drop a cached element that went stale (or is no longer displayed)."""
+        if stale:
+            self.cache_stats["stale"] += 1
+        self._element_cache.pop(locator, None)
+
+    def _click_count(self, locator, count):
+        """The number of clicks a count cell asks for, or None when it is empty or not a number."""
+        if count is None or count == "":
+            self.logger.warning("For element: %s, passenger quantity is: %s", locator, count)
+            return None
+        try:
+            return int(count)
+        except ValueError:
+            return None
+
+
+class BasePage(PageCore):
+    """Base class for page objects with common Selenium methods."""
+
+    def __init__(self, driver):
+        """Initialize the WebDriver instance and set up logging."""
+        super().__init__(driver, WaitEngine(driver))
+
+    def _locate(self, locator, condition=EC.visibility_of_element_located, timeout=None):
+        """
+        Return the element for a locator. For visibility and clickability the cached WebElement is
+        reused when it still meets the condition (displayed, and enabled for clickable); a stale or
+        failing cached element is dropped and the locator is resolved again. Other conditions always wait.
+
+        Raises:
+            TimeoutException: If the element does not satisfy the condition within the timeout.
+        """
+        name = self._cacheable(condition)
+        element = self._element_cache.get(locator) if name else None
+        if element is not None:
+            try:
+                if element.is_displayed() and (name == "visible" or element.is_enabled()):
+                    return self._cache_hit(locator)
+                self._forget(locator, stale=False)
+            except StaleElementReferenceException:
+                self._forget(locator)
+
+        element = self.waits.until_element(locator, condition, self._wait_timeout(locator, timeout))
+        return self._cache_miss(locator, element) if name else element
+
+    def _with_element(self, locator, action, condition=EC.visibility_of_element_located):
+        """Run action(element) and retry once with a freshly located element if it went stale."""
+        try:
+            return action(self._locate(locator, condition))
+        except StaleElementReferenceException:
+            self._forget(locator)
+            return action(self._locate(locator, condition))
 
+    @instrumented
     def navigate_to(self, url):
-        """Navigate to a specified URL and wait until the page is fully loaded."""
+        """
+        Navigate to a specified URL and wait until the page is ready.
+        With the 'eager' page-load strategy the page is ready once READY_LOCATORS are visible,
+        otherwise when document.readyState is 'complete'.
+        """
+        self.invalidate_cache()
         self.driver.get(url)
-        WebDriverWait(self.driver, 10).until(
-            lambda driver: driver.execute_script("return document.readyState") == "complete"
-        )
+        if self.READY_LOCATORS and self.driver.capabilities.get("pageLoadStrategy") == "eager":
+            for locator in self.READY_LOCATORS:
+                self.waits.until_element(locator, "visible", self.PAGE_LOAD_TIMEOUT)
+        else:
+            self.waits.poll(
+                lambda driver: driver.execute_script("return document.readyState") == "complete",
+                self.PAGE_LOAD_TIMEOUT,
+                f"Timeout waiting for {url} to load",
+            )
+
+        resource_policy = getattr(self.driver, "resource_policy", None)
+        if resource_policy:
+            resource_policy.collect_page_stats(self.driver, url)
 
     def maximize_window(self):
         """Maximize the browser window."""
@@ -30,125 +144,152 @@ class BasePage:
     def get_page_urlbase(self):
         """Get and log the current URL of the page."""
         GET_URL_BASE = self.driver.current_url
-        self.logger.info(f"URL is: {GET_URL_BASE}")
+        self.logger.info("URL is: %s", GET_URL_BASE)
         return GET_URL_BASE
 
+    @instrumented
     def find_object(self, locator):
-        """Find an element and return True if found, otherwise return False."""
+        """
+        Find an element and return it if found, otherwise return False.
+        Elements already found on this page are reused from the element cache.
+        """
         try:
-            element = WebDriverWait(self.driver, 5).until(EC.visibility_of_element_located(locator))
-            self.logger.info(f"Element found: {locator}")
+            element = self._locate(locator)
+            self.logger.info("Element found: %s", locator)
         except (TimeoutException, NoSuchElementException):
-            self.logger.error(f"Error finding element: {locator}")
+            self.logger.error("Error finding element: %s", locator)
             return False
         return element
 
-    def wait_for_element(self, locator, timeout=5, condition=EC.visibility_of_element_located):
+    @instrumented
+    def wait_for_element(self, locator, timeout=None, condition=EC.visibility_of_element_located):
         """Wait for an element to be present and visible according to a specified condition."""
         try:
-            element = WebDriverWait(self.driver, timeout).until(condition(locator))
-            self.logger.info(f"Element located: {locator}")
+            self.waits.until_element(locator, condition, self._wait_timeout(locator, timeout))
+            self.logger.info("Element located: %s", locator)
         except TimeoutException:
-            self.logger.error(f"Timeout waiting for element: {locator}")
+            self.logger.error("Timeout waiting for element: %s", locator)
             return False
         return True
 
+    @instrumented
     def click(self, locator):
         """
         Click on an element after ensuring it is clickable.
         If an exception occurs, stop the execution by raising the exception.
         """
-        try:
-            element = WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable(locator))
-            if element.is_displayed() and element.is_enabled():
+        def click_element(element):
+            if element.is_enabled():
                 try:
-                    self.logger.info(f"Element clickable: {locator}")
+                    self.logger.info("Element clickable: %s", locator)
                     element.click()
-                    self.logger.info(f"Clicked on: {locator}")
+                    self.logger.info("Clicked on: %s", locator)
+                except StaleElementReferenceException:
+                    raise
                 except Exception as e:
-                    self.logger.error(f"Error clicking element: {locator}, Exception: {str(e)}")
+                    self.logger.error("Error clicking element: %s, Exception: %s", locator, e)
                     raise e
             else:
-                self.logger.error(f"Element not clickable or not found: {locator}")
+                self.logger.error("Element not clickable or not found: %s", locator)
                 raise Exception(f"Element not clickable or not found: {locator}")
+
+        try:
+            self._with_element(locator, click_element, EC.element_to_be_clickable)
         except TimeoutException:
-            self.logger.error(f"Error waiting for element to be clickable: {locator}")
+            self.logger.error("Error waiting for element to be clickable: %s", locator)
             raise
 
         return True
 
+    @instrumented
     def type_text(self, locator, text):
         """
         Type text into an input field after clearing any existing content.
         """
-        element = self.find_object(locator)
-        if element:
-            try:
-                element.clear()
-                self.logger.info(f"Text cleared for: {locator}")
-                element.send_keys(text)
-                writted_text = element.get_attribute(self.ATR_VALUE)
-                self.logger.info(f"Text: {writted_text} typed into element {locator}")
-            except Exception as e:
-                self.logger.error(f"Error typing text into locator {locator}: {str(e)}")
-        else:
-            self.logger.error(f"Cannot find element to type text into: {locator}")
+        def type_into(element):
+            element.clear()
+            self.logger.info("Text cleared for: %s", locator)
+            element.send_keys(text)
+            self.logger.info("Text: %s typed into element %s", text, locator)
 
+        try:
+            self._with_element(locator, type_into)
+        except (TimeoutException, NoSuchElementException):
+            self.logger.error("Cannot find element to type text into: %s", locator)
+        except Exception as e:
+            self.logger.error("Error typing text into locator %s: %s", locator, e)
+
+    @instrumented
     def get_locator_attribute(self, locator, attribute):
         """Retrieve an attribute from an element located by a locator."""
-        element = self.find_object(locator)
-        if element:
-            attribute_value = element.get_attribute(attribute)
-            self.logger.info(f"Retrieved {attribute}: {attribute_value} for {locator}")
-            return attribute_value
-        else:
-            self.logger.error(f"Cannot extract attribute. {locator} not found")
+        try:
+            attribute_value = self._with_element(locator, lambda element: element.get_attribute(attribute))
+        except (TimeoutException, NoSuchElementException):
+            self.logger.error("Cannot extract attribute. %s not found", locator)
             return False
+        self.logger.info("Retrieved %s: %s for %s", attribute, attribute_value, locator)
+        return attribute_value
 
+    @instrumented
     def get_element_text(self, locator):
         """Retrieve the text content from an element."""
-        element = self.find_object(locator)
-        if element:
-            element_text = element.text
-            self.logger.info(f"Retrieved text: {element_text} for {locator}")
-            return element_text
-        else:
-            self.logger.error(f"Cannot extract text. {locator} not found")
+        try:
+            element_text = self._with_element(locator, lambda element: element.text)
+        except (TimeoutException, NoSuchElementException):
+            self.logger.error("Cannot extract text. %s not found", locator)
             return False
+        self.logger.info("Retrieved text: %s for %s", element_text, locator)
+        return element_text
+
+    def batch(self):
+        """
+        Start a ReadBatch to collect reads (text, attributes, visibility, counts) across
+        several locators and resolve them in a single WebDriver round trip.
+        """
+        return ReadBatch(self.driver)
 
+    @instrumented
+    def get_elements_text(self, *locators):
+        """Retrieve the text of several elements in a single WebDriver call (None for missing elements)."""
+        with self.batch() as batch:
+            keys = [batch.text(locator) for locator in locators]
+        texts = [batch.result[key] for key in keys]
+        self.logger.info("Retrieved texts: %s for %s", texts, locators)
+        return texts
+
+    @instrumented
     def get_all_element_attributes(self, element):
-        """Retrieve and log all common attributes of a given element."""
-        attributes = {
-            "id": element.get_attribute("id"),
-            "class": element.get_attribute("class"),
-            "name": element.get_attribute("name"),
-            "value": element.get_attribute("value"),
-            "href": element.get_attribute("href"),
-            "src": element.get_attribute("src"),
-            "title": element.get_attribute("title"),
-            "placeholder": element.get_attribute("placeholder"),
-            "type": element.get_attribute("type"),
-            "disabled": element.get_attribute("disabled"),
-        }
-        self.logger.info(f"Attributes: {attributes}")
+        """Retrieve and log all common attributes of a given element in a single WebDriver call."""
+        with self.batch() as batch:
+            key = batch.attributes(element, "id", "class", "name", "value", "href", "src",
+                                   "title", "placeholder", "type", "disabled")
+        attributes = batch.result[key]
+        self.logger.info("Attributes: %s", attributes)
+        return attributes
 
+    @instrumented
     def click_count_times(self, locator, count):
         """
         Click an element a specified number of times.
         """
-        if count is None or count == "":
-            self.logger.warning(f"For element: {locator}, passenger quantity is: {count}")
-            return False
-        try:
-            count = int(count)
-        except ValueError:
+        count = self._click_count(locator, count)
+        if count is None:
             return False
 
         element = self.find_object(locator)
         if not element:
-            self.logger.error(f"Element not found: {locator}")
+            self.logger.error("Element not found: %s", locator)
             return False
 
-        self.logger.info(f"Starting to click {count} times on: {locator}")
+        self.logger.info("Starting to click %s times on: %s", count, locator)
         for _ in range(count):
-            element.click()
+            try:
+                element.click()
+            except StaleElementReferenceException:
+                # The widget re-rendered: drop the cached handle and find the button again
+                self._forget(locator)
+                element = self.find_object(locator)
+                if not element:
+                    self.logger.error("Element not found: %s", locator)
+                    return False
+                element.click()
@@ -1,17 +1,40 @@
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 
-from .base_page import BasePage
-
+from utils.instrumentation import instrumented
 
-class HomePage(BasePage):
-    """Page object model for the home page with flight search functionalities."""
+from .base_page import BasePage
+from .read_batch import RESOLVE_ALL_FUNCTION
+from .results_page import ResultsPage
+
+# Sets several inputs in one call, the way a user edit looks to the page's framework: the value goes
+# through the native HTMLInputElement setter (so React-style value trackers see a change), followed by
+# focus, input, change and blur events. Arguments: a list of [by, value, text].
+# Returns the locators that matched no element.
+FAST_FILL_SCRIPT = RESOLVE_ALL_FUNCTION + """
+var setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+var missing = [];
+arguments[0].forEach(function (field) {
+    var element = resolveAll(field[0], field[1])[0];
+    if (!element) { missing.push([field[0], field[1]]); return; }
+    element.focus();
+    element.dispatchEvent(new FocusEvent('focus'));
+    setValue.call(element, field[2]);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    element.blur();
+    element.dispatchEvent(new FocusEvent('blur'));
+});
+return missing;
+"""
+
+
+class HomeForm:
+    """Locators and passenger rules of the home page search form, shared by HomePage and AsyncHomePage."""
 
     # URL and element locators
     URL = "https://www.iberia.com/"
-    DARK_FILTER = (By.XPATH, "//*[@id=onetrust-consent-sdk]/div[1]")
+    DARK_FILTER = (By.XPATH, "//*[@id='onetrust-consent-sdk']/div[1]")
     COOKIE_BTN = (By.ID, "onetrust-accept-btn-handler")
     ORIGIN_TXTBOX = (By.ID, "flight_origin1")
     DESTINY_TXTBOX_CLICK = (By.XPATH, "//label[contains(.,'Destino')]")
@@ -30,6 +53,63 @@ class HomePage(BasePage):
     BABY_PLUS_BTN = (By.XPATH, "//*[@id='people-counter-1']/ul/li[6]/div[2]/button[2]")
     BABY_MINUS_BTN = (By.XPATH, "//li[contains(@class, 'fc-people-counter-babies')]//button[@data-people-counter-button='less']")
     BABY_COUNT = (By.XPATH, "//span[@data-people-type='babies']")
+    SEARCH_BTN = (By.ID, "buttonSubmit1")
+
+    # Form elements that must be visible before the search form can be used
+    READY_LOCATORS = (ORIGIN_TXTBOX, PASSENGERS)
+
+    # Passenger widget limits
+    MIN_ADULTS = 1
+    MAX_PASSENGERS = 9  # Adults and children together; babies travel on an adult's lap
+
+    def passenger_target(self, adult, child, baby):
+        """
+        Return the passenger counts as an int tuple.
+
+        Raises:
+            ValueError: If the target is outside the widget limits.
+        """
+        target = (int(adult or 0), int(child or 0), int(baby or 0))
+        adult, child, baby = target
+        if adult < self.MIN_ADULTS or child < 0 or baby < 0:
+            raise ValueError(f"Invalid passenger counts: {target}")
+        if adult + child > self.MAX_PASSENGERS:
+            raise ValueError(f"At most {self.MAX_PASSENGERS} adults and children are allowed: {target}")
+        if baby > adult:
+            raise ValueError(f"Babies cannot outnumber adults: {target}")
+        return target
+
+    def parse_passenger_counts(self, texts):
+        """
+        Turn the adult, child and baby counter texts into an int tuple.
+        Returns None, logging why, when a counter is missing, empty or not a number: reading it
+        as 0 would make set_passengers click from a wrong starting point.
+        """
+        try:
+            return tuple(int(text) for text in texts)
+        except (TypeError, ValueError):
+            self.logger.error("Cannot read the passenger counters: %s", texts)
+            return None
+
+    def passenger_steps(self, current, target):
+        """Return the (button, clicks) pairs that take the counters from `current` to `target`."""
+        current_adult, current_child, current_baby = current
+        adult, child, baby = target
+        # Order keeps every intermediate state valid: babies never exceed adults
+        # and the adult + child total never exceeds the maximum
+        steps = (
+            (self.BABY_MINUS_BTN, current_baby - baby),
+            (self.CHILD_MINUS_BTN, current_child - child),
+            (self.ADULT_PLUS_BTN, adult - current_adult),
+            (self.ADULT_MINUS_BTN, current_adult - adult),
+            (self.CHILD_PLUS_BTN, child - current_child),
+            (self.BABY_PLUS_BTN, baby - current_baby),
+        )
+        return [(button, clicks) for button, clicks in steps if clicks > 0]
+
+
+class HomePage(HomeForm, BasePage):
+    """Page object model for the home page with flight search functionalities."""
 
     flight_data_dict = None
 
@@ -42,75 +122,126 @@ class HomePage(BasePage):
         """Log the flight data dictionary."""
         self.logger.info(self.flight_data_dict)
 
+    @instrumented
     def navigate_home(self):
         """Navigate to the home page and maximize the browser window."""
         self.navigate_to(self.URL)
         self.maximize_window()
 
+    @instrumented
     def wait_to_darkfilter(self):
         """Wait for the dark filter (cookie banner) to disappear."""
         self.logger.info("Checking DARK_FILTER visibility.")
         try:
-            WebDriverWait(self.driver, 5).until(EC.invisibility_of_element_located(self.DARK_FILTER))
-            self.logger.info(f"Element {self.DARK_FILTER} is no longer visible or has been removed.")
+            self.waits.until_element(self.DARK_FILTER, "invisible", self.timeout_for(self.DARK_FILTER))
+            self.logger.info("Element %s is no longer visible or has been removed.", self.DARK_FILTER)
         except TimeoutException:
-            self.logger.error(f"Timeout: Element {self.DARK_FILTER} is still visible.")
+            self.logger.error("Timeout: Element %s is still visible.", self.DARK_FILTER)
 
     def check_active_url(self):
         """Verify if the current URL matches the home page URL."""
         return self.URL == self.get_page_urlbase()
 
+    @instrumented
     def enter_origin(self, origin):
         """Enter the origin location in the flight search form."""
         self.logger.info("Starting to enter flight origin.")
         self.click(self.ORIGIN_TXTBOX)
         self.type_text(self.ORIGIN_TXTBOX, origin)
 
+    @instrumented
     def enter_destiny(self, destiny):
         """Enter the destination location in the flight search form."""
         self.click(self.DESTINY_TXTBOX_CLICK)
         self.type_text(self.DESTINY_TXTBOX_TYPE, destiny)
 
+    @instrumented
     def enter_stardate(self, start_date):
         """Enter the start date for the flight search."""
         self.click(self.START_DATE_TXTBOX_CLICK)
         self.type_text(self.START_DATE_TXTBOX_TYPE, start_date)
 
+    @instrumented
     def enter_enddate(self, end_date):
         """Enter the end date for the flight search."""
         self.click(self.END_DATE_TXTBOX_CLICK)
         self.type_text(self.END_DATE_TXTBOX_TYPE, end_date)
 
+    @instrumented
+    def fast_fill(self, origin, destiny, start_date, end_date):
+        """
+        Fill origin, destination and dates in a single script instead of clicking and typing each field,
+        then read the four values back in a single call. Opt-in alternative to the enter_* methods for
+        data-coverage runs; autocomplete suggestions are not opened.
+        Returns True if every field holds the requested value.
+        """
+        fields = (
+            (self.ORIGIN_TXTBOX, origin),
+            (self.DESTINY_TXTBOX_TYPE, destiny),
+            (self.START_DATE_TXTBOX_TYPE, start_date),
+            (self.END_DATE_TXTBOX_TYPE, end_date),
+        )
+        missing = self.driver.execute_script(FAST_FILL_SCRIPT, [[by, value, text] for (by, value), text in fields])
+        if missing:
+            self.logger.error("Fast fill could not find: %s", missing)
+            return False
+
+        with self.batch() as batch:
+            keys = [batch.attribute(locator, self.ATR_VALUE) for locator, _ in fields]
+        mismatches = [(locator, text, batch.result[key])
+                      for (locator, text), key in zip(fields, keys) if batch.result[key] != text]
+        for locator, expected, actual in mismatches:
+            self.logger.error("Fast fill: %s holds %r, expected %r", locator, actual, expected)
+        self.logger.info("Fast-filled the search form: %s", [text for _, text in fields])
+        return not mismatches
+
+    @instrumented
     def enter_passengers(self, adult_number, child_number, baby_number):
-        """Select the number of passengers for the flight search."""
-        adult_number = int(adult_number) - 1  # Adjust adult count
+        """Select the number of passengers for the flight search. Returns True if the counters match."""
         self.click(self.PASSENGERS)
-        self.clear_passengers()
-        self.click_count_times(self.ADULT_PLUS_BTN, adult_number)
-        self.click_count_times(self.CHILD_PLUS_BTN, child_number)
-        self.click_count_times(self.BABY_PLUS_BTN, baby_number)
+        entered = self.set_passengers(adult_number, child_number, baby_number)
         self.logger.info("Finished entering passenger information.")
+        return entered
 
+    @instrumented
     def clear_passengers(self):
         """Reset the passenger count to default (1 adult, 0 children, 0 babies)."""
         self.logger.info("Resetting passenger count.")
-        
-        # Get current counts
-        adult_minus_count = int(self.get_element_text(self.ADULT_COUNT))
-        child_minus_count = int(self.get_element_text(self.CHILD_COUNT))
-        baby_minus_count = int(self.get_element_text(self.BABY_COUNT))
-
-        # Decrease adult count (to minimum 1)
-        for _ in range(adult_minus_count - 1):
-            self.logger.info(f"Decreasing adult count {adult_minus_count - 1} times.")
-            self.click(self.ADULT_MINUS_BTN)
-
-        # Decrease child count
-        for _ in range(child_minus_count):
-            self.logger.info(f"Decreasing child count {child_minus_count} times.")
-            self.click(self.CHILD_MINUS_BTN)
-
-        # Decrease baby count
-        for _ in range(baby_minus_count):
-            self.logger.info(f"Decreasing baby count {baby_minus_count} times.")
-            self.click(self.BABY_MINUS_BTN)
+        return self.set_passengers(self.MIN_ADULTS, 0, 0)
+
+    @instrumented
+    def submit_search(self):
+        """Submit the search form and return the results page."""
+        self.click(self.SEARCH_BTN)
+        self.invalidate_cache()
+        return ResultsPage(self.driver)
+
+    @instrumented
+    def get_passenger_counts(self):
+        """Read the adult, child and baby counters in a single WebDriver call (None if one cannot be read)."""
+        texts = self.get_elements_text(self.ADULT_COUNT, self.CHILD_COUNT, self.BABY_COUNT)
+        return self.parse_passenger_counts(texts)
+
+    @instrumented
+    def set_passengers(self, adult, child, baby):
+        """
+        Set the passenger counters to a target state, clicking only the difference with the current counts.
+        The passengers panel must be open. Returns True if the counters match the target afterwards.
+
+        Raises:
+            ValueError: If the target is outside the widget limits.
+        """
+        target = self.passenger_target(adult, child, baby)
+        current = self.get_passenger_counts()
+        if current is None:
+            return False
+        self.logger.info("Changing passengers from %s to %s", current, target)
+
+        for button, clicks in self.passenger_steps(current, target):
+            self.click_count_times(button, clicks)
+
+        result = self.get_passenger_counts()
+        if result != target:
+            self.logger.error("Passenger counters are %s, expected %s", result, target)
+            return False
+        return True
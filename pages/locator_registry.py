@@ -0,0 +1,223 @@
+"""
+Registry of the locators declared on a page object, profiled against the live page in one round trip.
+
+Usage:
+    python -m pages.locator_registry                      # HomePage against the local copy of the form
+    python -m pages.locator_registry --url https://www.iberia.com/ --slow-ms 0.5
+"""
+import argparse
+import importlib
+import logging
+from typing import NamedTuple, Optional
+
+from selenium.webdriver.common.by import By
+
+from .read_batch import RESOLVE_ALL_FUNCTION
+
+logger = logging.getLogger(__name__)
+
+LOCATOR_STRATEGIES = frozenset(value for name, value in vars(By).items() if name.isupper())
+
+# Resolves every locator `repeats` times and returns, per locator, the number of matches,
+# the mean resolution time and, for the first match, a unique selector that is cheaper to resolve.
+# Suggestions are tried in order: #id, tag[unique attribute], #ancestor-id .class, #ancestor-id tag[attribute].
+PROFILE_LOCATORS_SCRIPT = RESOLVE_ALL_FUNCTION + """
+var SUGGEST_ATTRIBUTES = ['name', 'for', 'data-people-type', 'data-people-counter-button', 'aria-label', 'type'];
+var repeats = arguments[1];
+function timeResolve(by, value) {
+    var start = performance.now();
+    var elements;
+    for (var i = 0; i < repeats; i++) { elements = resolveAll(by, value); }
+    return {elements: elements, ms: (performance.now() - start) / repeats};
+}
+function uniqueFor(selector, element) {
+    try {
+        var matches = document.querySelectorAll(selector);
+        return matches.length === 1 && matches[0] === element;
+    } catch (e) { return false; }
+}
+function candidates(element) {
+    var tag = element.tagName.toLowerCase();
+    var own = [];
+    if (element.id) { own.push('#' + CSS.escape(element.id)); }
+    SUGGEST_ATTRIBUTES.forEach(function (name) {
+        var value = element.getAttribute(name);
+        if (value) { own.push(tag + '[' + name + '="' + CSS.escape(value) + '"]'); }
+    });
+    var scoped = [];
+    var ancestor = element.parentElement;
+    while (ancestor && !ancestor.id) { ancestor = ancestor.parentElement; }
+    if (ancestor) {
+        var prefix = '#' + CSS.escape(ancestor.id) + ' ';
+        if (element.classList.length) {
+            scoped.push(prefix + '.' + Array.prototype.map.call(element.classList, CSS.escape).join('.'));
+        }
+        own.slice(element.id ? 1 : 0).forEach(function (selector) { scoped.push(prefix + selector); });
+        // Climb to the nearest list item with a distinctive class, as in the passenger counter
+        var item = element.closest('li');
+        if (item && item.classList.length && ancestor.contains(item)) {
+            Array.prototype.forEach.call(item.classList, function (cls) {
+                own.slice(element.id ? 1 : 0).forEach(function (selector) {
+                    scoped.push(prefix + '.' + CSS.escape(cls) + ' ' + selector);
+                });
+            });
+        }
+    }
+    return own.concat(scoped);
+}
+return arguments[0].map(function (locator) {
+    var result = {name: locator[0], matches: 0, ms: null, suggestion: null, suggestion_ms: null, error: null};
+    try {
+        var timed = timeResolve(locator[1], locator[2]);
+        result.matches = timed.elements.length;
+        result.ms = timed.ms;
+        if (timed.elements.length && locator[1] !== 'id') {
+            var element = timed.elements[0];
+            var options = candidates(element);
+            for (var i = 0; i < options.length; i++) {
+                if (uniqueFor(options[i], element)) {
+                    result.suggestion = options[i];
+                    result.suggestion_ms = timeResolve('css selector', options[i]).ms;
+                    break;
+                }
+            }
+        }
+    } catch (e) {
+        result.error = String(e);
+    }
+    return result;
+});
+"""
+
+
+class LocatorProfile(NamedTuple):
+    """Result of resolving one registered locator against the page."""
+    name: str
+    locator: tuple
+    matches: int
+    mean_ms: Optional[float]
+    suggestion: Optional[str] = None
+    suggestion_ms: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def missing(self):
+        return self.matches == 0
+
+    @property
+    def ambiguous(self):
+        return self.matches > 1
+
+    def slow(self, threshold_ms):
+        return self.mean_ms is not None and self.mean_ms > threshold_ms
+
+
+class LocatorRegistry:
+    """
+    The (By, value) locators declared as class attributes on a page object, compiled once into
+    the query list that PROFILE_LOCATORS_SCRIPT resolves in a single execute_script call.
+    """
+
+    def __init__(self, locators):
+        """
+        Args:
+            locators (dict): Locator name -> (By, value) tuple.
+        """
+        self.locators = dict(locators)
+        self._queries = [[name, by, value] for name, (by, value) in self.locators.items()]
+
+    @classmethod
+    def from_page(cls, page_class):
+        """Collect the locators declared on a page class and its bases (subclasses win)."""
+        locators = {}
+        for klass in reversed(page_class.__mro__):
+            for name, value in vars(klass).items():
+                if (isinstance(value, tuple) and len(value) == 2
+                        and value[0] in LOCATOR_STRATEGIES and isinstance(value[1], str)):
+                    locators[name] = value
+        return cls(locators)
+
+    def __len__(self):
+        return len(self.locators)
+
+    def __iter__(self):
+        return iter(self.locators.items())
+
+    def profile(self, driver, repeats=20):
+        """
+        Resolve every locator on the current page in one round trip.
+
+        Args:
+            driver (WebDriver): Browser with the page loaded.
+            repeats (int): Resolutions per locator; the reported time is the mean.
+
+        Returns:
+            list[LocatorProfile]: One profile per locator, in declaration order.
+        """
+        rows = driver.execute_script(PROFILE_LOCATORS_SCRIPT, self._queries, repeats)
+        return [
+            LocatorProfile(row["name"], self.locators[row["name"]], row["matches"], row["ms"],
+                           row["suggestion"], row["suggestion_ms"], row["error"])
+            for row in rows
+        ]
+
+
+def format_report(profiles, slow_ms=0.2):
+    """
+    Build a plain-text report flagging missing, ambiguous and slow locators, slowest first.
+
+    Args:
+        profiles (list[LocatorProfile]): Output of LocatorRegistry.profile.
+        slow_ms (float): Mean resolution time above which a locator is reported as slow.
+    """
+    lines = [f"{'locator':<26} {'matches':>7} {'mean ms':>9}  flags / suggestion"]
+    for profile in sorted(profiles, key=lambda p: -(p.mean_ms or 0)):
+        flags = []
+        if profile.error:
+            flags.append(f"ERROR {profile.error}")
+        elif profile.missing:
+            flags.append("MISSING")
+        if profile.ambiguous:
+            flags.append("AMBIGUOUS")
+        if profile.slow(slow_ms):
+            flags.append("SLOW")
+        if profile.suggestion:
+            flags.append(f"-> {profile.suggestion!r} ({profile.suggestion_ms:.4f} ms)")
+        mean = f"{profile.mean_ms:.4f}" if profile.mean_ms is not None else "-"
+        lines.append(f"{profile.name:<26} {profile.matches:>7} {mean:>9}  {' '.join(flags)}")
+    return "\n".join(lines)
+
+
+def _load_page_class(path):
+    module_name, _, class_name = path.rpartition(".")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def main():
+    from drivers.driver_factory import create_driver
+    from utils.replay_server import StaticServer
+
+    parser = argparse.ArgumentParser(description="Valida y mide los localizadores de un page object en una sola pasada.")
+    parser.add_argument("--page", default="pages.home_page.HomePage", help="Clase del page object")
+    parser.add_argument("--url", help="URL a cargar (por defecto la copia local del formulario)")
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox"])
+    parser.add_argument("--headed", action="store_true", help="Mostrar el navegador (por defecto headless)")
+    parser.add_argument("--repeats", type=int, default=20, help="Resoluciones por localizador")
+    parser.add_argument("--slow-ms", type=float, default=0.2, help="Umbral para marcar un localizador como lento")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    registry = LocatorRegistry.from_page(_load_page_class(args.page))
+    server = None if args.url else StaticServer().start()
+    driver = create_driver(args.browser, headless=not args.headed)
+    try:
+        driver.get(args.url or server.url + "index.html")
+        print(format_report(registry.profile(driver, args.repeats), args.slow_ms))
+    finally:
+        driver.quit()
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
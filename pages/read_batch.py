@@ -0,0 +1,145 @@
+from selenium.webdriver.remote.webelement import WebElement
+
+# Resolves a selenium locator (or ('element', WebElement)) to the list of matching elements.
+RESOLVE_ALL_FUNCTION = """
+function resolveAll(by, value) {
+    switch (by) {
+        case 'element': return value ? [value] : [];
+        case 'id': var byId = document.getElementById(value); return byId ? [byId] : [];
+        case 'name': return Array.prototype.slice.call(document.getElementsByName(value));
+        case 'class name': return Array.prototype.slice.call(document.getElementsByClassName(value));
+        case 'tag name': return Array.prototype.slice.call(document.getElementsByTagName(value));
+        case 'css selector': return Array.prototype.slice.call(document.querySelectorAll(value));
+        case 'xpath':
+            var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+            return nodes;
+        default: throw new Error('Unsupported locator strategy: ' + by);
+    }
+}
+"""
+
+# Resolves every query in the browser and returns one value per query, in order.
+# A query is [kind, by, value, extra]: kind is text/attribute/attributes/visible/count,
+# (by, value) is a selenium locator or ('element', WebElement), extra is the attribute name(s).
+READ_BATCH_SCRIPT = RESOLVE_ALL_FUNCTION + """
+function attribute(element, name) {
+    // Same rule as WebElement.get_attribute: prefer the DOM property, fall back to the attribute
+    var property = element[name];
+    if (property !== undefined && property !== null && typeof property !== 'object' && typeof property !== 'function') {
+        if (property === true) { return 'true'; }
+        if (property === false) { return null; }
+        return String(property);
+    }
+    return element.getAttribute(name);
+}
+function visible(element) {
+    return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length)
+        && window.getComputedStyle(element).visibility !== 'hidden';
+}
+return arguments[0].map(function (query) {
+    var elements = resolveAll(query[1], query[2]);
+    var element = elements[0];
+    switch (query[0]) {
+        case 'count': return elements.length;
+        case 'visible': return element ? visible(element) : false;
+        case 'text': return element ? element.textContent.trim() : null;
+        case 'attribute': return element ? attribute(element, query[3]) : null;
+        case 'attributes':
+            if (!element) { return null; }
+            var values = {};
+            query[3].forEach(function (name) { values[name] = attribute(element, name); });
+            return values;
+    }
+});
+"""
+
+
+class BatchResult(dict):
+    """
+    Values read by a ReadBatch, keyed by the key of each query.
+    The accessors rebuild the default keys, so result.text(locator) works without naming queries.
+    """
+
+    def text(self, locator):
+        return self[("text", locator)]
+
+    def attribute(self, locator, name):
+        return self[("attribute", locator, name)]
+
+    def attributes(self, locator, *names):
+        return self[("attributes", locator, names)]
+
+    def visible(self, locator):
+        return self[("visible", locator)]
+
+    def count(self, locator):
+        return self[("count", locator)]
+
+
+class ReadBatch:
+    """
+    Collects element reads across several locators and resolves them in one execute_script round trip.
+
+    Usage:
+        with page.batch() as batch:
+            batch.text(page.ADULT_COUNT)
+            batch.attribute(page.ORIGIN_TXTBOX, "value", key="origin")
+        batch.result.text(page.ADULT_COUNT), batch.result["origin"]
+
+    A locator can also be a WebElement that was already found.
+    Missing elements read as None (text, attribute, attributes), False (visible) or 0 (count).
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._keys = []
+        self._queries = []
+        self.result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+        return False
+
+    def __len__(self):
+        return len(self._queries)
+
+    def _add(self, key, kind, locator, extra=None):
+        if isinstance(locator, WebElement):
+            by, value = "element", locator
+        else:
+            by, value = locator
+        self._keys.append(key)
+        self._queries.append([kind, by, value, extra])
+        return key
+
+    def text(self, locator, key=None):
+        """Queue a read of the element's trimmed text content."""
+        return self._add(key or ("text", locator), "text", locator)
+
+    def attribute(self, locator, name, key=None):
+        """Queue a read of one attribute (DOM property first, like WebElement.get_attribute)."""
+        return self._add(key or ("attribute", locator, name), "attribute", locator, name)
+
+    def attributes(self, locator, *names, key=None):
+        """Queue a read of several attributes, returned as a dictionary."""
+        return self._add(key or ("attributes", locator, names), "attributes", locator, list(names))
+
+    def visible(self, locator, key=None):
+        """Queue a visibility check of the first matching element."""
+        return self._add(key or ("visible", locator), "visible", locator)
+
+    def count(self, locator, key=None):
+        """Queue a count of the elements matching the locator."""
+        return self._add(key or ("count", locator), "count", locator)
+
+    def execute(self):
+        """Run every queued read in a single WebDriver call and return the BatchResult."""
+        values = self.driver.execute_script(READ_BATCH_SCRIPT, self._queries) if self._queries else []
+        self.result = BatchResult(zip(self._keys, values))
+        return self.result
@@ -0,0 +1,138 @@
+from typing import NamedTuple, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from .base_page import BasePage
+
+# Reads the result rows from index arguments[0] onwards as compact lists, plus the list state.
+# Fields per row: flight id, flight number, departure, arrival, duration, stops, fare class, price text.
+EXTRACT_RESULTS_SCRIPT = """
+var items = document.querySelectorAll('#flight-results .ibe-flight-result');
+var rows = [];
+function field(item, cls) { var node = item.querySelector('.' + cls); return node ? node.textContent.trim() : null; }
+for (var i = arguments[0]; i < items.length && rows.length < arguments[1]; i++) {
+    var item = items[i];
+    rows.push([item.getAttribute('data-flight-id'), field(item, 'flight-number'), field(item, 'departure-time'),
+               field(item, 'arrival-time'), field(item, 'duration'), field(item, 'stops'),
+               field(item, 'fare-class'), field(item, 'fare-price')]);
+}
+var status = document.getElementById('results-status');
+var loadMore = document.getElementById('load-more');
+return {
+    rows: rows,
+    total: items.length,
+    state: status ? status.getAttribute('data-state') : 'done',
+    can_load_more: !!(loadMore && !loadMore.hidden && !loadMore.disabled)
+};
+"""
+
+# Column order of a FlightOption, used as the header of the output files
+RESULT_COLUMNS = ("origin", "destiny", "departure_date", "flight_id", "flight_number", "departure_time",
+                  "arrival_time", "duration", "stops", "fare_class", "price", "currency")
+
+
+def parse_price(text):
+    """Split a price such as '89,99 €' into (89.99, '€'); (None, None) when it cannot be parsed."""
+    if not text:
+        return None, None
+    amount, _, currency = text.replace("\u00a0", " ").strip().rpartition(" ")
+    try:
+        return float(amount.replace(".", "").replace(",", ".")), currency or None
+    except ValueError:
+        return None, None
+
+
+class FlightOption(NamedTuple):
+    """One flight of a search result, with the route it was searched for."""
+
+    origin: str
+    destiny: str
+    departure_date: str
+    flight_id: str
+    flight_number: str
+    departure_time: str
+    arrival_time: str
+    duration: str
+    stops: str
+    fare_class: str
+    price: Optional[float]
+    currency: Optional[str]
+
+
+class ResultsPage(BasePage):
+    """
+    Page object model for the flight search results.
+
+    The locators model the local copy in data/site/results.html (run with --local-site); the markup
+    of iberia.com's results page has not been mapped, so the live site is not supported.
+    """
+
+    RESULTS_LIST = (By.ID, "flight-results")
+    RESULT_ITEM = (By.CSS_SELECTOR, "#flight-results .ibe-flight-result")
+    STATUS = (By.ID, "results-status")
+    LOAD_MORE_BTN = (By.ID, "load-more")
+
+    READY_LOCATORS = (RESULTS_LIST,)
+    RESULTS_TIMEOUT = 30  # Seconds without new results before the extraction gives up
+    BATCH_SIZE = 50  # Rows read per round trip
+
+    def iter_results(self, origin="", destiny="", departure_date="", max_results=None):
+        """
+        Yield the flights as they appear, reading only the rows not seen yet on every round trip.
+        Follows the 'load more' pagination until the list is complete, so memory stays bounded by
+        BATCH_SIZE no matter how many flights the route has.
+
+        Args:
+            origin, destiny, departure_date (str): Route the flights are tagged with.
+            max_results (int): Stop after this many flights.
+
+        Raises:
+            TimeoutException: If the results list never appears, or no new flight shows up for
+                RESULTS_TIMEOUT seconds while the list is loading.
+        """
+        if not self.wait_for_element(self.RESULTS_LIST, self.PAGE_LOAD_TIMEOUT, "present"):
+            raise TimeoutException(
+                f"Results list {self.RESULTS_LIST} did not appear on {self.driver.current_url} within "
+                f"{self.PAGE_LOAD_TIMEOUT}s; ResultsPage only knows the local results page (--local-site)"
+            )
+        seen = 0
+        while max_results is None or seen < max_results:
+            batch = self.driver.execute_script(EXTRACT_RESULTS_SCRIPT, seen, self.BATCH_SIZE)
+            for row in batch["rows"]:
+                price, currency = parse_price(row[7])
+                yield FlightOption(origin, destiny, departure_date, *row[:7], price, currency)
+                seen += 1
+                if max_results is not None and seen >= max_results:
+                    return
+            if batch["rows"]:
+                continue
+            if batch["state"] == "done":
+                break
+            # Only click while idle: a click during a load would queue a second batch
+            clicked = batch["can_load_more"] and batch["state"] != "loading"
+            if clicked:
+                self.logger.info("Loading more results after %s flights", seen)
+                self.click(self.LOAD_MORE_BTN)
+            self._wait_for_more(seen, clicked)
+        self.logger.info("Extracted %s flights for %s - %s", seen, origin, destiny)
+
+    def _wait_for_more(self, seen, clicked=False):
+        """
+        Wait until the list grows past `seen` rows or finishes loading. After a click on 'load more'
+        it also returns once the button is gone (the batch started), otherwise once the button can be
+        clicked, so the button is never clicked twice for the same batch.
+        """
+        def more_or_finished(driver):
+            state = driver.execute_script(EXTRACT_RESULTS_SCRIPT, seen, 0)
+            if state["total"] > seen or state["state"] == "done":
+                return True
+            if clicked:
+                return not state["can_load_more"]
+            return state["can_load_more"] and state["state"] != "loading"
+        try:
+            self.waits.poll(more_or_finished, self.RESULTS_TIMEOUT,
+                            f"No new results after {seen} flights in {self.RESULTS_TIMEOUT}s")
+        except TimeoutException:
+            self.logger.error("Results stopped loading after %s flights", seen)
+            raise
@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import time
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.support import expected_conditions as EC
+
+from utils.instrumentation import recorder
+
+# Waits in the browser until the element condition holds, re-checking on every DOM mutation.
+# Arguments: by, value, condition (present/visible/clickable/invisible), timeout in ms, callback.
+# Calls back with the element (true for 'invisible') or with null when the timeout expires.
+WAIT_FOR_CONDITION_SCRIPT = """
+var by = arguments[0], value = arguments[1], condition = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+function resolve() {
+    switch (by) {
+        case 'id': return document.getElementById(value);
+        case 'name': return document.getElementsByName(value)[0] || null;
+        case 'class name': return document.getElementsByClassName(value)[0] || null;
+        case 'tag name': return document.getElementsByTagName(value)[0] || null;
+        case 'css selector': return document.querySelector(value);
+        case 'xpath': return document.evaluate(
+            value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        default: throw new Error('Unsupported locator strategy: ' + by);
+    }
+}
+function visible(element) {
+    return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length)
+        && window.getComputedStyle(element).visibility !== 'hidden';
+}
+function check() {
+    var element = resolve();
+    switch (condition) {
+        case 'present': return element;
+        case 'visible': return element && visible(element) ? element : null;
+        case 'clickable': return element && visible(element) && !element.disabled ? element : null;
+        case 'invisible': return !element || !visible(element) ? true : null;
+    }
+}
+var result = check();
+if (result) { done(result); return; }
+var finished = false;
+function finish(value) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(safetyNet);
+    done(value);
+}
+var observer = new MutationObserver(function () { var value = check(); if (value) { finish(value); } });
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+// Layout-only changes (e.g. CSS transitions) do not mutate the DOM, so re-check now and then
+var safetyNet = setInterval(function () { var value = check(); if (value) { finish(value); } }, 100);
+var timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+# Selenium expected conditions the in-page watcher knows how to evaluate
+CONDITION_NAMES = {
+    EC.presence_of_element_located: "present",
+    EC.visibility_of_element_located: "visible",
+    EC.element_to_be_clickable: "clickable",
+    EC.invisibility_of_element_located: "invisible",
+}
+SELENIUM_CONDITIONS = {name: condition for condition, name in CONDITION_NAMES.items()}
+
+# Seconds of headroom between the in-page timeout and the WebDriver script timeout
+SCRIPT_TIMEOUT_MARGIN = 5
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+
+class WaitEngine:
+    """
+    Event-driven waits for a WebDriver session.
+
+    Element waits are resolved inside the page by a MutationObserver, so they return as soon as
+    the DOM condition holds instead of on the next 500 ms poll. Anything the watcher cannot
+    evaluate (custom conditions, page loads, scripts interrupted by a navigation) falls back to
+    adaptive polling that starts fast and backs off exponentially.
+    """
+
+    def __init__(self, driver, poll_start=0.025, poll_max=0.5, backoff=2):
+        """
+        Args:
+            driver (WebDriver): The WebDriver session to wait on.
+            poll_start (float): First polling interval in seconds.
+            poll_max (float): Longest polling interval in seconds.
+            backoff (float): Factor applied to the interval after every unsuccessful poll.
+        """
+        self.driver = driver
+        self.poll_start = poll_start
+        self.poll_max = poll_max
+        self.backoff = backoff
+        self.logger = logging.getLogger(__name__)
+        self._script_timeout = DEFAULT_SCRIPT_TIMEOUT
+
+    def poll(self, predicate, timeout, message=""):
+        """
+        Call predicate(driver) until it returns a truthy value, sleeping with exponential backoff.
+
+        Raises:
+            TimeoutException: If the predicate is still falsy after `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        interval = self.poll_start
+        while True:
+            try:
+                value = predicate(self.driver)
+                if value:
+                    return value
+            except (NoSuchElementException, StaleElementReferenceException):
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            time.sleep(min(interval, remaining))
+            interval = min(interval * self.backoff, self.poll_max)
+
+    def until_element(self, locator, condition="visible", timeout=5):
+        """
+        Wait until the element matches the condition and return it (True for 'invisible').
+
+        Args:
+            locator (tuple): Selenium (By, value) locator.
+            condition: 'present', 'visible', 'clickable', 'invisible' or a selenium expected condition.
+            timeout (float): Seconds to wait.
+
+        Raises:
+            TimeoutException: If the condition does not hold within the timeout.
+        """
+        if not recorder.enabled:
+            return self._until_element(locator, condition, timeout)
+        start = time.perf_counter()
+        try:
+            return self._until_element(locator, condition, timeout)
+        finally:
+            recorder.record_wait(locator, time.perf_counter() - start)
+
+    def _until_element(self, locator, condition, timeout):
+        name = CONDITION_NAMES.get(condition, condition)
+        message = f"Timeout after {timeout}s waiting for {locator} to be {name}"
+        if name not in SELENIUM_CONDITIONS:
+            # Custom expected condition: only polling can evaluate it
+            return self.poll(condition(locator), timeout, message)
+
+        deadline = time.monotonic() + timeout
+        try:
+            self._ensure_script_timeout(timeout)
+            result = self.driver.execute_async_script(
+                WAIT_FOR_CONDITION_SCRIPT, locator[0], locator[1], name, int(timeout * 1000)
+            )
+        except TimeoutException:
+            raise
+        except WebDriverException as e:
+            # Typically the document was replaced while waiting: keep waiting by polling
+            self.logger.debug("In-page wait for %s interrupted (%s), falling back to polling", locator, e.msg)
+            remaining = max(deadline - time.monotonic(), 0)
+            return self.poll(SELENIUM_CONDITIONS[name](locator), remaining, message)
+
+        if not result:
+            raise TimeoutException(message)
+        return result
+
+    def _ensure_script_timeout(self, timeout):
+        """Raise the WebDriver script timeout when an in-page wait could outlive it."""
+        needed = timeout + SCRIPT_TIMEOUT_MARGIN
+        if needed > self._script_timeout:
+            self.driver.set_script_timeout(needed)
+            self._script_timeout = needed
+
+
+class AsyncWaitEngine:
+    """
+    WaitEngine for an AsyncWebDriver session: the same in-page watcher and backoff polling,
+    but waiting yields to the event loop instead of blocking a thread.
+    """
+
+    def __init__(self, driver, poll_start=0.025, poll_max=0.5, backoff=2):
+        self.driver = driver
+        self.poll_start = poll_start
+        self.poll_max = poll_max
+        self.backoff = backoff
+        self.logger = logging.getLogger(__name__)
+        self._script_timeout = DEFAULT_SCRIPT_TIMEOUT
+
+    async def poll(self, predicate, timeout, message=""):
+        """
+        Await predicate(driver) until it returns a truthy value, sleeping with exponential backoff.
+
+        Raises:
+            TimeoutException: If the predicate is still falsy after `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        interval = self.poll_start
+        while True:
+            try:
+                value = await predicate(self.driver)
+                if value:
+                    return value
+            except (NoSuchElementException, StaleElementReferenceException):
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * self.backoff, self.poll_max)
+
+    async def until_element(self, locator, condition="visible", timeout=5):
+        """
+        Wait until the element matches the condition and return it (True for 'invisible').
+
+        Args:
+            locator (tuple): Selenium (By, value) locator.
+            condition (str): 'present', 'visible', 'clickable' or 'invisible'.
+            timeout (float): Seconds to wait.
+
+        Raises:
+            TimeoutException: If the condition does not hold within the timeout.
+        """
+        if not recorder.enabled:
+            return await self._until_element(locator, condition, timeout)
+        start = time.perf_counter()
+        try:
+            return await self._until_element(locator, condition, timeout)
+        finally:
+            recorder.record_wait(locator, time.perf_counter() - start)
+
+    async def _until_element(self, locator, condition, timeout):
+        name = CONDITION_NAMES.get(condition, condition)
+        message = f"Timeout after {timeout}s waiting for {locator} to be {name}"
+        deadline = time.monotonic() + timeout
+        try:
+            needed = timeout + SCRIPT_TIMEOUT_MARGIN
+            if needed > self._script_timeout:
+                await self.driver.set_script_timeout(needed)
+                self._script_timeout = needed
+            result = await self.driver.execute_async_script(
+                WAIT_FOR_CONDITION_SCRIPT, locator[0], locator[1], name, int(timeout * 1000)
+            )
+        except TimeoutException:
+            raise
+        except WebDriverException as e:
+            self.logger.debug("In-page wait for %s interrupted (%s), falling back to polling", locator, e.msg)
+            remaining = max(deadline - time.monotonic(), 0)
+
+            async def check(driver):
+                return await driver.execute_async_script(
+                    WAIT_FOR_CONDITION_SCRIPT, locator[0], locator[1], name, 0
+                )
+            return await self.poll(check, remaining, message)
+
+        if not result:
+            raise TimeoutException(message)
+        return result
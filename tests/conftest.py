@@ -1,83 +1,656 @@
+import json
 import logging
 import os
+import typing
 
+import allure
 import pytest
-from selenium import webdriver
-from selenium.common.exceptions import WebDriverException
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
 
+from drivers.driver_factory import create_driver
+from drivers.driver_pool import DriverPool
+from drivers.profile_snapshot import ProfileSnapshot
+from drivers.resource_policy import PAGE_LOAD_STRATEGIES, ResourcePolicy
 from pages.home_page import HomePage
-from utils.logging_conf import configure_logging
-from utils.reporting import Reporting
+from pages.locator_registry import LocatorRegistry, format_report
+from pages.results_page import RESULT_COLUMNS, FlightOption
+from utils.data_provider import DataProvider
+from utils.data_validation import validate_file
+from utils.instrumentation import recorder, slowest_steps_html
+from utils.logging_conf import configure_logging, parse_levels
+from utils.replay_server import DEFAULT_ARCHIVE, ReplayServer, StaticServer
+from utils.resource_monitor import ResourceMonitor
+from utils.reporting import Reporting, screenshot_service
+from utils.result_cache import (
+    DEFAULT_CACHE, DEFAULT_TTL_HOURS, ResultCache, ResultCacheRecorder, cache_key, code_digest, file_digest,
+    run_target,
+)
+from utils.results_writer import ResultsWriter
+from utils.run_journal import DEFAULT_JOURNAL, JournalRecorder, RunJournal, passed_keys, resumable
+from utils.scheduler import (
+    DEFAULT_HISTORY, DurationHistory, DurationRecorder, fingerprint_from_nodeid, history_key, make_duration_scheduler,
+    passenger_clicks,
+)
+from utils.startup import StartupOrchestrator, StartupTimeline
+
+# Startup steps are timed from here: conftest and its imports are loaded
+startup_timeline = StartupTimeline()
 
 # Configure logging settings
 configure_logging()
 
+BROWSER_TESTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_search.py")
+# Both can be pointed elsewhere through the environment (e.g. another workbook)
+REPORTS_DIR = os.environ.get(
+    "IBERIA_REPORTS_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports"))
+FLIGHT_DATA = os.environ.get(
+    "IBERIA_FLIGHT_DATA",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "Iberia_Flight_Data.xlsx"))
+LOCATORS_PROFILED = pytest.StashKey[bool]()
+STARTUP_ORCHESTRATOR = pytest.StashKey[StartupOrchestrator]()
+RESULT_KEY_FUNCTION = pytest.StashKey[object]()
+# Row index -> quarantine reasons, validated once on the controller and handed to the workers
+QUARANTINE = pytest.StashKey[dict]()
+
 
 def pytest_addoption(parser):
     """
-    Adds a command-line option to select the browser.
+    Adds command-line options to select the browser and tune the driver pool.
     Usage: --browser=chrome or --browser=firefox
     """
     parser.addoption(
         "--browser", action="store", default="chrome", help="Type of browser: chrome or firefox"
     )
+    parser.addoption(
+        "--browser-version", action="store", default=None,
+        help="Browser major version used to pick the cached driver (detected when omitted)"
+    )
+    parser.addoption(
+        "--fetch-drivers", action="store_true", default=False,
+        help="Download and cache the driver if it is not in drivers/cache (needs network)"
+    )
+    parser.addoption(
+        "--block-domains", action="store", default="",
+        help="Comma-separated domains to block (Chrome only); 'default' blocks known analytics and ad networks"
+    )
+    parser.addoption(
+        "--block-types", action="store", default="",
+        help="Comma-separated resource types to block (Chrome only): image, font, media, stylesheet"
+    )
+    parser.addoption(
+        "--page-load-strategy", action="store", default="normal", choices=PAGE_LOAD_STRATEGIES,
+        help="'eager' stops waiting at DOMContentLoaded and checks the page's key form elements instead"
+    )
+    parser.addoption(
+        "--replay", action="store_true", default=False,
+        help="Serve the recorded home page from a local archive instead of the live site"
+    )
+    parser.addoption(
+        "--local-site", action="store_true", default=False,
+        help="Run against the hand-written copies in data/site (search form and results page) instead of iberia.com"
+    )
+    parser.addoption(
+        "--replay-archive", action="store", default=DEFAULT_ARCHIVE,
+        help="Archive used by --replay (recorded with 'python utils/replay_server.py record')"
+    )
+    parser.addoption(
+        "--profile-locators", action="store_true", default=False,
+        help="Resolve every HomePage locator once per session and attach a report of slow, ambiguous and missing ones"
+    )
+    parser.addoption(
+        "--instrument", action="store_true", default=False,
+        help="Record per-action latency of the page objects and attach a 'slowest steps' table to Allure"
+    )
+    parser.addoption(
+        "--module-log-levels", action="store", default="",
+        help="Per-module log levels, e.g. 'pages.base_page=WARNING' to silence per-click logs"
+    )
+    parser.addoption(
+        "--log-jsonl", action="store", default=None,
+        help="Also write logs as JSON lines to this file (one file per worker with -n)"
+    )
+    parser.addoption(
+        "--screenshot-scale", action="store", type=float, default=1.0,
+        help="Downscale factor for screenshots (Chrome only), e.g. 0.5 for half size"
+    )
+    parser.addoption(
+        "--schedule", action="store", default="load", choices=("load", "duration"),
+        help="With -n, 'duration' sends the longest tests first (from the duration history) to whichever worker is free"
+    )
+    parser.addoption(
+        "--duration-history", action="store", default=DEFAULT_HISTORY,
+        help="JSON file with the per-row duration history used by --schedule=duration"
+    )
+    parser.addoption(
+        "--profile-snapshot", action="store_true", default=False,
+        help="Start every browser from a clone of a profile captured after accepting cookies (captured if missing)"
+    )
+    parser.addoption(
+        "--refresh-profile", action="store_true", default=False,
+        help="Capture the profile snapshot again before the run (same as 'python drivers/profile_snapshot.py')"
+    )
+    parser.addoption(
+        "--profile-max-age", action="store", type=float, default=24,
+        help="Hours after which a profile snapshot is reported as stale"
+    )
+    parser.addoption(
+        "--serial-startup", action="store_true", default=False,
+        help="Launch the browsers when the first test needs them instead of in the background during collection"
+    )
+    parser.addoption(
+        "--fill-mode", action="store", default="keystroke", choices=("keystroke", "fast"),
+        help="'fast' sets origin, destination and dates in one script instead of typing them (data-coverage runs)"
+    )
+    parser.addoption(
+        "--collect-results", action="store", default=None, metavar="PATH",
+        help="Submit each search and stream the flights found to PATH (.csv, or .parquet with pyarrow); needs --local-site"
+    )
+    parser.addoption(
+        "--resume", action="store_true", default=False,
+        help="Skip the Excel rows that passed in the previous run (from the run journal) and run only failed or pending ones"
+    )
+    parser.addoption(
+        "--journal", action="store", default=DEFAULT_JOURNAL,
+        help="Run journal with the outcome of every test, used by --resume"
+    )
+    parser.addoption(
+        "--changed-only", action="store_true", default=False,
+        help="Run only the Excel rows whose values, code, URL, browser or row options changed since their last pass"
+    )
+    parser.addoption(
+        "--result-cache", action="store", default=DEFAULT_CACHE,
+        help="JSON file with the cached row outcomes used by --changed-only"
+    )
+    parser.addoption(
+        "--result-ttl", action="store", type=float, default=DEFAULT_TTL_HOURS,
+        help="Hours a cached pass is trusted by --changed-only before the row runs again"
+    )
+    parser.addoption(
+        "--max-browser-rss", action="store", type=float, default=2048,
+        help="Recycle a browser between tests when its processes use more MB than this (0 disables)"
+    )
+    parser.addoption(
+        "--max-js-heap", action="store", type=float, default=512,
+        help="Recycle a browser between tests when the page's JS heap exceeds this many MB (0 disables)"
+    )
+    parser.addoption(
+        "--max-latency-drift", action="store", type=float, default=2.0,
+        help="Recycle a browser when its command round trip gets this many times slower than when it started (0 disables)"
+    )
+    parser.addoption(
+        "--pool-size", action="store", type=int, default=1,
+        help="Number of warm browsers kept by each worker's driver pool"
+    )
+    parser.addoption(
+        "--max-uses", action="store", type=int, default=25,
+        help="Number of tests a pooled browser serves before it is relaunched"
+    )
 
 
-@pytest.fixture(scope="session")
-def browser(request):
+def pytest_configure(config):
+    """Apply the logging options: per-module levels and the optional JSON-lines sink."""
+    jsonl_path = config.getoption("--log-jsonl")
+    worker_id = getattr(config, "workerinput", {}).get("workerid")
+    if jsonl_path and worker_id:
+        root, extension = os.path.splitext(jsonl_path)
+        jsonl_path = f"{root}-{worker_id}{extension}"
+    configure_logging(levels=parse_levels(config.getoption("--module-log-levels")), jsonl_path=jsonl_path)
+
+    if config.getoption("--replay") and config.getoption("--local-site"):
+        raise pytest.UsageError("--replay and --local-site are exclusive: choose one local copy of the site")
+    if config.getoption("--collect-results") and not config.getoption("--local-site"):
+        # ResultsPage models data/site/results.html; the live results page markup is not mapped
+        raise pytest.UsageError("--collect-results only works with --local-site")
+
+    # Unit-test-only runs leave the browser profile, history, journal and result cache alone
+    if not worker_id and _runs_browser_tests(config):
+        _prepare_profile_snapshot(config)
+        # Only the controller sees every test report, so it owns the duration history
+        config.pluginmanager.register(DurationRecorder(
+            DurationHistory(config.getoption("--duration-history")),
+            clicks=_row_clicks,
+            report_path=os.path.join(REPORTS_DIR, "schedule.json"),
+        ), "duration_recorder")
+        if not config.option.collectonly:
+            # Without --resume the journal starts empty, so it always describes the latest run
+            config.pluginmanager.register(JournalRecorder(
+                RunJournal(config.getoption("--journal"), resume=config.getoption("--resume"))
+            ), "journal_recorder")
+        if not config.option.collectonly and config.getoption("--changed-only"):
+            config.pluginmanager.register(ResultCacheRecorder(
+                ResultCache(config.getoption("--result-cache"), config.getoption("--result-ttl")),
+                _result_key_function(config),
+            ), "result_cache_recorder")
+
+
+def _prepare_profile_snapshot(config):
     """
-    Fixture to initialize the browser session.
-    It first attempts to install the WebDriver using webdriver_manager.
-    If the installation fails, it falls back to using a local driver.
+    Capture the profile snapshot when asked to or when it is missing; runs once, before any worker starts.
+    With --replay or --local-site it is captured against a local server of the same kind the session uses.
     """
-    browser_choice = request.config.getoption("--browser")
-    driver = None
-
+    if not (config.getoption("--profile-snapshot") or config.getoption("--refresh-profile")):
+        return
+    browser_choice = config.getoption("--browser")
+    snapshot = ProfileSnapshot(browser_choice, _site(config))
+    if snapshot.exists() and not config.getoption("--refresh-profile"):
+        if snapshot.age > config.getoption("--profile-max-age") * 3600:
+            logging.warning("Profile snapshot is %.1f hours old, refresh it with --refresh-profile.", snapshot.age / 3600)
+        return
+    server = _start_site_server(config)
     try:
-        if browser_choice == "chrome":
-            # Attempt to install ChromeDriver automatically via webdriver_manager
-            driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()))
-            logging.info("ChromeDriver successfully installed using webdriver_manager.")
-        elif browser_choice == "firefox":
-            # Attempt to install GeckoDriver (Firefox) automatically via webdriver_manager
-            driver = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()))
-            logging.info("GeckoDriver successfully installed using webdriver_manager.")
+        snapshot.capture(server.url if server else HomePage.URL, lambda profile_dir: create_driver(
+            browser_choice, config.getoption("--browser-version"), config.getoption("--fetch-drivers"),
+            profile_dir=profile_dir,
+        ))
+    finally:
+        if server:
+            server.stop()
+
+
+def _site(config):
+    """Which copy of the site the session runs against: 'replay', 'local-site' or 'live'."""
+    if config.getoption("--replay"):
+        return "replay"
+    if config.getoption("--local-site"):
+        return "local-site"
+    return "live"
+
+
+def _start_site_server(config):
+    """Start the local server of --replay or --local-site, or return None for the live site."""
+    site = _site(config)
+    if site == "replay":
+        return ReplayServer(config.getoption("--replay-archive")).start()
+    if site == "local-site":
+        return StaticServer().start()
+    return None
+
+
+def _result_key_function(config):
+    """
+    Row fingerprint -> result cache key for this run's code, target URL, browser and row options.
+    Hashing the code is the expensive part, so it is done once per process and only for --changed-only.
+    """
+    if RESULT_KEY_FUNCTION in config.stash:
+        return config.stash[RESULT_KEY_FUNCTION]
+    code = code_digest()
+    if config.getoption("--replay"):
+        url = "replay:" + file_digest(config.getoption("--replay-archive"))
+    elif config.getoption("--local-site"):
+        url = "local-site"
+    else:
+        url = HomePage.URL
+    target = run_target(
+        config.getoption("--browser"), url, config.getoption("--fill-mode"), config.getoption("--collect-results"),
+    )
+    config.stash[RESULT_KEY_FUNCTION] = lambda fingerprint: cache_key(fingerprint, code, target)
+    return config.stash[RESULT_KEY_FUNCTION]
+
+
+def _quarantine_flight_data():
+    """
+    Validate the whole flight sheet before any browser starts and write the invalid rows to
+    reports/quarantine.csv. Returns row index -> reasons for the rows to skip.
+    """
+    with startup_timeline.span("data_validation"):
+        report = validate_file(FLIGHT_DATA)
+        report.write(os.path.join(REPORTS_DIR, "quarantine.csv"))
+    if report.invalid_count:
+        logging.warning("Quarantined %s flight rows:\n%s", report.invalid_count, report.format())
+    return {int(index): reasons for index, reasons in report.reasons().items()}
+
+
+def _quarantined_rows(config):
+    """The quarantine of this run: computed here on the controller, received through workerinput on a worker."""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        return workerinput.get("quarantine", {})
+    return config.stash.get(QUARANTINE, {})
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the controller's quarantine to each xdist worker so they never re-read or re-validate the sheet."""
+    node.workerinput["quarantine"] = node.config.stash.get(QUARANTINE, {})
+
+
+def _row_clicks():
+    """Passenger clicks of every Excel row, keyed by row fingerprint."""
+    return {record.fingerprint(): passenger_clicks(record) for record in DataProvider.iter_records(FLIGHT_DATA)}
+
+
+def pytest_sessionstart(session):
+    """
+    Start launching the driver pool (and open the home page on one browser) in the background,
+    so it overlaps with test collection and the flight data load.
+    """
+    config = session.config
+    startup_timeline.mark("session_start")
+    # Runs before xdist starts the workers (its sessionstart is trylast), so they get the result
+    if not getattr(config, "workerinput", None) and _runs_browser_tests(config):
+        config.stash[QUARANTINE] = _quarantine_flight_data()
+    is_xdist_controller = config.pluginmanager.hasplugin("dsession")
+    if is_xdist_controller or config.option.collectonly or config.getoption("--serial-startup"):
+        return
+    if not _runs_browser_tests(config):
+        return
+    orchestrator = StartupOrchestrator(startup_timeline)
+    # The local servers only start with the session fixtures, so there is no page to warm up yet
+    warm = None if config.getoption("--replay") or config.getoption("--local-site") else _warm_home_page
+    orchestrator.launch(lambda: _build_driver_pool(config), warm)
+    config.stash[STARTUP_ORCHESTRATOR] = orchestrator
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip the quarantined Excel rows.
+    With --resume, deselect the Excel rows whose latest journal entry is a pass.
+    With --changed-only, deselect the rows with a fresh cached pass under their current key.
+    Runs on every xdist worker, which all read the same files, so their collections still match.
+    """
+    quarantine = _quarantined_rows(config)
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if quarantine and callspec and "data" in callspec.params and str(item.path) == BROWSER_TESTS:
+            # The rows are parametrized in sheet order, so the parameter index is the row index
+            reasons = quarantine.get(callspec.indices["data"])
+            if reasons:
+                item.add_marker(pytest.mark.skip(reason=f"Quarantined row: {reasons}"))
+
+    resume = config.getoption("--resume")
+    changed_only = config.getoption("--changed-only")
+    if not (resume or changed_only):
+        return
+    passed = passed_keys(config.getoption("--journal")) if resume else set()
+    if changed_only:
+        cache = ResultCache(config.getoption("--result-cache"), config.getoption("--result-ttl"))
+        key_for = _result_key_function(config)
+    kept, skipped = [], []
+    for item in items:
+        fingerprint = fingerprint_from_nodeid(item.nodeid)
+        if resume and resumable(item.nodeid) and history_key(item.nodeid) in passed:
+            skipped.append(item)
+        elif changed_only and fingerprint and cache.is_fresh(fingerprint, key_for(fingerprint)):
+            skipped.append(item)
         else:
-            raise ValueError(f"Unsupported browser: {browser_choice}")
-    except WebDriverException as e:
-        logging.error(f"Error installing the WebDriver with webdriver_manager: {e}")
-
-        # Fallback to using local drivers if installation fails
-        if browser_choice == "chrome":
-            local_driver_path = os.path.join(os.getcwd(), 'drivers', 'chromedriver')
-            logging.info(f"Using local ChromeDriver from: {local_driver_path}")
-            driver = webdriver.Chrome(service=ChromeService(local_driver_path))
-        elif browser_choice == "firefox":
-            local_driver_path = os.path.join(os.getcwd(), 'drivers', 'geckodriver')
-            logging.info(f"Using local GeckoDriver from: {local_driver_path}")
-            driver = webdriver.Firefox(service=FirefoxService(local_driver_path))
+            kept.append(item)
+    if skipped:
+        logging.info("Skipping %s rows that already passed, %s tests left", len(skipped), len(kept))
+        config.hook.pytest_deselected(items=skipped)
+        items[:] = kept
 
-    if driver is None:
-        raise Exception(f"Error starting the browser: {browser_choice}")
 
-    yield driver
-    driver.quit()
+def _runs_browser_tests(config):
+    """True when the command line selects the browser tests (e.g. not when only unit test files are given)."""
+    for arg in config.args:
+        path = os.path.abspath(os.path.join(config.invocation_params.dir, arg.split("::")[0]))
+        if BROWSER_TESTS == path or BROWSER_TESTS.startswith(path.rstrip(os.sep) + os.sep):
+            return True
+    return False
+
+
+def pytest_sessionfinish(session):
+    """Quit the browsers launched at session start even when no test used the pool (all deselected)."""
+    orchestrator = session.config.stash.get(STARTUP_ORCHESTRATOR, None)
+    if orchestrator is not None:
+        orchestrator.shutdown()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    with startup_timeline.span("collection"):
+        yield
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_call(item):
+    if startup_timeline.first("first_interaction") is None:
+        startup_timeline.mark("first_interaction")
+
+
+def _warm_home_page(driver):
+    """Open the home page on a fresh browser; the first test that gets it skips its own navigation."""
+    HomePage(driver).navigate_home()
+    driver.warm_url = HomePage.URL
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """With --schedule=duration, dispatch the tests longest-first from the duration history."""
+    if config.getoption("--schedule") != "duration":
+        return None
+    recorder_plugin = config.pluginmanager.get_plugin("duration_recorder")
+    if recorder_plugin is None:
+        return None
+    history = recorder_plugin.history
+    model = history.click_model()
+    clicks = recorder_plugin.clicks
+
+    def estimate(nodeid):
+        key = history_key(nodeid)
+        return history.estimate(key, clicks.get(key), model)
+
+    return make_duration_scheduler(config, log, estimate)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def replay_site(request):
+    """
+    Fixture that, with --replay, serves the recorded home page from a local HTTP server, or with
+    --local-site the hand-written copies in data/site, and points HomePage.URL at it for the whole session.
+    """
+    server = _start_site_server(request.config)
+    if server is None:
+        yield None
+        return
+
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr(HomePage, "URL", server.url)
+
+    yield server
+    monkeypatch.undo()
+    server.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def action_timings(request):
+    """
+    Fixture that, with --instrument, records the latency of every page-object action.
+    At session end it writes reports/timings[-<worker>].json and attaches it to Allure.
+    """
+    if not request.config.getoption("--instrument"):
+        yield None
+        return
+
+    recorder.reset()
+    recorder.enable()
+    yield recorder
+    recorder.disable()
+
+    worker_id = getattr(request.config, "workerinput", {}).get("workerid")
+    file_name = f"timings-{worker_id}.json" if worker_id else "timings.json"
+    summary = recorder.write_summary(os.path.join(REPORTS_DIR, file_name))
+    allure.attach(slowest_steps_html(summary), name="Slowest steps", attachment_type=allure.attachment_type.HTML)
+    allure.attach(json.dumps(summary, indent=2), name=file_name, attachment_type=allure.attachment_type.JSON)
+
 
+@pytest.fixture(scope="session", autouse=True)
+def screenshots(request):
+    """Fixture that configures the background screenshot writer and drains it at session end."""
+    screenshot_service.scale = request.config.getoption("--screenshot-scale")
+    yield screenshot_service
+    screenshot_service.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def startup_report(request):
+    """Fixture that writes the startup timeline to reports/startup[-<worker>].json and attaches it to Allure."""
+    yield startup_timeline
+    worker_id = getattr(request.config, "workerinput", {}).get("workerid")
+    file_name = f"startup-{worker_id}.json" if worker_id else "startup.json"
+    startup_timeline.write(os.path.join(REPORTS_DIR, file_name))
+    report = startup_timeline.format()
+    logging.info("Startup timeline:\n%s", report)
+    allure.attach(report, name="Startup timeline", attachment_type=allure.attachment_type.TEXT)
+
+
+def _build_driver_pool(config):
+    """Create the driver pool from the command-line options (launches the browsers)."""
+    browser_choice = config.getoption("--browser")
+    browser_version = config.getoption("--browser-version")
+    fetch_drivers = config.getoption("--fetch-drivers")
+    resource_policy = ResourcePolicy.from_options(
+        config.getoption("--block-domains"),
+        config.getoption("--block-types"),
+        config.getoption("--page-load-strategy"),
+    )
+    snapshot = ProfileSnapshot(browser_choice, _site(config)) if config.getoption("--profile-snapshot") else None
+
+    def launch():
+        if snapshot is None:
+            return create_driver(browser_choice, browser_version, fetch_drivers, resource_policy)
+        profile_dir = snapshot.clone()
+        try:
+            driver = create_driver(browser_choice, browser_version, fetch_drivers, resource_policy,
+                                   profile_dir=profile_dir)
+        except Exception:
+            snapshot.discard(profile_dir)
+            raise
+        # The pool deletes the clone when it retires the browser
+        driver.profile_dir = profile_dir
+        return driver
+
+    pool = DriverPool(
+        launch,
+        size=config.getoption("--pool-size"),
+        max_uses=config.getoption("--max-uses"),
+        snapshot=snapshot,
+    )
+    logging.info("Driver pool ready with %s %s browser(s).", pool.size, browser_choice)
+    return pool
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """
+    Fixture that keeps pre-launched browsers warm for the whole session.
+    With pytest-xdist every worker owns its own pool. The pool is normally already being
+    launched in the background since the session started.
+    """
+    orchestrator = request.config.stash.get(STARTUP_ORCHESTRATOR, None)
+    if orchestrator is not None:
+        pool = orchestrator.pool()
+    else:
+        with startup_timeline.span("pool_launch"):
+            pool = _build_driver_pool(request.config)
+
+    yield pool
+    if orchestrator is not None:
+        orchestrator.shutdown()
+    else:
+        pool.close()
+        if pool.snapshot:
+            pool.snapshot.cleanup()
+
+
+@pytest.fixture(scope="session")
+def resource_monitor(request):
+    """
+    Fixture with the monitor that samples every browser after each test.
+    At session end the memory and latency trend is written to reports/resources[-<worker>].json and attached to Allure.
+    """
+    monitor = ResourceMonitor(
+        request.config.getoption("--max-browser-rss"),
+        request.config.getoption("--max-js-heap"),
+        request.config.getoption("--max-latency-drift"),
+    )
+    yield monitor
+    if not monitor.samples:
+        return
+    worker_id = getattr(request.config, "workerinput", {}).get("workerid")
+    file_name = f"resources-{worker_id}.json" if worker_id else "resources.json"
+    monitor.write(os.path.join(REPORTS_DIR, file_name))
+    allure.attach(monitor.format(), name="Browser resources", attachment_type=allure.attachment_type.TEXT)
+
+
+@pytest.fixture
+def browser(request, driver_pool, resource_monitor):
+    """
+    Fixture that leases a warm browser for one test.
+    The browser is reset (cookies, storage, about:blank) when it goes back to the pool, or replaced
+    when the resource monitor finds it over a memory or latency threshold. The replacement starts
+    from the same profile, and search_page navigates and accepts cookies again for the next test.
+    """
+    orchestrator = request.config.stash.get(STARTUP_ORCHESTRATOR, None)
+    # The browser the startup orchestrator already opened the home page on, if still unused
+    driver = orchestrator.take_warm_driver() if orchestrator is not None else None
+    if driver is None:
+        driver = driver_pool.acquire()
+    try:
+        yield driver
+    finally:
+        vars(driver).pop("warm_url", None)
+        try:
+            recycle = resource_monitor.sample(driver, request.node.nodeid).recycle is not None
+        except Exception as e:
+            logging.warning("Could not sample browser resources, replacing the browser: %s", e)
+            recycle = True
+        driver_pool.release(driver, retire=recycle)
 
 
 @pytest.fixture
 def home_page(browser):
     return HomePage(browser)
 
+
 @pytest.fixture
-def reporting(browser):
-    return Reporting(browser)
+def search_page(request, home_page):
+    """
+    Fixture for data-driven tests: a HomePage loaded and with cookies accepted,
+    ready to receive flight data.
+    """
+    if getattr(home_page.driver, "warm_url", None) == home_page.URL:
+        del home_page.driver.warm_url
+    else:
+        home_page.navigate_home()
+    if request.config.getoption("--profile-locators") and not request.config.stash.get(LOCATORS_PROFILED, False):
+        # Profiled before accepting cookies so the consent banner locators can still match
+        request.config.stash[LOCATORS_PROFILED] = True
+        report = format_report(LocatorRegistry.from_page(HomePage).profile(home_page.driver))
+        logging.info("Locator profile:\n%s", report)
+        allure.attach(report, name="Locator profile", attachment_type=allure.attachment_type.TEXT)
+    # A profile snapshot already carries the consent cookies, so the banner never shows up
+    if not request.config.getoption("--profile-snapshot") and home_page.find_object(home_page.COOKIE_BTN):
+        home_page.click(home_page.COOKIE_BTN)
+        home_page.wait_to_darkfilter()
+
+    yield home_page
+    logging.info("Element cache stats: %s", home_page.cache_stats)
 
 
+@pytest.fixture
+def fill_mode(request):
+    """How test_enter_fly_data fills the search form: 'keystroke' (default) or 'fast'."""
+    return request.config.getoption("--fill-mode")
 
 
+@pytest.fixture(scope="session")
+def results_writer(request):
+    """
+    Fixture with the writer the flight results are streamed to, or None without --collect-results.
+    With pytest-xdist every worker writes its own file (results-gw0.csv, ...).
+    """
+    path = request.config.getoption("--collect-results")
+    if not path:
+        yield None
+        return
+    worker_id = getattr(request.config, "workerinput", {}).get("workerid")
+    if worker_id:
+        root, extension = os.path.splitext(path)
+        path = f"{root}-{worker_id}{extension}"
+    with ResultsWriter(path, RESULT_COLUMNS, typing.get_type_hints(FlightOption)) as writer:
+        yield writer
+
 
+@pytest.fixture
+def reporting(browser):
+    return Reporting(browser)
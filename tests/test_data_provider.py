@@ -0,0 +1,46 @@
+"""Tests of the compiled Excel cache of the data provider; no browser is needed."""
+import os
+import shutil
+
+import pytest
+
+import utils.data_provider as data_provider
+from utils.data_provider import DataProvider
+
+EXCEL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "Iberia_Flight_Data.xlsx")
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    pytest.importorskip("openpyxl")
+    path = tmp_path / "flights.xlsx"
+    shutil.copyfile(EXCEL, path)
+    return str(path)
+
+
+@pytest.fixture
+def hashes(monkeypatch):
+    """Paths hashed by the data provider."""
+    hashed = []
+    file_sha256 = data_provider._file_sha256
+
+    def counting_sha256(path):
+        hashed.append(path)
+        return file_sha256(path)
+
+    monkeypatch.setattr(data_provider, "_file_sha256", counting_sha256)
+    return hashed
+
+
+def test_touched_source_is_hashed_once_and_the_header_refreshed(workbook, hashes):
+    rows = list(DataProvider.iter_records(workbook))
+    hashes.clear()
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert list(DataProvider.iter_records(workbook)) == rows
+    assert hashes == [workbook]
+
+    assert list(DataProvider.iter_records(workbook)) == rows
+    assert hashes == [workbook]
+
@@ -0,0 +1,86 @@
+"""Tests of the flight data loading and the pre-flight validation; no browser is needed."""
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from utils.data_provider import COLUMNS, DataProvider, FlightRecord, _to_int
+from utils.data_validation import validate_frame, validate_records
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VALID_ROW = ("Madrid (MAD)", "Barcelona (BCN)", "25/10/2024", "26/10/2024", 3, 2, 0)
+
+
+def record(**changes):
+    return FlightRecord(*VALID_ROW)._replace(**changes)
+
+
+@pytest.mark.parametrize("cell, expected", [
+    (3, 3), (3.0, 3), ("4", 4), (" 2 ", 2), (None, None), ("", None), (float("nan"), None),
+    ("two", "two"), (1.5, 1.5),
+])
+def test_to_int_keeps_cells_that_are_not_whole_numbers(cell, expected):
+    assert _to_int(cell) == expected
+
+
+def test_valid_rows_pass():
+    report = validate_records([FlightRecord(*VALID_ROW), record(end_date="")])
+    assert report.invalid_count == 0
+
+
+@pytest.mark.parametrize("changes, check", [
+    ({"origin": "Atlantis"}, "bad_origin"),
+    ({"destiny": "Madrid (MAD)"}, "same_route_ends"),
+    ({"start_date": "31/02/2024"}, "bad_start_date"),
+    ({"end_date": "2024-10-26"}, "bad_end_date"),
+    ({"end_date": "20/10/2024"}, "end_before_start"),
+    ({"adult": "two"}, "bad_counts"),
+    ({"child": 1.5}, "bad_counts"),
+    ({"adult": None}, "bad_adults"),
+    ({"baby": -1}, "negative_counts"),
+    ({"adult": 5, "child": 5}, "too_many_passengers"),
+    ({"adult": 1, "baby": 2}, "babies_exceed_adults"),
+])
+def test_invalid_rows_are_flagged(changes, check):
+    report = validate_records([FlightRecord(*VALID_ROW), record(**changes)])
+    assert report.invalid.tolist() == [False, True]
+    assert report.issues[check].tolist() == [False, True]
+
+
+def test_duplicates_keep_the_first_row():
+    report = validate_records([FlightRecord(*VALID_ROW)] * 3)
+    assert report.issues["duplicate_row"].tolist() == [False, True, True]
+
+
+def test_quarantine_report_lists_raw_cells_and_reasons(tmp_path):
+    report = validate_frame(pd.DataFrame([VALID_ROW, VALID_ROW[:4] + ("two", 0, 0)], columns=FlightRecord._fields))
+    path = tmp_path / "quarantine.csv"
+    report.write(str(path))
+    quarantined = pd.read_csv(path)
+    assert quarantined["row"].tolist() == [1]
+    assert quarantined["adult"].tolist() == ["two"]
+    assert "not a whole number" in quarantined["reasons"][0]
+
+
+def test_bad_cell_sheet_is_quarantined_and_still_collects(tmp_path):
+    """A sheet with a non-numeric passenger cell loads, is quarantined and its row collected as skipped."""
+    sheet = tmp_path / "flights.xlsx"
+    rows = [VALID_ROW, ("Barcelona (BCN)", "Madrid (MAD)", "01/11/2024", "02/11/2024", "two", 1, 0)]
+    pd.DataFrame(rows, columns=COLUMNS).to_excel(sheet, index=False)
+    assert [row.adult for row in DataProvider.iter_records(str(sheet))] == [3, "two"]
+
+    reports = tmp_path / "reports"
+    env = dict(os.environ, IBERIA_FLIGHT_DATA=str(sheet), IBERIA_REPORTS_DIR=str(reports))
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider",
+         os.path.join("tests", "test_search.py")],
+        cwd=base_dir, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "4 tests collected" in result.stdout
+    quarantined = pd.read_csv(reports / "quarantine.csv")
+    assert quarantined["row"].tolist() == [1]
+    assert quarantined["origin"].tolist() == ["Barcelona (BCN)"]
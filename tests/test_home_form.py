@@ -0,0 +1,72 @@
+"""Tests of the passenger rules of the home page search form; no browser is needed."""
+import logging
+
+import pytest
+
+from pages.home_page import HomeForm
+
+
+@pytest.fixture
+def form():
+    form = HomeForm()
+    form.logger = logging.getLogger("test_home_form")
+    return form
+
+
+@pytest.mark.parametrize("counts", [(1, 0, 0), (2, 7, 2), ("3", "2", None)])
+def test_passenger_target_within_the_limits(form, counts):
+    adult, child, baby = counts
+    assert form.passenger_target(adult, child, baby) == (int(adult), int(child), int(baby or 0))
+
+
+@pytest.mark.parametrize("counts, message", [
+    ((0, 1, 0), "Invalid passenger counts"),
+    ((None, 2, 0), "Invalid passenger counts"),
+    ((1, -1, 0), "Invalid passenger counts"),
+    ((5, 5, 0), "At most 9 adults and children"),
+    ((2, 0, 3), "Babies cannot outnumber adults"),
+])
+def test_passenger_target_outside_the_limits(form, counts, message):
+    with pytest.raises(ValueError, match=message):
+        form.passenger_target(*counts)
+
+
+def test_parse_passenger_counts(form):
+    assert form.parse_passenger_counts(["2", "1", "0"]) == (2, 1, 0)
+
+
+@pytest.mark.parametrize("texts", [["2", "", "0"], ["2", "uno", "0"], ["2", None, "0"]])
+def test_parse_passenger_counts_rejects_unreadable_counters(form, texts, caplog):
+    assert form.parse_passenger_counts(texts) is None
+    assert "Cannot read the passenger counters" in caplog.text
+
+
+def test_passenger_steps_lowers_before_it_raises(form):
+    steps = form.passenger_steps((3, 4, 2), (1, 5, 1))
+
+    assert steps == [
+        (form.BABY_MINUS_BTN, 1),
+        (form.ADULT_MINUS_BTN, 2),
+        (form.CHILD_PLUS_BTN, 1),
+    ]
+
+
+def test_passenger_steps_keeps_every_intermediate_state_valid(form):
+    current, target = (1, 8, 0), (8, 1, 8)
+    step_delta = {
+        form.ADULT_PLUS_BTN: (1, 0, 0), form.ADULT_MINUS_BTN: (-1, 0, 0),
+        form.CHILD_PLUS_BTN: (0, 1, 0), form.CHILD_MINUS_BTN: (0, -1, 0),
+        form.BABY_PLUS_BTN: (0, 0, 1), form.BABY_MINUS_BTN: (0, 0, -1),
+    }
+
+    state = current
+    for button, clicks in form.passenger_steps(current, target):
+        for _ in range(clicks):
+            state = tuple(count + delta for count, delta in zip(state, step_delta[button]))
+            form.passenger_target(*state)
+
+    assert state == target
+
+
+def test_passenger_steps_without_changes(form):
+    assert form.passenger_steps((2, 1, 0), (2, 1, 0)) == []
@@ -0,0 +1,69 @@
+"""Tests of the request block list and the per-driver page stats; the CDP calls go to a fake driver."""
+import fnmatch
+import json
+
+import pytest
+
+from drivers.resource_policy import ResourcePolicy
+
+
+class FakeChrome:
+    """Records the CDP commands and serves canned performance log events."""
+
+    name = "chrome"
+
+    def __init__(self, events=()):
+        self.commands = []
+        self.events = list(events)
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+    def get_log(self, log_type):
+        entries = [{"message": json.dumps({"message": event})} for event in self.events]
+        self.events = []
+        return entries
+
+
+def blocked(event_count=1, transferred=0):
+    events = [{"method": "Network.loadingFailed", "params": {"blockedReason": "inspector"}}] * event_count
+    events.append({"method": "Network.loadingFinished", "params": {"encodedDataLength": transferred}})
+    return events
+
+
+def matches(patterns, url):
+    return any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns)
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://bing.com/bat.js", True),
+    ("https://bat.bing.com/action/0", True),
+    ("https://notbing.com/bat.js", False),
+    ("https://www.iberia.com/?ref=bing.com/x", False),
+])
+def test_domain_patterns_are_anchored_to_the_host(url, expected):
+    assert matches(ResourcePolicy(["bing.com"]).url_patterns(), url) is expected
+
+
+def test_page_stats_are_kept_per_driver():
+    policy = ResourcePolicy(["bing.com"], page_weights={"https://www.iberia.com/es/": 1000})
+    first, second = FakeChrome(blocked(2, 600)), FakeChrome(blocked(1, 900))
+    policy.apply(first)
+    policy.apply(second)
+
+    assert first.commands[-1] == ("Network.setBlockedURLs", {"urls": ["*://bing.com/*", "*://*.bing.com/*"]})
+    policy.collect_page_stats(first, "https://www.iberia.com/es/")
+    policy.collect_page_stats(second, "https://www.iberia.com/es/")
+
+    assert first.page_stats.totals == {"pages": 1, "blocked_requests": 2, "transferred_bytes": 600, "saved_bytes": 400}
+    assert second.page_stats.totals == {"pages": 1, "blocked_requests": 1, "transferred_bytes": 900, "saved_bytes": 100}
+
+
+def test_saved_bytes_are_unknown_without_a_measured_page_weight():
+    policy = ResourcePolicy(["bing.com"], page_weights={})
+    driver = FakeChrome(blocked(3, 500))
+    policy.apply(driver)
+
+    stats = policy.collect_page_stats(driver, "http://127.0.0.1:8000/")
+
+    assert stats["blocked_requests"] == 3 and stats["saved_bytes"] is None
@@ -0,0 +1,69 @@
+"""Tests of the result cache behind --changed-only; no browser is needed."""
+from types import SimpleNamespace
+
+import pytest
+
+from utils.result_cache import ResultCache, ResultCacheRecorder, cache_key, run_target
+
+FINGERPRINT = "5aa4b94bb0553b90"
+NODEID = f"tests/test_search.py::test_enter_fly_data[row0-Madrid (MAD)-Barcelona (BCN)-{FINGERPRINT}]"
+TARGET = run_target("chrome", "local-site", "keystroke", False)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "results.json"), ttl_hours=1)
+
+
+def test_a_recent_pass_under_the_same_key_is_fresh(cache):
+    key = cache_key(FINGERPRINT, "code", TARGET)
+    cache.record(FINGERPRINT, key, "passed")
+
+    assert cache.is_fresh(FINGERPRINT, key)
+    assert not cache.is_fresh("0000000000000000", key)
+
+
+@pytest.mark.parametrize("code, target", [
+    ("edited code", TARGET),
+    ("code", run_target("firefox", "local-site", "keystroke", False)),
+    ("code", run_target("chrome", "local-site", "fast", False)),
+    ("code", run_target("chrome", "local-site", "keystroke", True)),
+])
+def test_a_pass_under_another_key_is_not_fresh(cache, code, target):
+    cache.record(FINGERPRINT, cache_key(FINGERPRINT, "code", TARGET), "passed")
+
+    assert not cache.is_fresh(FINGERPRINT, cache_key(FINGERPRINT, code, target))
+
+
+@pytest.mark.parametrize("outcome", ["failed", "skipped"])
+def test_only_passes_are_fresh(cache, outcome):
+    cache.record(FINGERPRINT, "key", outcome)
+
+    assert not cache.is_fresh(FINGERPRINT, "key")
+
+
+def test_a_pass_older_than_the_ttl_is_not_fresh(cache):
+    cache.record(FINGERPRINT, "key", "passed")
+    recorded_at = cache.entries[FINGERPRINT]["at"]
+
+    assert cache.is_fresh(FINGERPRINT, "key", now=recorded_at + 3599)
+    assert not cache.is_fresh(FINGERPRINT, "key", now=recorded_at + 3600)
+
+
+def report(when, outcome):
+    return SimpleNamespace(nodeid=NODEID, when=when, failed=outcome == "failed", skipped=outcome == "skipped")
+
+
+@pytest.mark.parametrize("reports, expected", [
+    ([report("setup", "passed"), report("call", "passed"), report("teardown", "passed")], "passed"),
+    ([report("setup", "passed"), report("call", "failed"), report("teardown", "passed")], "failed"),
+    ([report("setup", "skipped"), report("teardown", "passed")], "skipped"),
+    ([report("???", "failed")], "failed"),
+])
+def test_recorder_stores_the_outcome_of_each_row(cache, reports, expected):
+    recorder = ResultCacheRecorder(cache, lambda fingerprint: "key")
+    for item in reports:
+        recorder.pytest_runtest_logreport(item)
+    recorder.pytest_sessionfinish(None)
+
+    assert ResultCache(cache.path).entries[FINGERPRINT]["outcome"] == expected
@@ -0,0 +1,106 @@
+"""
+Tests of the 'load more' pagination of ResultsPage. A fake driver replays the behaviour of
+data/site/results.html with a click that takes effect late, as on a slow page; the same flow then
+runs on the real local page when Chrome is installed.
+"""
+import pytest
+
+from pages.results_page import ResultsPage
+from pages.wait_engine import WaitEngine
+
+
+class FakeResultsDriver:
+    """
+    The list logic of data/site/results.html, advanced one step per script call: pages of PAGE_SIZE
+    rows rendered CHUNK_SIZE at a time, with 'load more' shown between pages. A click starts the next
+    page only CLICK_LAG calls later, and every click starts one, like the page's click listener.
+    """
+
+    PAGE_SIZE, CHUNK_SIZE, CLICK_LAG = 20, 5, 3
+
+    def __init__(self, total):
+        self.total = total
+        self.rendered = 0
+        self.page_ends = [min(self.PAGE_SIZE, total)]  # Pages started, loading in order
+        self.clicks = []  # Calls left before each pending click starts its page
+        self.click_count = 0
+
+    def click_load_more(self):
+        self.click_count += 1
+        self.clicks.append(self.CLICK_LAG)
+
+    def _step(self):
+        self.clicks = [lag - 1 for lag in self.clicks]
+        while self.clicks and self.clicks[0] <= 0:
+            self.clicks.pop(0)
+            start = self.page_ends[-1] if self.page_ends else self.rendered
+            self.page_ends.append(min(start + self.PAGE_SIZE, self.total))
+        if self.page_ends:
+            self.rendered = min(self.rendered + self.CHUNK_SIZE, self.page_ends[0])
+            if self.rendered >= self.page_ends[0]:
+                self.page_ends.pop(0)
+
+    def execute_script(self, script, start, count):
+        self._step()
+        loading = bool(self.page_ends)
+        rows = [[f"IB{index}", "IB", "08:00", "09:00", "1h", "Directo", "Básica", "50,00 €"]
+                for index in range(start, min(start + count, self.rendered))]
+        return {
+            "rows": rows,
+            "total": self.rendered,
+            "state": "loading" if loading else ("more" if self.rendered < self.total else "done"),
+            "can_load_more": not loading and self.rendered < self.total,
+        }
+
+
+@pytest.fixture
+def fake_page(monkeypatch):
+    driver = FakeResultsDriver(total=60)
+    page = ResultsPage(driver)
+    page.waits = WaitEngine(driver, poll_start=0.001, poll_max=0.001)
+    monkeypatch.setattr(page, "wait_for_element", lambda *args: True)
+    monkeypatch.setattr(page, "click", lambda locator: driver.click_load_more())
+    return page
+
+
+def test_load_more_is_clicked_once_per_page(fake_page):
+    flights = list(fake_page.iter_results("MAD", "BCN", "25/10/2024"))
+
+    assert [flight.flight_id for flight in flights] == [f"IB{index}" for index in range(60)]
+    assert fake_page.driver.click_count == 2
+
+
+def test_a_late_click_is_not_repeated(fake_page):
+    fake_page.driver.CLICK_LAG = 10
+
+    flights = list(fake_page.iter_results())
+
+    assert len(flights) == 60
+    assert fake_page.driver.click_count == 2
+
+
+def test_max_results_stops_before_loading_more(fake_page):
+    assert len(list(fake_page.iter_results(max_results=20))) == 20
+    assert fake_page.driver.click_count == 0
+
+
+def test_results_html_in_chrome():
+    """Every flight of the local results page is read once (needs Chrome)."""
+    from drivers.driver_resolver import detect_browser_version
+
+    if detect_browser_version("chrome") is None:
+        pytest.skip("Chrome is not installed")
+    from drivers.driver_factory import create_driver
+    from utils.replay_server import StaticServer
+
+    server = StaticServer().start()
+    driver = create_driver("chrome", headless=True)
+    try:
+        page = ResultsPage(driver)
+        page.navigate_to(f"{server.url}results.html?origin=MAD&destiny=BCN&start_date=25/10/2024&total=70")
+        flights = list(page.iter_results("MAD", "BCN", "25/10/2024"))
+    finally:
+        driver.quit()
+        server.stop()
+
+    assert len({flight.flight_id for flight in flights}) == len(flights) == 70
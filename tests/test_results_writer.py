@@ -0,0 +1,52 @@
+"""Tests of the CSV/Parquet writer used by --collect-results; no browser is needed."""
+import csv
+import typing
+
+import pytest
+
+from pages.results_page import RESULT_COLUMNS, FlightOption
+from utils import results_writer
+from utils.results_writer import ResultsWriter
+
+
+def flight(number, price):
+    return FlightOption("Madrid (MAD)", "Barcelona (BCN)", "25/10/2024", f"id{number}", f"IB{number}",
+                        "08:00", "09:15", "1h 15m", "Directo", "Basic", price, "€" if price is not None else None)
+
+
+def test_csv_rows_are_written_with_a_header(tmp_path):
+    path = tmp_path / "results.csv"
+    with ResultsWriter(str(path), RESULT_COLUMNS) as writer:
+        assert writer.write_all(flight(number, 89.99) for number in range(3)) == 3
+
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == list(RESULT_COLUMNS)
+    assert [row[4] for row in rows[1:]] == ["IB0", "IB1", "IB2"]
+
+
+def test_parquet_keeps_the_price_type_when_the_first_row_group_has_no_prices(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(results_writer, "PARQUET_ROW_GROUP", 2)
+    path = tmp_path / "results.parquet"
+
+    with ResultsWriter(str(path), RESULT_COLUMNS, typing.get_type_hints(FlightOption)) as writer:
+        writer.write_all([flight(0, None), flight(1, None), flight(2, 89.99), flight(3, 120.5), flight(4, None)])
+
+    table = pq.read_table(path)
+    assert str(table.schema.field("price").type) == "double"
+    assert table.column("price").to_pylist() == [None, None, 89.99, 120.5, None]
+    assert pq.ParquetFile(path).num_row_groups == 3
+
+
+def test_parquet_without_types_writes_an_empty_first_column_as_strings(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(results_writer, "PARQUET_ROW_GROUP", 1)
+    path = tmp_path / "results.parquet"
+
+    with ResultsWriter(str(path), RESULT_COLUMNS) as writer:
+        writer.write_all([flight(0, None), flight(1, None)._replace(currency="€")])
+
+    table = pq.read_table(path)
+    assert str(table.schema.field("currency").type) == "string"
+    assert table.column("currency").to_pylist() == [None, "€"]
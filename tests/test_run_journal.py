@@ -0,0 +1,71 @@
+"""Tests of the run journal behind --resume, including a last line cut short by a crash."""
+import json
+from types import SimpleNamespace
+
+from utils.run_journal import FAILED, PASSED, JournalRecorder, RunJournal, passed_keys, read_journal
+
+
+def write_lines(path, *entries, tail=b""):
+    with open(path, "wb") as file:
+        for entry in entries:
+            file.write(json.dumps(entry).encode("utf-8") + b"\n")
+        file.write(tail)
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    write_lines(path, {"key": "a", "outcome": PASSED}, {"key": "b", "outcome": FAILED}, tail=b'{"key": "c", "outc')
+
+    entries, valid_end = read_journal(str(path))
+
+    assert [entry["key"] for entry in entries] == ["a", "b"]
+    assert valid_end == len(path.read_bytes()) - len(b'{"key": "c", "outc')
+
+
+def test_corrupt_line_is_skipped(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    write_lines(path, {"key": "a", "outcome": PASSED})
+    with open(path, "ab") as file:
+        file.write(b"not json\n")
+        file.write(json.dumps({"key": "b", "outcome": PASSED}).encode("utf-8") + b"\n")
+
+    assert passed_keys(str(path)) == {"a", "b"}
+
+
+def test_resume_cuts_the_truncated_line_and_appends_after_it(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    write_lines(path, {"key": "a", "outcome": PASSED}, {"key": "b", "outcome": FAILED}, tail=b'{"key": "b", "ou')
+
+    journal = RunJournal(str(path), resume=True)
+    assert journal.passed("a") and not journal.passed("b")
+    journal.record("b", PASSED)
+    journal.close()
+
+    entries, valid_end = read_journal(str(path))
+    assert [(entry["key"], entry["outcome"]) for entry in entries] == [("a", PASSED), ("b", FAILED), ("b", PASSED)]
+    assert valid_end == len(path.read_bytes())
+    assert passed_keys(str(path)) == {"a", "b"}
+
+
+def test_a_new_run_starts_an_empty_journal(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    write_lines(path, {"key": "a", "outcome": PASSED})
+
+    journal = RunJournal(str(path))
+    journal.close()
+
+    assert read_journal(str(path)) == ([], 0)
+
+
+def test_recorder_journals_a_crashed_worker_as_a_failure(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    nodeid = "tests/test_search.py::test_enter_fly_data[row0-Madrid (MAD)-Barcelona (BCN)-5aa4b94bb0553b90]"
+    recorder = JournalRecorder(RunJournal(str(path)))
+
+    recorder.pytest_runtest_logstart(nodeid, None)
+    # xdist reports a test whose worker died once, with when='???'
+    recorder.pytest_runtest_logreport(SimpleNamespace(nodeid=nodeid, when="???", failed=True, skipped=False))
+    recorder.pytest_sessionfinish(None)
+
+    entries, _ = read_journal(str(path))
+    assert [entry["outcome"] for entry in entries] == ["started", FAILED]
@@ -0,0 +1,95 @@
+"""Tests of the longest-first plan used to spread the rows over xdist workers; no browser is needed."""
+from types import SimpleNamespace
+
+import pytest
+
+from utils.scheduler import (
+    fingerprint_from_nodeid, history_key, ideal_makespan, make_duration_scheduler, plan_lpt,
+)
+
+ROW_NODEID = "tests/test_search.py::test_enter_fly_data[row0-Madrid (MAD)-Barcelona (BCN)-5aa4b94bb0553b90]"
+
+
+def test_plan_lpt_gives_the_next_longest_test_to_the_least_loaded_worker():
+    durations = {"a": 5, "b": 4, "c": 3, "d": 3, "e": 1}
+    assignment, makespan = plan_lpt(durations, 2)
+
+    assert sorted(test for tests in assignment for test in tests) == sorted(durations)
+    assert assignment == [["a", "d"], ["b", "c", "e"]]
+    assert makespan == 8
+
+
+@pytest.mark.parametrize("workers", [1, 3, 8])
+def test_plan_lpt_makespan_is_the_busiest_worker(workers):
+    durations = {f"t{index}": seconds for index, seconds in enumerate([7, 1, 4, 4, 2, 9, 3])}
+    assignment, makespan = plan_lpt(durations, workers)
+
+    assert len(assignment) == workers
+    assert makespan == max(sum(durations[test] for test in tests) for tests in assignment)
+    assert makespan >= ideal_makespan(durations.values(), workers)
+
+
+def test_plan_lpt_without_tests():
+    assert plan_lpt({}, 2) == ([[], []], 0.0)
+
+
+def test_rows_are_keyed_by_fingerprint_and_other_tests_by_nodeid():
+    assert fingerprint_from_nodeid(ROW_NODEID) == "5aa4b94bb0553b90"
+    assert history_key(ROW_NODEID) == "5aa4b94bb0553b90"
+    assert history_key("tests/test_scheduler.py::test_plan_lpt_without_tests") == (
+        "tests/test_scheduler.py::test_plan_lpt_without_tests"
+    )
+
+
+class FakeNode:
+    """Stands in for an xdist WorkerController: records the tests sent to it."""
+
+    def __init__(self, worker_id):
+        self.gateway = SimpleNamespace(id=worker_id)
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def duration_scheduler(estimates, workers):
+    """A DurationScheduling over tests named after their estimate, with its fake worker nodes."""
+    pytest.importorskip("xdist")
+    config = SimpleNamespace(getvalue=lambda name: [f"{workers}*popen"], getoption=lambda name: 1)
+    scheduler = make_duration_scheduler(config, None, lambda nodeid: estimates[nodeid])
+    nodes = [FakeNode(f"gw{index}") for index in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, list(estimates))
+    return scheduler, nodes
+
+
+def test_duration_scheduling_deals_the_longest_tests_first():
+    estimates = {"t1": 1, "t5": 5, "t3": 3, "t9": 9, "t2": 2, "t7": 7}
+    scheduler, (first, second) = duration_scheduler(estimates, 2)
+
+    scheduler.schedule()
+
+    collection = list(estimates)
+    assert [collection[index] for index in first.sent] == ["t9", "t5"]
+    assert [collection[index] for index in second.sent] == ["t7", "t3"]
+    assert [collection[index] for index in scheduler.pending] == ["t2", "t1"]
+
+
+def test_duration_scheduling_requeues_a_crashed_node_in_longest_first_order():
+    estimates = {"t1": 1, "t5": 5, "t3": 3, "t9": 9, "t2": 2, "t7": 7, "t4": 4}
+    scheduler, (first, second) = duration_scheduler(estimates, 2)
+    scheduler.schedule()
+    collection = list(estimates)
+    # The second node crashes running t7 with t4 prefetched; the first one already holds two tests
+
+    crashed = scheduler.remove_node(second)
+
+    assert crashed == "t7"
+    assert [collection[index] for index in scheduler.pending] == ["t4", "t3", "t2", "t1"]
+    scheduler.mark_test_pending("t7")
+    assert [collection[index] for index in scheduler.pending] == ["t7", "t4", "t3", "t2", "t1"]
@@ -1,24 +1,36 @@
 import logging
 import os
-from time import sleep
 
 import pytest
 import allure
 
 from pages.home_page import HomePage
-from utils.data_provider import DataProvider
+from utils.data_provider import DataProvider, FlightRecord
 from utils.reporting import Reporting
 
 # Constants
 EXCEL = "Iberia_Flight_Data.xlsx"
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-excel_path = os.path.join(base_dir, 'data', EXCEL)
+excel_path = os.environ.get("IBERIA_FLIGHT_DATA", os.path.join(base_dir, 'data', EXCEL))
 test_name = os.path.splitext(os.path.basename(__file__))[0]
 
 # Logging the base directory and Excel path
 logging.info(base_dir)
 logging.info(excel_path)
 
+# Every Excel row becomes its own test case so pytest-xdist can spread them across workers
+# Rows that fail the pre-flight data checks are skipped by conftest (see _quarantine_flight_data)
+FLIGHT_ROWS = list(DataProvider.iter_records(excel_path))
+
+
+def row_id(index, data):
+    """
+    Build a readable test id for a flight row, e.g. 'row0-Madrid (MAD)-Barcelona (BCN)-5aa4b94bb0553b90'.
+    The trailing row fingerprint lets the scheduler track the row's duration across runs.
+    """
+    return f"row{index}-{data.origin}-{data.destiny}-{data.fingerprint()}"
+
+
 @allure.epic("Busqueda de vuelos")
 @allure.story("1.- Entrar en Iberia")
 def test_enter_mainpage(home_page: HomePage):
@@ -38,6 +50,9 @@ def test_accept_cookies(home_page: HomePage):
     """
     Test to accept cookies if the accept button is present.
     """
+    with allure.step("Dado que se navega a la web de Iberia"):
+        home_page.navigate_home()
+
     with allure.step("Dado que existe el botón de aceptar cookies"):
         if home_page.find_object(home_page.COOKIE_BTN):
             with allure.step("Se comprueba que se hace click en el botón de aceptar cookies"):
@@ -47,39 +62,47 @@ def test_accept_cookies(home_page: HomePage):
 
 @allure.epic("Busqueda de vuelos")
 @allure.story("3.- Introducir datos de vuelo")
-def test_enter_fly_data(home_page: HomePage):
+@pytest.mark.parametrize("data", [pytest.param(data, id=row_id(index, data)) for index, data in enumerate(FLIGHT_ROWS)])
+def test_enter_fly_data(search_page: HomePage, data: FlightRecord, fill_mode, results_writer):
     """
-    Test to enter flight data collected from an Excel file into the flight search form.
+    Test to enter one row of flight data collected from an Excel file into the flight search form.
+    With --fill-mode=fast the text fields are set in a single script instead of typed.
+    With --collect-results the search is submitted and the flights found are saved.
     """
     with allure.step("Dado que se recogen los datos de vuelo desde un Excel"):
-        flydata = DataProvider.read_excel_to_dict(excel_path)
+        allure.dynamic.title(f"Introducir datos de vuelo: {data.origin} - {data.destiny}")
 
         with allure.step("Cuando introduzco esos datos en el formulario de búsqueda de vuelos"):
-            for data in flydata:
+            if fill_mode == "fast":
+                # Origin, destination and dates in one script, checked with one read
+                assert search_page.fast_fill(data.origin, data.destiny, data.start_date, data.end_date)
+            else:
                 # Enter the flight origin
-                home_page.enter_origin(data['Origin'])
-                assert data['Origin'] == home_page.get_locator_attribute(home_page.ORIGIN_TXTBOX, home_page.ATR_VALUE)
+                search_page.enter_origin(data.origin)
+                assert data.origin == search_page.get_locator_attribute(search_page.ORIGIN_TXTBOX, search_page.ATR_VALUE)
 
                 # Enter the flight destination
-                home_page.enter_destiny(data['Destiny'])
+                search_page.enter_destiny(data.destiny)
 
                 # Enter the start date
-                home_page.enter_stardate(data['Start_Date'])
+                search_page.enter_stardate(data.start_date)
 
                 # Enter the end date
-                home_page.enter_enddate(data['End_Date'])
-
-                # Enter the passenger count
-                home_page.enter_passengers(data['Adult'], data['Child'], data['Baby'])
-
-                with allure.step("Se comprueba que el número de pasajeros es el esperado y se guarda una captura"):
-                    assert data['Adult'] == int(home_page.get_element_text(home_page.ADULT_COUNT))
-                    assert data['Child'] == int(home_page.get_element_text(home_page.CHILD_COUNT))
-                    assert data['Baby'] == int(home_page.get_element_text(home_page.BABY_COUNT))
+                search_page.enter_enddate(data.end_date)
 
-                    # Take screenshot for reporting
-                    reporting_instance = Reporting(home_page.driver)
-                    reporting_instance.take_screenshot(test_name)
+            # Enter the passenger count
+            assert search_page.enter_passengers(data.adult, data.child, data.baby)
 
+            with allure.step("Se comprueba que el número de pasajeros es el esperado y se guarda una captura"):
+                # Read the three counters in a single round trip
+                assert (data.adult, data.child, data.baby) == search_page.get_passenger_counts()
 
+                # Take screenshot for reporting
+                reporting_instance = Reporting(search_page.driver)
+                reporting_instance.take_screenshot(f"{test_name}_{data.origin}_{data.destiny}")
 
+        if results_writer is not None:
+            with allure.step("Se lanza la búsqueda y se guardan los vuelos encontrados"):
+                results_page = search_page.submit_search()
+                found = results_writer.write_all(results_page.iter_results(data.origin, data.destiny, data.start_date))
+                assert found > 0
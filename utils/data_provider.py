@@ -1,43 +1,280 @@
+import csv
+import hashlib
+import json
 import logging
-import pandas as pd
+import math
+import os
+import pickle
+import shutil
+from typing import NamedTuple, Optional
 
-# Configure the logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Spreadsheet columns, in the order they are stored in a FlightRecord
+COLUMNS = ("Origin", "Destiny", "Start_Date", "End_Date", "Adult", "Child", "Baby")
+PASSENGER_COLUMNS = ("Adult", "Child", "Baby")
+
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+CACHE_DIR_NAME = ".cache"
+CACHE_FORMAT_VERSION = 2
+CACHE_CHUNK_SIZE = 1000  # Rows per pickled chunk in the compiled cache
+
+
+class FlightRecord(NamedTuple):
+    """
+    One typed row of flight data.
+    Passenger counts are ints, or the raw cell when it is not a whole number (see utils/data_validation.py).
+    """
+
+    origin: str
+    destiny: str
+    start_date: str
+    end_date: str
+    adult: Optional[int]
+    child: Optional[int]
+    baby: Optional[int]
+
+    @classmethod
+    def from_values(cls, values):
+        """Build a record from raw cell values ordered as COLUMNS, normalising types."""
+        return cls(*(_to_int(value) if column in PASSENGER_COLUMNS else _to_text(value)
+                     for column, value in zip(COLUMNS, values)))
+
+    def as_row(self):
+        """Return the record as a dictionary keyed by the spreadsheet column names."""
+        return dict(zip(COLUMNS, self))
+
+    def fingerprint(self):
+        """Return a short stable hash of the row values, used to track a row across runs."""
+        return hashlib.sha1("\x1f".join(str(value) for value in self).encode("utf-8")).hexdigest()[:16]
+
+
+def _is_missing(value):
+    """Return True for empty cells: None, NaN or blank strings."""
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    return isinstance(value, str) and not value.strip()
+
+
+def _to_text(value):
+    """Convert a cell to text; dates are written as dd/mm/YYYY like the spreadsheet."""
+    if _is_missing(value):
+        return ""
+    if hasattr(value, "strftime"):
+        return value.strftime("%d/%m/%Y")
+    return str(value).strip()
+
+
+def _to_int(value):
+    """
+    Convert a passenger count cell to int, or None when the cell is empty.
+    Cells that are not a whole number ('two', 1.5) are kept as they are, so loading never fails
+    and the data validation can quarantine the row.
+    """
+    if _is_missing(value):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value.strip() if isinstance(value, str) else value
+    if not number.is_integer():
+        return value
+    return int(number)
+
+
+def _file_sha256(path):
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class DataProvider:
     """
-    DataProvider is a class that handles data extraction from Excel files.
+    DataProvider is a class that handles data extraction from Excel, CSV and JSON files.
+
+    Excel workbooks are compiled once into a binary cache next to the source file
+    (data/.cache). Later reads stream rows from that cache without importing pandas.
     """
 
+    @staticmethod
     def read_excel_to_dict(file_path):
         """
         Read an Excel file and convert its data into a list of dictionaries.
-        Logs warnings if any value is empty or None.
 
         :param file_path: Path of the Excel file to read.
-        :return: List of dictionaries with the data from the spreadsheet.
+        :return: List of dictionaries with the data from the spreadsheet, or None on error.
         """
         try:
-            # Read the Excel file into a pandas DataFrame
-            dataframe = pd.read_excel(file_path)
+            data_list = [record.as_row() for record in DataProvider.iter_records(file_path)]
+        except FileNotFoundError:
+            logger.error("File not found: %s", file_path)
+            return None
+        except Exception as e:
+            logger.error("Error reading the Excel file: %s", e)
+            return None
 
-            # Convert the DataFrame into a list of dictionaries (records)
-            data_list = dataframe.to_dict(orient='records')
+        return data_list
 
-            # Log the column names and their values for each row
-            for travel in data_list:
-                logger.info(f"Row data: {travel}")
-    
+    @staticmethod
+    def iter_records(file_path, use_cache=True):
+        """
+        Stream the rows of a data file as FlightRecord instances.
+
+        Excel files go through the compiled cache (rebuilt when the file's mtime and hash change).
+        CSV and JSON (a list of objects, or JSON lines with '.jsonl') are read directly without pandas.
+
+        :param file_path: Path of the .xlsx/.xls, .csv, .json or .jsonl file.
+        :param use_cache: Set to False to always parse the Excel file.
+        :return: Generator of FlightRecord.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in EXCEL_EXTENSIONS:
+            if not use_cache:
+                rows = DataProvider._parse_excel(file_path)
+            else:
+                rows = DataProvider._iter_cached_excel(file_path)
+        elif extension == ".csv":
+            rows = DataProvider._parse_csv(file_path)
+        elif extension in (".json", ".jsonl"):
+            rows = DataProvider._parse_json(file_path)
+        else:
+            raise ValueError(f"Unsupported data file type: {file_path}")
+
+        for values in rows:
+            record = FlightRecord.from_values(values)
+            logger.debug("Row data: %s", record)
+            yield record
+
+    @staticmethod
+    def cache_path(file_path):
+        """Return the path of the compiled cache for a source file."""
+        directory, name = os.path.split(os.path.abspath(file_path))
+        return os.path.join(directory, CACHE_DIR_NAME, name + ".rows")
+
+    @staticmethod
+    def _iter_cached_excel(file_path):
+        """Yield raw rows from the compiled cache, compiling the workbook first on a miss."""
+        cache_file = DataProvider.cache_path(file_path)
+        cache = DataProvider._open_cache(file_path, cache_file)
+        if cache is None:
+            DataProvider._compile_excel(file_path, cache_file)
+            cache = open(cache_file, "rb")
+            pickle.load(cache)  # Skip the header
+
+        with cache:
+            logger.info("Reading compiled data cache: %s", cache_file)
+            while True:
+                try:
+                    chunk = pickle.load(cache)
+                except EOFError:
+                    return
+                yield from chunk
+
+    @staticmethod
+    def _open_cache(file_path, cache_file):
+        """
+        Open the cache positioned after its header, or return None when it is missing or stale.
+        The cache is valid if the source mtime and size match, or else if its content hash matches;
+        in that case the header is updated with the new mtime and size so later reads skip the hash.
+        """
+        try:
+            cache = open(cache_file, "rb")
         except FileNotFoundError:
-            logger.error(f"File not found: {file_path}")
-        except pd.errors.EmptyDataError:
-            logger.error(f"The Excel file {file_path} is empty.")
-        except pd.errors.ParserError:
-            logger.error(f"Error parsing the Excel file: {file_path}")
-        except Exception as e:
-            logger.error(f"Error reading the Excel file: {str(e)}")
+            logger.info("No compiled data cache for %s, compiling it.", file_path)
+            return None
+
+        try:
+            header = pickle.load(cache)
+            if header.get("version") != CACHE_FORMAT_VERSION or header.get("columns") != COLUMNS:
+                raise ValueError("outdated cache format")
+            source_stat = os.stat(file_path)
+            if (header["mtime_ns"], header["size"]) != (source_stat.st_mtime_ns, source_stat.st_size):
+                # The file was touched: only a content change invalidates the cache
+                if header["sha256"] != _file_sha256(file_path):
+                    raise ValueError("source file changed")
+                return DataProvider._refresh_cache_header(cache, cache_file, header, source_stat)
+        except (ValueError, KeyError, EOFError, pickle.UnpicklingError) as e:
+            cache.close()
+            logger.info("Compiled data cache for %s is stale (%s), recompiling it.", file_path, e)
             return None
+        return cache
+
+    @staticmethod
+    def _refresh_cache_header(cache, cache_file, header, source_stat):
+        """
+        Rewrite the cache with the source's current mtime and size (the rows are copied unchanged)
+        and return it reopened after its header.
+        """
+        header = dict(header, mtime_ns=source_stat.st_mtime_ns, size=source_stat.st_size)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with cache, open(tmp_file, "wb") as refreshed:
+            pickle.dump(header, refreshed, protocol=pickle.HIGHEST_PROTOCOL)
+            shutil.copyfileobj(cache, refreshed)
+        try:
+            os.replace(tmp_file, cache_file)
+            logger.info("Source file was touched but not changed, updated the header of %s", cache_file)
+        except OSError as e:
+            # e.g. another process has the cache open on Windows; the next read hashes again
+            os.remove(tmp_file)
+            logger.warning("Could not update the header of %s: %s", cache_file, e)
+        cache = open(cache_file, "rb")
+        pickle.load(cache)  # Skip the header
+        return cache
+
+    @staticmethod
+    def _compile_excel(file_path, cache_file):
+        """Parse the workbook with pandas and write it to the cache as chunks of raw rows."""
+        source_stat = os.stat(file_path)
+        header = {
+            "version": CACHE_FORMAT_VERSION,
+            "columns": COLUMNS,
+            "mtime_ns": source_stat.st_mtime_ns,
+            "size": source_stat.st_size,
+            "sha256": _file_sha256(file_path),
+        }
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as cache:
+            pickle.dump(header, cache, protocol=pickle.HIGHEST_PROTOCOL)
+            chunk = []
+            for values in DataProvider._parse_excel(file_path):
+                chunk.append(tuple(FlightRecord.from_values(values)))
+                if len(chunk) == CACHE_CHUNK_SIZE:
+                    pickle.dump(chunk, cache, protocol=pickle.HIGHEST_PROTOCOL)
+                    chunk = []
+            if chunk:
+                pickle.dump(chunk, cache, protocol=pickle.HIGHEST_PROTOCOL)
+        # Atomic swap so concurrent workers never read a half written cache
+        os.replace(tmp_file, cache_file)
+        logger.info("Compiled %s into %s", file_path, cache_file)
+
+    @staticmethod
+    def _parse_excel(file_path):
+        """Yield raw rows from an Excel file. pandas/openpyxl are only imported here."""
+        import pandas as pd
+
+        dataframe = pd.read_excel(file_path, usecols=list(COLUMNS))
+        yield from dataframe[list(COLUMNS)].itertuples(index=False, name=None)
+
+    @staticmethod
+    def _parse_csv(file_path):
+        """Yield raw rows from a CSV file with the spreadsheet column names as header."""
+        with open(file_path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                yield tuple(row.get(column) for column in COLUMNS)
 
-        return data_list
\ No newline at end of file
+    @staticmethod
+    def _parse_json(file_path):
+        """Yield raw rows from a JSON list of objects, or from JSON lines ('.jsonl')."""
+        with open(file_path, encoding="utf-8") as file:
+            if file_path.lower().endswith(".jsonl"):
+                objects = (json.loads(line) for line in file if line.strip())
+            else:
+                objects = json.load(file)
+            for row in objects:
+                yield tuple(row.get(column) for column in COLUMNS)
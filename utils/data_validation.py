@@ -0,0 +1,224 @@
+"""
+Pre-flight validation of the flight data: every check runs as a pandas column operation over the
+whole sheet, so bad rows are quarantined before any browser starts instead of failing after
+seconds of typing and clicking.
+
+Usage:
+    python utils/data_validation.py                       # validate the Excel rows
+    python utils/data_validation.py --repeat 500000       # time it on a sheet replicated to ~1M rows
+"""
+import functools
+import logging
+import os
+import sys
+import time
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_provider import FlightRecord
+
+logger = logging.getLogger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATE_FORMAT = "%d/%m/%Y"
+# "Madrid (MAD)" or a bare IATA code "MAD"
+LOCATION_PATTERN = r"^(?:\S.*\s)?\(?([A-Z]{3})\)?$"
+
+# Passenger widget limits, kept in line with HomeForm (not imported to keep selenium out of this module)
+MIN_ADULTS = 1
+MAX_PASSENGERS = 9
+
+# Check name -> description shown in the quarantine report
+CHECKS = {
+    "bad_origin": "origin is not 'City (IATA)' or an IATA code",
+    "bad_destiny": "destination is not 'City (IATA)' or an IATA code",
+    "same_route_ends": "origin and destination are the same airport",
+    "bad_start_date": "start date is not a dd/mm/YYYY date",
+    "bad_end_date": "end date is not a dd/mm/YYYY date",
+    "end_before_start": "end date is before the start date",
+    "bad_adults": f"adults are missing or below {MIN_ADULTS}",
+    "bad_counts": "a passenger count is not a whole number",
+    "negative_counts": "negative child or baby count",
+    "too_many_passengers": f"more than {MAX_PASSENGERS} adults and children",
+    "babies_exceed_adults": "more babies than adults",
+    "duplicate_row": "duplicate of an earlier row",
+}
+
+
+class ValidationReport:
+    """Outcome of validate_frame: one boolean column per failed check, aligned with the data rows."""
+
+    def __init__(self, frame, issues):
+        self.frame = frame
+        self.issues = issues
+        self.invalid = issues.any(axis=1)
+
+    @property
+    def valid_count(self):
+        return int((~self.invalid).sum())
+
+    @property
+    def invalid_count(self):
+        return int(self.invalid.sum())
+
+    def counts(self):
+        """Check name -> number of rows failing it (only checks that failed)."""
+        totals = self.issues.sum()
+        return {name: int(count) for name, count in totals.items() if count}
+
+    def reasons(self):
+        """Series of '; '-joined check descriptions for the invalid rows, indexed by row position."""
+        import pandas as pd
+
+        failed = self.issues[self.invalid]
+        reasons = pd.Series("", index=failed.index, dtype=object)
+        for name in failed.columns:
+            mask = failed[name]
+            reasons[mask] = reasons[mask] + CHECKS[name] + "; "
+        return reasons.str.rstrip("; ")
+
+    def quarantine(self):
+        """The invalid rows with their position in the sheet and the reasons."""
+        quarantined = self.frame[self.invalid].copy()
+        quarantined.insert(0, "row", quarantined.index)
+        quarantined["reasons"] = self.reasons()
+        return quarantined
+
+    def write(self, path):
+        """Write the quarantined rows as CSV (nothing is written when every row is valid)."""
+        if not self.invalid_count:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.quarantine().to_csv(path, index=False)
+
+    def format(self, limit=20):
+        """Plain-text summary with the first `limit` quarantined rows."""
+        lines = [f"{self.valid_count} valid rows, {self.invalid_count} quarantined"]
+        for name, count in self.counts().items():
+            lines.append(f"  {count:>8}  {CHECKS[name]}")
+        for row, reason in self.reasons().head(limit).items():
+            lines.append(f"  row{row}: {reason}")
+        return "\n".join(lines)
+
+
+def frame_from_records(records):
+    """Build a DataFrame with the FlightRecord fields as columns from an iterable of records."""
+    import pandas as pd
+
+    # Object columns keep the raw passenger cells ('two', 1.5) for the quarantine report
+    return pd.DataFrame.from_records(records, columns=FlightRecord._fields)
+
+
+def _per_distinct(column, transform):
+    """
+    Apply a Series transform to the distinct values of a column only and broadcast the result back.
+    Generated sheets repeat a few airports and dates across many rows, so this skips most of the work.
+    """
+    import pandas as pd
+
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    result = transform(pd.Series(uniques, dtype=object))
+    return pd.Series(result.to_numpy()[codes], index=column.index)
+
+
+def validate_frame(frame, min_adults=MIN_ADULTS, max_passengers=MAX_PASSENGERS):
+    """
+    Run every check over the whole frame at once.
+
+    Args:
+        frame (DataFrame): Columns named like the FlightRecord fields.
+
+    Returns:
+        ValidationReport
+    """
+    import pandas as pd
+
+    issues = pd.DataFrame(index=frame.index)
+
+    def airport_code(values):
+        return values.fillna("").astype(str).str.strip().str.extract(LOCATION_PATTERN, expand=False)
+
+    def parse_date(values):
+        return pd.to_datetime(values, format=DATE_FORMAT, errors="coerce")
+
+    origin_code = _per_distinct(frame["origin"], airport_code)
+    destiny_code = _per_distinct(frame["destiny"], airport_code)
+    issues["bad_origin"] = origin_code.isna()
+    issues["bad_destiny"] = destiny_code.isna()
+    issues["same_route_ends"] = origin_code.notna() & (origin_code == destiny_code)
+
+    start = _per_distinct(frame["start_date"], parse_date)
+    end = _per_distinct(frame["end_date"], parse_date)
+    issues["bad_start_date"] = start.isna()
+    # An empty end date is a one-way trip
+    has_end = _per_distinct(frame["end_date"], lambda values: values.fillna("").astype(str).str.strip() != "")
+    issues["bad_end_date"] = has_end & end.isna()
+    issues["end_before_start"] = (end < start).fillna(False)
+
+    # Empty child and baby cells mean 0, like HomeForm.passenger_target
+    counts = {column: pd.to_numeric(frame[column], errors="coerce") for column in ("adult", "child", "baby")}
+    issues["bad_counts"] = False
+    for column, numbers in counts.items():
+        filled = frame[column].notna()
+        issues["bad_counts"] |= (filled & numbers.isna()) | (numbers % 1 != 0).fillna(False)
+    adult = counts["adult"]
+    child = counts["child"].fillna(0)
+    baby = counts["baby"].fillna(0)
+    issues["bad_adults"] = adult.isna() | (adult < min_adults)
+    issues["negative_counts"] = (child < 0) | (baby < 0)
+    issues["too_many_passengers"] = (adult.fillna(0) + child) > max_passengers
+    issues["babies_exceed_adults"] = baby > adult.fillna(0)
+
+    issues["duplicate_row"] = frame.duplicated(keep="first")
+    return ValidationReport(frame, issues.astype(bool))
+
+
+def validate_records(records, **limits):
+    """Validate an iterable of FlightRecord; see validate_frame."""
+    return validate_frame(frame_from_records(records), **limits)
+
+
+@functools.lru_cache(maxsize=None)
+def validate_file(path):
+    """Validate a data file once per process."""
+    from utils.data_provider import DataProvider
+
+    started = time.perf_counter()
+    report = validate_frame(frame_from_records(DataProvider.iter_records(path)))
+    logger.info("Validated %s rows of %s in %.2f s", len(report.frame), path, time.perf_counter() - started)
+    return report
+
+
+def main():
+    import argparse
+
+    import pandas as pd
+
+    from utils.data_provider import DataProvider
+
+    parser = argparse.ArgumentParser(description="Valida las filas de datos de vuelo antes de lanzar navegadores.")
+    parser.add_argument("data", nargs="?", default=os.path.join(project_root, "data", "Iberia_Flight_Data.xlsx"))
+    parser.add_argument("--report", help="CSV donde guardar las filas en cuarentena")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Replicar las filas N veces para medir el tiempo (las copias salen como duplicadas)")
+    args = parser.parse_args()
+
+    frame = frame_from_records(DataProvider.iter_records(args.data))
+    if args.repeat > 1:
+        frame = pd.concat([frame] * args.repeat, ignore_index=True)
+    started = time.perf_counter()
+    report = validate_frame(frame)
+    elapsed = time.perf_counter() - started
+    print(report.format())
+    print(f"{len(frame)} filas validadas en {elapsed:.2f} s")
+    if args.report:
+        report.write(args.report)
+    sys.exit(1 if report.invalid_count else 0)
+
+
+if __name__ == "__main__":
+    main()
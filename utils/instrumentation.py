@@ -0,0 +1,253 @@
+import contextvars
+import functools
+import heapq
+import html
+import inspect
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_STEPS = 20  # Rows in the "slowest steps" table
+MAX_DURATIONS = 2000  # Durations kept per histogram; beyond that percentiles come from a uniform sample
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list of numbers."""
+    ordered = sorted(values)
+    index = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+class DurationSeries:
+    """
+    Running count, total and max of durations, plus at most MAX_DURATIONS of them for the
+    percentiles (reservoir sampling), so memory does not grow with the number of calls.
+    """
+
+    __slots__ = ("count", "total", "max", "sample", "_random")
+
+    def __init__(self, seed=0):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.sample = []
+        self._random = random.Random(seed)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if len(self.sample) < MAX_DURATIONS:
+            self.sample.append(seconds)
+        else:
+            index = self._random.randrange(self.count)
+            if index < MAX_DURATIONS:
+                self.sample[index] = seconds
+
+
+def _histogram(series):
+    """Summarise a DurationSeries in seconds as count, total and p50/p95/max in milliseconds."""
+    return {
+        "count": series.count,
+        "total_ms": round(series.total * 1000, 1),
+        "p50_ms": round(percentile(series.sample, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(series.sample, 0.95) * 1000, 1),
+        "max_ms": round(series.max * 1000, 1),
+    }
+
+
+class ActionRecorder:
+    """
+    Collects per-action latency for page objects: time, WebDriver command count and
+    time spent waiting for each locator.
+
+    Actions nest (enter_origin calls click and type_text), so each one is recorded with its self
+    time and commands: what its nested instrumented calls took is subtracted and counted only
+    once, under the nested action. Totals across actions therefore add up to the real time.
+
+    Disabled by default; while disabled, instrumented methods only pay one attribute check.
+    Commands are counted per thread and per asyncio task, so concurrent sessions do not mix.
+    Samples are aggregated as they arrive, so memory stays flat however long the run is.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._commands = contextvars.ContextVar("webdriver_commands", default=0)
+        # [seconds, commands] of the nested calls of the innermost running action
+        self._frame = contextvars.ContextVar("instrumented_frame", default=None)
+        self._lock = threading.Lock()
+        self._original_execute = None
+        self.reset()
+
+    def reset(self):
+        """Forget every recorded sample."""
+        self.actions = defaultdict(DurationSeries)  # action -> durations
+        self.commands = defaultdict(int)  # action -> WebDriver commands
+        self.locators = defaultdict(DurationSeries)  # "action locator" -> durations
+        self.waits = defaultdict(DurationSeries)  # locator -> seconds waited
+        self.slowest = []  # min-heap of the SLOWEST_STEPS longest (seconds, order, action, locator, commands)
+        self._order = itertools.count()
+
+    def enable(self):
+        """Start recording and count WebDriver commands by wrapping WebDriver.execute."""
+        if self.enabled:
+            return
+        from selenium.webdriver.remote.webdriver import WebDriver
+
+        original_execute = WebDriver.execute
+        recorder = self
+
+        @functools.wraps(original_execute)
+        def counting_execute(driver, driver_command, params=None):
+            recorder.count_command()
+            return original_execute(driver, driver_command, params)
+
+        self._original_execute = original_execute
+        WebDriver.execute = counting_execute
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording and restore WebDriver.execute."""
+        if not self.enabled:
+            return
+        from selenium.webdriver.remote.webdriver import WebDriver
+
+        WebDriver.execute = self._original_execute
+        self._original_execute = None
+        self.enabled = False
+
+    def count_command(self):
+        """Count one WebDriver command for the current thread or task (AsyncWebDriver calls it directly)."""
+        self._commands.set(self._commands.get() + 1)
+
+    def measure(self, action, locator, func, *args, **kwargs):
+        """Run func and record its self time and the WebDriver commands it issued itself."""
+        started = self._enter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._exit(action, locator, started)
+
+    async def measure_async(self, action, locator, func, *args, **kwargs):
+        """Await the coroutine function func and record it like measure."""
+        started = self._enter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self._exit(action, locator, started)
+
+    def _enter(self):
+        frame = [0.0, 0]
+        return self._frame.get(), self._frame.set(frame), frame, self._commands.get(), time.perf_counter()
+
+    def _exit(self, action, locator, started):
+        parent, token, frame, commands_before, start = started
+        seconds = time.perf_counter() - start
+        commands = self._commands.get() - commands_before
+        self._frame.reset(token)
+        if parent is not None:
+            parent[0] += seconds
+            parent[1] += commands
+        self._add_step(action, locator, seconds - frame[0], commands - frame[1])
+
+    def _add_step(self, action, locator, seconds, commands):
+        with self._lock:
+            self.actions[action].add(seconds)
+            self.commands[action] += commands
+            if locator is not None:
+                self.locators[f"{action} {locator}"].add(seconds)
+            step = (seconds, next(self._order), action, locator, commands)
+            if len(self.slowest) < SLOWEST_STEPS:
+                heapq.heappush(self.slowest, step)
+            elif seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, step)
+
+    def record_wait(self, locator, seconds):
+        """Record time spent waiting for a locator."""
+        with self._lock:
+            self.waits[str(locator)].add(seconds)
+
+    def summary(self):
+        """Histograms per action, per locator and per waited locator, and the slowest steps."""
+        actions = {}
+        for action, series in self.actions.items():
+            actions[action] = _histogram(series)
+            actions[action]["commands"] = self.commands[action]
+
+        return {
+            "actions": actions,
+            "locators": {key: _histogram(series) for key, series in self.locators.items()},
+            "waits": {key: _histogram(series) for key, series in self.waits.items()},
+            "slowest_steps": [
+                {"action": action, "locator": None if locator is None else str(locator),
+                 "ms": round(seconds * 1000, 1), "commands": commands}
+                for seconds, _, action, locator, commands in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+    def write_summary(self, path):
+        """Write the summary as JSON and return it."""
+        summary = self.summary()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+        logger.info("Action timings written to %s", path)
+        return summary
+
+
+def slowest_steps_html(summary):
+    """Render the slowest steps and the per-action histograms as an HTML table for Allure."""
+    rows = "".join(
+        f"<tr><td>{html.escape(step['action'])}</td><td>{html.escape(step['locator'] or '')}</td>"
+        f"<td>{step['ms']}</td><td>{step['commands']}</td></tr>"
+        for step in summary["slowest_steps"]
+    )
+    action_rows = "".join(
+        f"<tr><td>{html.escape(action)}</td><td>{stats['count']}</td><td>{stats['p50_ms']}</td>"
+        f"<td>{stats['p95_ms']}</td><td>{stats['max_ms']}</td><td>{stats['commands']}</td></tr>"
+        for action, stats in sorted(summary["actions"].items(), key=lambda item: -item[1]["total_ms"])
+    )
+    return (
+        "<h3>Slowest steps</h3><table border='1'>"
+        "<tr><th>Action</th><th>Locator</th><th>ms</th><th>WebDriver commands</th></tr>"
+        f"{rows}</table>"
+        "<h3>Actions</h3><table border='1'>"
+        "<tr><th>Action</th><th>Count</th><th>p50 ms</th><th>p95 ms</th><th>max ms</th><th>Commands</th></tr>"
+        f"{action_rows}</table>"
+    )
+
+
+# Shared by every page object in the process
+recorder = ActionRecorder()
+
+
+def instrumented(func):
+    """Decorator for page-object actions (plain or async): records the call with `recorder` when it is enabled."""
+    action = func.__qualname__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            if not recorder.enabled:
+                return await func(self, *args, **kwargs)
+            locator = args[0] if args and isinstance(args[0], tuple) else None
+            return await recorder.measure_async(action, locator, func, self, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not recorder.enabled:
+            return func(self, *args, **kwargs)
+        locator = args[0] if args and isinstance(args[0], tuple) else None
+        return recorder.measure(action, locator, func, self, *args, **kwargs)
+
+    return wrapper
@@ -1,4 +1,12 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
 
 # ANSI escape codes for formatting log output in the terminal
 GREEN = '\033[92m'  # Green text formatting
@@ -10,41 +18,136 @@ RESET = '\033[0m'  # Reset formatting to default
 # Custom logging format with color and bold style
 LOG_FORMAT = '%(asctime)s - %(name)s - ' + BOLD + '%(levelname)s' + RESET + ' - ' + BOLD + '%(message)s' + RESET
 
+# Sinks fed by the background listener: "console" or the path of a JSON-lines file -> handler
+_sinks = {}
+_queue_handler = None
+_listener = None
+
 
 class CustomFormatter(logging.Formatter):
     """Custom formatter to apply color to logs based on their log level."""
-    
+
     def format(self, record):
-        # Apply color based on the log level
+        # Color a copy: the record is shared with every other handler
+        record = logging.makeLogRecord(record.__dict__)
         if record.levelname == 'INFO':
             record.levelname = GREEN + record.levelname + RESET
         elif record.levelname == 'WARNING':
             record.levelname = YELLOW + record.levelname + RESET
         elif record.levelname == 'ERROR':
-            record.msg = RED + record.msg + RESET
+            record.msg = RED + record.getMessage() + RESET
+            record.args = None
         return super().format(record)
 
 
-def configure_logging(level=logging.INFO):
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line, for machine processing."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Merges the message with its %-args on the caller's thread, so later changes to mutable
+    arguments do not leak into the log, and leaves the formatter work (timestamps, colors, JSON)
+    to the listener thread. The stock QueueHandler runs the whole formatter before enqueuing.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _restart_listener():
+    """(Re)start the background listener with the current sinks."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    _listener = logging.handlers.QueueListener(
+        _queue_handler.queue, *_sinks.values(), respect_handler_level=True
+    )
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush the queue and stop the listener thread (registered at exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for handler in _sinks.values():
+        try:
+            handler.flush()
+        except (OSError, ValueError):
+            pass
+
+
+def parse_levels(spec):
+    """Parse 'pages.base_page=WARNING,utils=DEBUG' into {'pages.base_page': 'WARNING', 'utils': 'DEBUG'}."""
+    levels = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level=logging.INFO, levels=None, jsonl_path=None):
     """
     Configures the logging settings with custom colors and styles.
-    
-    :param level: Logging level to set (default: INFO).
+
+    Records are put on a queue and written by a background listener thread, so logging calls
+    never block on console or file I/O. Safe to call several times: handlers are only added
+    once, later calls update levels and add sinks.
+
+    :param level: Logging level to set on the root logger (default: INFO).
+    :param levels: Per-module levels, e.g. {'pages.base_page': 'WARNING'} to silence per-click logs.
+    :param jsonl_path: Optional path of a JSON-lines log file.
     """
+    global _queue_handler
+
     # Set up the logger
     logger = logging.getLogger()
     logger.setLevel(level)
+    for name, module_level in (levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
 
-    # Create a stream handler for console output
-    handler = logging.StreamHandler()
+    first_call = _queue_handler is None
+    new_sink = bool(jsonl_path) and os.path.abspath(jsonl_path) not in _sinks
+    if not first_call and not new_sink:
+        return
 
-    # Set a custom formatter with color coding
-    handler.setFormatter(CustomFormatter(LOG_FORMAT))
+    if first_call:
+        # Console sink with color coding
+        # Bound to the stderr of the moment, like a plain StreamHandler; the listener thread
+        # must not follow pytest swapping sys.stderr per test
+        console = logging.StreamHandler(sys.stderr)
+        console.setFormatter(CustomFormatter(LOG_FORMAT))
+        _sinks["console"] = console
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
+        _queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+        logger.addHandler(_queue_handler)
+        atexit.register(shutdown_logging)
 
-    # Optional: Display a startup log message
-    logger.info("Logging has been configured.")
+    if new_sink:
+        os.makedirs(os.path.dirname(os.path.abspath(jsonl_path)), exist_ok=True)
+        json_handler = logging.FileHandler(jsonl_path, encoding="utf-8")
+        json_handler.setFormatter(JsonLinesFormatter())
+        _sinks[os.path.abspath(jsonl_path)] = json_handler
 
+    _restart_listener()
 
+    if first_call:
+        logger.info("Logging has been configured.")
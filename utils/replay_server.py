@@ -0,0 +1,279 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import urllib.error
+import urllib.request
+import zipfile
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ARCHIVE = os.path.join(project_root, "data", "replay", "iberia_home.zip")
+STATIC_SITE_DIR = os.path.join(project_root, "data", "site")  # Hand-written local copies of the pages
+MANIFEST_NAME = "manifest.json"
+ORIGIN_PREFIX = "/__origin__"  # Local path prefix for assets recorded from other origins
+
+# Every URL the page loaded: the document plus the resources reported by the Resource Timing API
+RESOURCE_URLS_SCRIPT = """
+return [document.URL].concat(performance.getEntriesByType('resource').map(function (entry) {
+    return entry.name;
+}));
+"""
+TEXT_CONTENT_TYPES = ("text/", "javascript", "json", "xml", "svg")
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def record_site(driver, archive_path, timeout=20):
+    """
+    Save the page currently loaded in `driver` and every resource it loaded into a zip archive.
+
+    The resource list comes from the browser; the bodies are downloaded again with the browser's
+    user agent so the archive holds the original (not rendered) documents and assets.
+
+    Returns:
+        int: Number of recorded URLs.
+    """
+    urls = list(dict.fromkeys(driver.execute_script(RESOURCE_URLS_SCRIPT)))
+    user_agent = driver.execute_script("return navigator.userAgent")
+    entries = {}
+
+    os.makedirs(os.path.dirname(os.path.abspath(archive_path)), exist_ok=True)
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        stored_bodies = set()
+        for url in urls:
+            if not url.startswith(("http://", "https://")):
+                continue
+            request = urllib.request.Request(url, headers={"User-Agent": user_agent})
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    status, content_type, body = response.status, response.headers.get("Content-Type", ""), response.read()
+            except urllib.error.HTTPError as e:
+                status, content_type, body = e.code, e.headers.get("Content-Type", ""), e.read()
+            except (urllib.error.URLError, OSError) as e:
+                logger.warning("Could not record %s: %s", url, e)
+                continue
+
+            body_name = "bodies/" + hashlib.sha1(body).hexdigest()
+            if body_name not in stored_bodies:
+                archive.writestr(body_name, body)
+                stored_bodies.add(body_name)
+            entries[url] = {"status": status, "content_type": content_type, "body": body_name}
+            logger.debug("Recorded %s %s", status, url)
+
+        manifest = {"url": urls[0], "entries": entries}
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+
+    logger.info("Recorded %s URLs from %s into %s", len(entries), urls[0], archive_path)
+    return len(entries)
+
+
+class ReplayArchive:
+    """Recorded responses of a site, rewritten on the fly to point at the local replay server."""
+
+    def __init__(self, archive_path):
+        self.archive_path = archive_path
+        with zipfile.ZipFile(archive_path) as archive:
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+            self.bodies = {name: archive.read(name) for name in archive.namelist() if name != MANIFEST_NAME}
+        self.start_url = manifest["url"]
+        self.entries = manifest["entries"]
+        self.primary_origin = _origin(self.start_url)
+        self.local_origin = None
+        self._rewritten = {}
+
+        hosts = sorted({urlsplit(url).netloc for url in self.entries}, key=len, reverse=True)
+        # Absolute and protocol-relative URLs, also with JSON-escaped slashes
+        self._url_pattern = re.compile(
+            r"(https?:)?(//|\\/\\/)(" + "|".join(re.escape(host) for host in hosts) + r")"
+        )
+
+    def _local_base(self, scheme, host):
+        """Local URL that replaces scheme://host in recorded content."""
+        if f"{scheme}://{host}" == self.primary_origin:
+            return self.local_origin
+        return f"{self.local_origin}{ORIGIN_PREFIX}/{scheme}/{host}"
+
+    def _rewrite(self, body):
+        """Point every recorded origin in a text body to the local server."""
+        primary_scheme = urlsplit(self.start_url).scheme
+
+        def replace(match):
+            scheme = (match.group(1) or primary_scheme + ":")[:-1]
+            local = self._local_base(scheme, match.group(3))
+            return local.replace("/", "\\/") if match.group(2) == "\\/\\/" else local
+
+        return self._url_pattern.sub(replace, body.decode("utf-8", "replace")).encode("utf-8")
+
+    def original_url(self, path):
+        """Map a local request path back to the recorded URL."""
+        if path.startswith(ORIGIN_PREFIX + "/"):
+            scheme, host, *rest = path[len(ORIGIN_PREFIX) + 1:].split("/", 2)
+            return f"{scheme}://{host}/{rest[0] if rest else ''}"
+        if path == "/":
+            return self.start_url
+        return self.primary_origin + path
+
+    def lookup(self, path):
+        """Return (status, content_type, body) for a local request path, or None if it was not recorded."""
+        url = self.original_url(path)
+        entry = self.entries.get(url) or self.entries.get(url.split("?", 1)[0])
+        if entry is None:
+            return None
+        if url not in self._rewritten:
+            body = self.bodies[entry["body"]]
+            if any(kind in entry["content_type"] for kind in TEXT_CONTENT_TYPES):
+                body = self._rewrite(body)
+            self._rewritten[url] = body
+        return entry["status"], entry["content_type"], self._rewritten[url]
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """Serves recorded responses; anything not in the archive is a 404, never a network request."""
+
+    def do_GET(self):
+        response = self.server.archive.lookup(self.path)
+        if response is None:
+            logger.debug("Not recorded: %s", self.path)
+            self.send_error(404)
+            return
+        status, content_type, body = response
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=3600")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class ReplayServer:
+    """Local HTTP server that replays a recorded site from an archive."""
+
+    def __init__(self, archive_path=DEFAULT_ARCHIVE, host="127.0.0.1", port=0):
+        self.archive = ReplayArchive(archive_path)
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """Local URL of the recorded start page."""
+        return self.archive.local_origin + "/"
+
+    def start(self):
+        """Start serving in a background thread and return self."""
+        self._server = ThreadingHTTPServer((self.host, self.port), _ReplayHandler)
+        self._server.daemon_threads = True
+        self._server.archive = self.archive
+        self.port = self._server.server_address[1]
+        self.archive.local_origin = f"http://{self.host}:{self.port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        logger.info("Replaying %s from %s at %s", self.archive.start_url, self.archive.archive_path, self.url)
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class _QuietStaticHandler(SimpleHTTPRequestHandler):
+    """Serves files from a directory, logging requests at DEBUG instead of stderr."""
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class StaticServer:
+    """Local HTTP server for the static copies of the pages in data/site."""
+
+    def __init__(self, directory=STATIC_SITE_DIR, host="127.0.0.1", port=0):
+        self.directory = directory
+        self.host = host
+        self.port = port
+        self._server = None
+
+    @property
+    def url(self):
+        """Base URL of the served directory."""
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        """Start serving in a background thread and return self."""
+        handler = partial(_QuietStaticHandler, directory=self.directory)
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="static-server", daemon=True).start()
+        logger.info("Serving %s at %s", self.directory, self.url)
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _record(args):
+    """Record the Iberia home page (with the cookie banner and the search form) using a real browser."""
+    sys.path.insert(0, project_root)
+    from drivers.driver_factory import create_driver
+    from pages.home_page import HomePage
+
+    driver = create_driver(args.browser)
+    try:
+        page = HomePage(driver)
+        page.navigate_home()
+        # Make sure the OneTrust banner and the form widgets have been loaded before recording
+        page.find_object(page.COOKIE_BTN)
+        page.find_object(page.ORIGIN_TXTBOX)
+        page.find_object(page.PASSENGERS)
+        record_site(driver, args.archive)
+    finally:
+        driver.quit()
+
+
+def _serve(args):
+    """Serve an archive until interrupted."""
+    server = ReplayServer(args.archive, port=args.port).start()
+    print(f"Sirviendo {server.archive.start_url} en {server.url} (Ctrl+C para parar)")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Graba la home de Iberia en un archivo y la sirve en local.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="Graba la home y sus recursos")
+    record_parser.add_argument("--archive", default=DEFAULT_ARCHIVE)
+    record_parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox"])
+    record_parser.set_defaults(func=_record)
+    serve_parser = subparsers.add_parser("serve", help="Sirve un archivo grabado")
+    serve_parser.add_argument("--archive", default=DEFAULT_ARCHIVE)
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.set_defaults(func=_serve)
+    args = parser.parse_args()
+    args.func(args)
@@ -1,9 +1,132 @@
+import base64
+import hashlib
+import itertools
+import logging
 import os
+import queue
+import threading
 import time
+
+import allure
+
 from pages.base_page import BasePage
 
-# Logger setup (can be uncommented when implemented)
-# logger = logging.getLogger(__name__)
+logger = logging.getLogger(__name__)
+
+# Determine the project root directory and the folder for storing screenshots
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_FOLDER = os.path.join(project_root, 'reports')
+
+# Viewport size, read before a downscaled capture
+VIEWPORT_SCRIPT = "return [document.documentElement.clientWidth, document.documentElement.clientHeight];"
+
+
+class ScreenshotService:
+    """
+    Takes screenshots on the test thread and saves them in the background.
+
+    The test thread grabs the PNG from the browser and attaches it to the current Allure test
+    (Allure tracks the running test per thread, so this cannot move to the worker). Writing the
+    copy in 'reports' happens on a worker thread. A frame identical to the previous one from the
+    same browser is skipped.
+    """
+
+    def __init__(self, reports_folder=REPORTS_FOLDER, scale=1.0, max_pending=32):
+        """
+        Args:
+            reports_folder (str): Directory where screenshots are saved.
+            scale (float): Default downscale factor for full-page captures (Chrome only, 1.0 = full size).
+            max_pending (int): Screenshots queued before the test thread waits for the worker.
+        """
+        self.reports_folder = reports_folder
+        self.scale = scale
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._last_digest = {}  # id(driver) -> digest of the last saved frame
+        self._worker = None
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+                self._worker.start()
+
+    def _grab(self, driver, element=None, scale=None):
+        """Return the screenshot as PNG bytes, scoped to an element or downscaled if asked."""
+        if element is not None:
+            return element.screenshot_as_png
+        scale = self.scale if scale is None else scale
+        if scale < 1.0 and hasattr(driver, "execute_cdp_cmd"):
+            width, height = driver.execute_script(VIEWPORT_SCRIPT)
+            clip = {"x": 0, "y": 0, "width": width, "height": height, "scale": scale}
+            return base64.b64decode(
+                driver.execute_cdp_cmd("Page.captureScreenshot", {"format": "png", "clip": clip})["data"]
+            )
+        return driver.get_screenshot_as_png()
+
+    def capture(self, driver, name, element=None, scale=None):
+        """
+        Take a screenshot and queue it for saving.
+
+        Args:
+            driver (WebDriver): Browser to capture.
+            name (str): Prefix of the file name, typically the test name.
+            element (WebElement): Capture only this element.
+            scale (float): Downscale factor for this capture (defaults to the service's scale).
+
+        Returns:
+            str: The file path the screenshot will be written to, or None if the frame was a duplicate.
+        """
+        png = self._grab(driver, element, scale)
+        digest = hashlib.sha1(png).hexdigest()
+        if self._last_digest.get(id(driver)) == digest:
+            logger.info("Screenshot %s skipped: identical to the previous frame", name)
+            return None
+        self._last_digest[id(driver)] = digest
+
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        file_path = os.path.join(self.reports_folder, f"{name}_{timestamp}_{next(self._sequence)}.png")
+
+        # A no-op outside an Allure run
+        allure.attach(png, name=name, attachment_type=allure.attachment_type.PNG)
+
+        self._ensure_worker()
+        self._queue.put((png, file_path))
+        return file_path
+
+    def _run(self):
+        """Worker loop: write the screenshots to disk, creating the reports folder on first use."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                png, file_path = item
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "wb") as file:
+                    file.write(png)
+                logger.info("%s SCREENSHOT SAVED", os.path.basename(file_path))
+            except Exception as e:
+                logger.error("Error saving screenshot: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued screenshot has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write the pending screenshots and stop the worker."""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        self._worker = None
+
+
+# Shared by every Reporting instance in the process
+screenshot_service = ScreenshotService()
+
 
 class Reporting(BasePage):
     """
@@ -20,47 +143,17 @@ class Reporting(BasePage):
         """
         super().__init__(driver)
 
-    def take_screenshot(self, name):
+    def take_screenshot(self, name, element=None, scale=None):
         """
-        Takes a screenshot and saves it in the 'reports' directory with a timestamp.
+        Takes a screenshot that is saved in the 'reports' directory with a timestamp and attached to Allure.
+        Saving happens in the background; consecutive identical frames are skipped.
 
         Args:
             name (str): The name of the screenshot file, typically related to the test.
+            element (WebElement): Capture only this element instead of the whole page.
+            scale (float): Downscale factor for full-page captures (Chrome only).
+
+        Returns:
+            str: Path of the screenshot file, or None if the frame was skipped.
         """
-        # Get the current timestamp
-        timestamp = time.strftime("%Y%m%d-%H%M%S")
-    
-        # Create the file name with timestamp
-        file_name = f"{name}_{timestamp}.png"
-        
-        # Determine the project root directory
-        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        # Define the path for storing screenshots
-        reports_folder = os.path.join(project_root, 'reports')
-        
-        # Log the reports folder path for reference
-        self.logger.info(reports_folder)
-
-        # Check if the 'reports' directory exists, and create it if not
-        if not os.path.exists(reports_folder):
-            os.makedirs(reports_folder)
-            self.logger.info(f"Created 'reports' directory at: {reports_folder}")
-        else:
-            self.logger.info(f"'reports' directory already exists at: {reports_folder}")
-        
-        # Generate the full file path for the screenshot
-        file_path = os.path.join(reports_folder, file_name)
-        
-        # Take the screenshot and save it to the specified path
-        self.driver.save_screenshot(file_path)
-
-        # Log the screenshot save action
-        self.logger.info("====================================================================================================")
-        self.logger.info(f"{file_name} SCREENSHOT SAVED")
-        self.logger.info("====================================================================================================")
-
-
-    
-        
-    
\ No newline at end of file
+        return screenshot_service.capture(self.driver, name, element, scale)
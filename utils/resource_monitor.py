@@ -0,0 +1,270 @@
+"""
+Per-test resource sampling of the pooled browsers: RSS of the driver and browser processes, the
+page's JS heap and the latency of a trivial WebDriver round trip. A browser whose memory or
+latency drift crosses a threshold is recycled by the pool between tests.
+"""
+import functools
+import json
+import logging
+import os
+import statistics
+import time
+from collections import deque
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+JS_HEAP_SCRIPT = "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : null;"
+
+PROBE_ROUNDS = 3  # Round trips timed per sample; the median is kept
+BASELINE_SAMPLES = 3  # First samples of a browser that make up its latency baseline
+DRIFT_WINDOW = 3  # Latest samples whose median is compared with the baseline
+MIN_DRIFT_MS = 5  # Ignore drift smaller than this in absolute terms (local round trips take ~1 ms)
+MAX_SAMPLES = 500  # Latest samples kept for the report; counters cover the whole run
+
+
+@functools.lru_cache(maxsize=None)
+def _psutil():
+    """The psutil module, or None when it is not installed (looked up once)."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil
+
+
+def _proc_children(pid):
+    """
+    Child pids of one process from /proc/<pid>/task/*/children, or None when the kernel does not
+    expose that file. Reading it is much cheaper than scanning every process on the machine.
+    """
+    try:
+        tasks = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return []
+    children = []
+    for task in tasks:
+        try:
+            with open(f"/proc/{pid}/task/{task}/children", encoding="ascii") as file:
+                children.extend(int(child) for child in file.read().split())
+        except FileNotFoundError:
+            return None
+        except OSError:
+            continue
+    return children
+
+
+def _children_map():
+    """Parent pid -> child pids of every process, from /proc."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii", errors="replace") as file:
+                parent = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    return children
+
+
+def descendants(pid):
+    """
+    Every process started (directly or not) by pid; psutil is used when installed. Without it
+    /proc is read per process, or scanned whole once per call on kernels without 'children' files.
+    """
+    psutil = _psutil()
+    if psutil is not None:
+        try:
+            return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    if not os.path.isdir("/proc"):
+        return []
+    children_map = None
+
+    def children(parent):
+        nonlocal children_map
+        if children_map is None:
+            found_children = _proc_children(parent)
+            if found_children is not None:
+                return found_children
+            children_map = _children_map()
+        return children_map.get(parent, ())
+
+    found, pending = [], list(children(pid))
+    while pending:
+        child = pending.pop()
+        found.append(child)
+        pending.extend(children(child))
+    return found
+
+
+def rss_bytes(pid):
+    """Resident set size of a process, or 0 when it is gone or cannot be read."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii", errors="replace") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    psutil = _psutil()
+    if psutil is None:
+        return 0
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return 0
+
+
+def process_rss(driver):
+    """
+    (driver process RSS, browser processes RSS) in bytes. The browser processes are the
+    descendants of the chromedriver/geckodriver process; (None, None) for remote sessions.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return None, None
+    return rss_bytes(process.pid), sum(rss_bytes(pid) for pid in descendants(process.pid))
+
+
+def js_heap_bytes(driver):
+    """Used JS heap of the current page: performance.memory, else CDP Runtime.getHeapUsage (Chrome)."""
+    try:
+        used = driver.execute_script(JS_HEAP_SCRIPT)
+        if used is None and hasattr(driver, "execute_cdp_cmd"):
+            used = driver.execute_cdp_cmd("Runtime.getHeapUsage", {}).get("usedSize")
+        return used
+    except Exception as e:
+        logger.debug("Could not read the JS heap: %s", e)
+        return None
+
+
+def probe_latency(driver, rounds=PROBE_ROUNDS):
+    """Median seconds of a no-op script round trip."""
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        driver.execute_script("return 1")
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def _mb(value):
+    return None if value is None else round(value / MB, 1)
+
+
+class ResourceSample(NamedTuple):
+    """Resources of one browser after one test."""
+
+    test: str
+    session: str
+    at: float
+    driver_rss_mb: Optional[float]
+    browser_rss_mb: Optional[float]
+    js_heap_mb: Optional[float]
+    latency_ms: float
+    baseline_ms: Optional[float]
+    drift: Optional[float]  # Recent latency / baseline latency of this browser
+    recycle: Optional[str]  # Threshold that was crossed, if any
+
+
+class ResourceMonitor:
+    """
+    Samples the browsers after every test and decides when one should be recycled.
+    Memory stays bounded on long runs: only the latest samples are kept for the report, and each
+    browser only keeps the latencies its baseline and drift window need.
+    """
+
+    def __init__(self, max_browser_rss_mb=0, max_js_heap_mb=0, max_latency_drift=0, max_samples=MAX_SAMPLES):
+        """
+        Args:
+            max_browser_rss_mb (float): Recycle when the browser processes use more memory (0 disables).
+            max_js_heap_mb (float): Recycle when the page's JS heap grows past this (0 disables).
+            max_latency_drift (float): Recycle when the round-trip latency is this many times
+                the browser's baseline (0 disables).
+            max_samples (int): Latest samples kept for the report.
+        """
+        self.max_browser_rss_mb = max_browser_rss_mb
+        self.max_js_heap_mb = max_js_heap_mb
+        self.max_latency_drift = max_latency_drift
+        self.samples = deque(maxlen=max_samples)
+        self.sampled = 0
+        self.recycled = 0
+        self._latencies = {}  # session id -> (first BASELINE_SAMPLES latencies, last DRIFT_WINDOW latencies) in ms
+
+    def sample(self, driver, test):
+        """Measure a browser after a test; the sample's `recycle` says whether to replace it."""
+        driver_rss, browser_rss = process_rss(driver)
+        js_heap = js_heap_bytes(driver)
+        latency_ms = probe_latency(driver) * 1000
+        first, recent = self._latencies.setdefault(driver.session_id, ([], deque(maxlen=DRIFT_WINDOW)))
+        recent.append(latency_ms)
+        baseline = drift = None
+        if len(first) < BASELINE_SAMPLES:
+            first.append(latency_ms)
+        else:
+            baseline = statistics.median(first)
+            drift = round(statistics.median(recent) / baseline, 2) if baseline else None
+
+        sample = ResourceSample(
+            test, driver.session_id, round(time.time(), 3), _mb(driver_rss), _mb(browser_rss), _mb(js_heap),
+            round(latency_ms, 2), None if baseline is None else round(baseline, 2), drift, None,
+        )
+        sample = sample._replace(recycle=self._crossed(sample))
+        self.samples.append(sample)
+        self.sampled += 1
+        logger.info("Browser resources after %s: browser %s MB, driver %s MB, JS heap %s MB, latency %.1f ms (x%s)",
+                    test, sample.browser_rss_mb, sample.driver_rss_mb, sample.js_heap_mb, latency_ms, drift)
+        if sample.recycle:
+            logger.warning("Recycling browser %s after %s: %s", driver.session_id, test, sample.recycle)
+            self.recycled += 1
+            self._latencies.pop(driver.session_id, None)
+        return sample
+
+    def _crossed(self, sample):
+        if self.max_browser_rss_mb and sample.browser_rss_mb and sample.browser_rss_mb > self.max_browser_rss_mb:
+            return f"browser RSS {sample.browser_rss_mb} MB > {self.max_browser_rss_mb} MB"
+        if self.max_js_heap_mb and sample.js_heap_mb and sample.js_heap_mb > self.max_js_heap_mb:
+            return f"JS heap {sample.js_heap_mb} MB > {self.max_js_heap_mb} MB"
+        if (self.max_latency_drift and sample.drift and sample.drift > self.max_latency_drift
+                and (sample.drift - 1) * sample.baseline_ms >= MIN_DRIFT_MS):
+            return f"latency drift x{sample.drift} > x{self.max_latency_drift}"
+        return None
+
+    def as_dict(self):
+        return {
+            "thresholds": {
+                "max_browser_rss_mb": self.max_browser_rss_mb,
+                "max_js_heap_mb": self.max_js_heap_mb,
+                "max_latency_drift": self.max_latency_drift,
+            },
+            "sampled": self.sampled,
+            "recycled": self.recycled,
+            "samples": [sample._asdict() for sample in self.samples],
+        }
+
+    def format(self):
+        """Plain-text trend, one line per test in run order (only the latest samples are kept)."""
+        lines = []
+        if self.sampled > len(self.samples):
+            lines.append(f"Last {len(self.samples)} of {self.sampled} samples, {self.recycled} browsers recycled")
+        lines += [f"{'browser MB':>10} {'driver MB':>10} {'heap MB':>8} {'rtt ms':>7} {'drift':>6}  test"]
+        for sample in self.samples:
+            lines.append(
+                f"{sample.browser_rss_mb if sample.browser_rss_mb is not None else '-':>10} "
+                f"{sample.driver_rss_mb if sample.driver_rss_mb is not None else '-':>10} "
+                f"{sample.js_heap_mb if sample.js_heap_mb is not None else '-':>8} "
+                f"{sample.latency_ms:>7.1f} {sample.drift if sample.drift is not None else '-':>6}  {sample.test}"
+                + (f"  -> recycled ({sample.recycle})" if sample.recycle else "")
+            )
+        return "\n".join(lines)
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.as_dict(), file, indent=2)
@@ -0,0 +1,166 @@
+"""
+Content-hash cache of row outcomes, for incremental runs.
+
+A row's cache key combines its values (the row fingerprint), a hash of the code it runs through
+(page objects, utilities, drivers and the tests themselves), the target URL, the browser and the
+options that change what a row does (--fill-mode, --collect-results). With --changed-only a row is
+skipped while its last pass is stored under the same key and has not expired, so only edited rows,
+rows that failed or were skipped and every row after a code change run again. Outcomes are only
+recorded on --changed-only runs, so other runs do not pay for hashing the code.
+
+Usage:
+    pytest --changed-only                  # run only rows whose key changed or whose result expired
+    python utils/result_cache.py           # show which rows would run
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.run_journal import PASSED, OutcomeTracker
+from utils.scheduler import fingerprint_from_nodeid
+
+logger = logging.getLogger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE = os.path.join(project_root, "data", ".cache", "results.json")
+CODE_DIRS = ("pages", "utils", "drivers", "tests")
+DEFAULT_TTL_HOURS = 24
+
+
+def file_digest(path):
+    """sha1 of a file's contents ('' when it does not exist)."""
+    if not os.path.exists(path):
+        return ""
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_digest(directories=CODE_DIRS, root=project_root):
+    """sha1 over the relative path and contents of every .py file under the given directories."""
+    digest = hashlib.sha1()
+    for directory in directories:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, directory)):
+            dirnames[:] = sorted(name for name in dirnames if name != "__pycache__")
+            for name in sorted(filenames):
+                if not name.endswith(".py"):
+                    continue
+                path = os.path.join(dirpath, name)
+                digest.update(os.path.relpath(path, root).replace(os.sep, "/").encode("utf-8"))
+                digest.update(b"\0")
+                digest.update(file_digest(path).encode("ascii"))
+    return digest.hexdigest()
+
+
+def run_target(browser, url, fill_mode, collect_results):
+    """The part of the cache key that describes where and how the rows run."""
+    return f"{browser}|{url}|fill={fill_mode}|collect={'yes' if collect_results else 'no'}"
+
+
+def cache_key(fingerprint, code, target):
+    """Key of a row's outcome: row values, code hash and target (URL and browser)."""
+    return hashlib.sha1("\x1f".join((fingerprint, code, target)).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Row fingerprint -> {"key", "outcome", "at"}, persisted as JSON."""
+
+    def __init__(self, path=DEFAULT_CACHE, ttl_hours=DEFAULT_TTL_HOURS):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as file:
+                    self.entries = json.load(file)
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable result cache %s: %s", path, e)
+
+    def is_fresh(self, fingerprint, key, now=None):
+        """True when the row passed under this same key less than ttl ago."""
+        entry = self.entries.get(fingerprint)
+        if not entry or entry["key"] != key or entry["outcome"] != PASSED:
+            return False
+        return (now or time.time()) - entry["at"] < self.ttl
+
+    def record(self, fingerprint, key, outcome):
+        self.entries[fingerprint] = {"key": key, "outcome": outcome, "at": round(time.time(), 3)}
+
+    def save(self):
+        """Write the cache atomically."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(self.entries, file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class ResultCacheRecorder:
+    """Pytest plugin for the controller process: stores the outcome of every row test under its key."""
+
+    def __init__(self, cache, key_for):
+        """
+        Args:
+            cache (ResultCache): Cache updated with this run's row outcomes.
+            key_for (callable): Row fingerprint -> cache key.
+        """
+        self.cache = cache
+        self.key_for = key_for
+        self.outcomes = OutcomeTracker()
+        self._recorded = 0
+
+    def pytest_runtest_logreport(self, report):
+        fingerprint = fingerprint_from_nodeid(report.nodeid)
+        if fingerprint is None:
+            return
+        # Quarantined rows never ran and are recorded as skipped: not a pass, but not a failure either
+        outcome = self.outcomes.final_outcome(report)
+        if outcome is not None:
+            self.cache.record(fingerprint, self.key_for(fingerprint), outcome)
+            self._recorded += 1
+
+    def pytest_sessionfinish(self, session):
+        if self._recorded:
+            self.cache.save()
+
+
+def main():
+    import argparse
+
+    from pages.home_page import HomePage
+    from utils.data_provider import DataProvider
+
+    parser = argparse.ArgumentParser(description="Muestra qué filas del Excel ejecutaría --changed-only.")
+    parser.add_argument("--data", default=os.path.join(project_root, "data", "Iberia_Flight_Data.xlsx"))
+    parser.add_argument("--cache", default=DEFAULT_CACHE)
+    parser.add_argument("--browser", default="chrome")
+    parser.add_argument("--url", default=HomePage.URL)
+    parser.add_argument("--fill-mode", default="keystroke", choices=("keystroke", "fast"))
+    parser.add_argument("--collect-results", action="store_true", help="Claves de una ejecución con --collect-results")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL_HOURS, help="Horas de validez de un resultado")
+    args = parser.parse_args()
+
+    cache = ResultCache(args.cache, args.ttl)
+    code = code_digest()
+    target = run_target(args.browser, args.url, args.fill_mode, args.collect_results)
+    pending = 0
+    for index, record in enumerate(DataProvider.iter_records(args.data)):
+        fingerprint = record.fingerprint()
+        if cache.is_fresh(fingerprint, cache_key(fingerprint, code, target)):
+            continue
+        pending += 1
+        print(f"row{index}: {record.origin} - {record.destiny}")
+    print(f"{pending} filas por ejecutar (código {code[:12]})")
+
+
+if __name__ == "__main__":
+    main()
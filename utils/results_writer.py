@@ -0,0 +1,115 @@
+import csv
+import logging
+import os
+import typing
+
+logger = logging.getLogger(__name__)
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+PARQUET_ROW_GROUP = 1000  # Rows buffered before a Parquet row group is written
+
+
+def _arrow_type(pa, python_type):
+    """pyarrow type of a record field annotation; Optional[X] maps like X."""
+    arguments = [argument for argument in typing.get_args(python_type) if argument is not type(None)]
+    if arguments:
+        python_type = arguments[0]
+    return {str: pa.string(), float: pa.float64(), int: pa.int64(), bool: pa.bool_()}[python_type]
+
+
+class ResultsWriter:
+    """
+    Streams records (NamedTuples) to a CSV or Parquet file as they arrive.
+
+    CSV rows are written and flushed per batch. Parquet rows are buffered up to PARQUET_ROW_GROUP
+    and written as one row group, so memory stays bounded however many records a run collects.
+    Parquet needs pyarrow, which is imported only when a .parquet file is requested.
+    """
+
+    def __init__(self, path, columns, types=None):
+        """
+        Args:
+            path (str): Output file; the format comes from the extension (.csv, .parquet).
+            columns (tuple): Field names of the records, in order.
+            types (dict): Column -> Python type (e.g. a NamedTuple's type hints) for the Parquet schema.
+                Without it the schema is inferred from the first row group, and a column that is
+                empty there is written as strings.
+        """
+        self.path = path
+        self.columns = tuple(columns)
+        self.types = types
+        self.count = 0
+        self._parquet = os.path.splitext(path)[1].lower() in PARQUET_EXTENSIONS
+        self._buffer = []
+        self._file = None
+        self._csv = None
+        self._parquet_writer = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if self._parquet:
+            import pyarrow  # noqa: F401  Fail now rather than after the first row group
+        else:
+            self._file = open(path, "w", newline="", encoding="utf-8")
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(self.columns)
+
+    def write(self, record):
+        """Write one record."""
+        self.count += 1
+        if self._parquet:
+            self._buffer.append(record)
+            if len(self._buffer) >= PARQUET_ROW_GROUP:
+                self._flush_parquet()
+        else:
+            self._csv.writerow(record)
+
+    def write_all(self, records):
+        """Write every record of an iterable (e.g. a generator) and return how many were written."""
+        written = 0
+        for record in records:
+            self.write(record)
+            written += 1
+        if self._file:
+            self._file.flush()
+        return written
+
+    def _flush_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffer:
+            return
+        rows = [dict(zip(self.columns, record)) for record in self._buffer]
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.path, self._parquet_schema(pa, rows))
+        # Every row group must match the file schema
+        table = pa.Table.from_pylist(rows, schema=self._parquet_writer.schema)
+        self._parquet_writer.write_table(table)
+        self._buffer.clear()
+
+    def _parquet_schema(self, pa, rows):
+        """The declared schema, or the one of the first rows with all-None (null) columns as strings."""
+        if self.types:
+            return pa.schema([(column, _arrow_type(pa, self.types[column])) for column in self.columns])
+        schema = pa.Table.from_pylist(rows).schema
+        for index, field in enumerate(schema):
+            if pa.types.is_null(field.type):
+                logger.warning("Column %s is empty in the first row group, writing it as strings", field.name)
+                schema = schema.set(index, field.with_type(pa.string()))
+        return schema
+
+    def close(self):
+        """Write what is buffered and close the file."""
+        if self._parquet:
+            self._flush_parquet()
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+        elif self._file:
+            self._file.close()
+            self._file = None
+        logger.info("Wrote %s records to %s", self.count, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,210 @@
+"""
+Run journal: an append-only JSON-lines log of every test's outcome, keyed like the duration history
+(row fingerprint for Excel rows, node id otherwise), so an interrupted run can be resumed.
+
+Each entry is written with a single os.write on an O_APPEND descriptor, so it reaches the OS as soon
+as the test finishes and survives the process being killed; fsync is batched to keep the disk cost
+low. A crash mid-write leaves at most one truncated final line, which is ignored when reading.
+
+Usage:
+    pytest --resume                    # skip the rows that already passed in the last run
+    python utils/run_journal.py        # summary of the journal
+"""
+import json
+import logging
+import os
+import sys
+import time
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.scheduler import fingerprint_from_nodeid, history_key
+
+logger = logging.getLogger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_JOURNAL = os.path.join(project_root, "data", ".cache", "run_journal.jsonl")
+
+# fsync after this many entries or this many seconds since the last one, whichever comes first
+FSYNC_EVERY = 20
+FSYNC_INTERVAL = 2.0
+
+STARTED = "started"
+PASSED = "passed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+def read_journal(path):
+    """
+    Read the entries of a journal, ignoring a truncated or corrupt final line.
+
+    Returns:
+        tuple: (list of entries, byte offset just after the last complete line).
+    """
+    entries = []
+    valid_end = 0
+    if not os.path.exists(path):
+        return entries, valid_end
+    with open(path, "rb") as file:
+        for line in file:
+            if not line.endswith(b"\n"):
+                logger.warning("Ignoring truncated last line of the run journal %s", path)
+                break
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                logger.warning("Ignoring corrupt line at byte %s of the run journal %s", valid_end, path)
+            valid_end += len(line)
+    return entries, valid_end
+
+
+def latest_outcomes(entries):
+    """Key -> outcome of its latest entry."""
+    return {entry["key"]: entry["outcome"] for entry in entries}
+
+
+class RunJournal:
+    """Append-only writer of the run journal."""
+
+    def __init__(self, path=DEFAULT_JOURNAL, resume=False, fsync_every=FSYNC_EVERY, fsync_interval=FSYNC_INTERVAL):
+        """
+        Args:
+            path (str): Journal file.
+            resume (bool): Keep the previous entries and append to them; otherwise the journal starts empty.
+            fsync_every (int): Entries written between two fsyncs.
+            fsync_interval (float): Seconds after which pending entries are fsynced anyway.
+        """
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.outcomes = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if resume:
+            entries, valid_end = read_journal(path)
+            self.outcomes = latest_outcomes(entries)
+        else:
+            valid_end = 0
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        # Start empty, or cut a half-written last line so the next entry starts on a line of its own
+        if os.fstat(self._fd).st_size > valid_end:
+            os.ftruncate(self._fd, valid_end)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.run_id = time.strftime("%Y%m%dT%H%M%S")
+
+    def passed(self, key):
+        return self.outcomes.get(key) == PASSED
+
+    def record(self, key, outcome, **fields):
+        """Append one entry; the latest entry of a key is its outcome."""
+        if self._fd is None:
+            return
+        entry = {"key": key, "outcome": outcome, "run": self.run_id, "at": round(time.time(), 3), **fields}
+        os.write(self._fd, (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.outcomes[key] = outcome
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """fsync the entries written so far."""
+        if self._fd is None or not self._unsynced:
+            return
+        os.fsync(self._fd)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._fd is None:
+            return
+        self.sync()
+        os.close(self._fd)
+        self._fd = None
+
+
+def passed_keys(path):
+    """Keys whose latest outcome in the journal is 'passed'."""
+    entries, _ = read_journal(path)
+    return {key for key, outcome in latest_outcomes(entries).items() if outcome == PASSED}
+
+
+def resumable(nodeid):
+    """Only the Excel rows are skipped on resume; the other tests are cheap and always run."""
+    return fingerprint_from_nodeid(nodeid) is not None
+
+
+class OutcomeTracker:
+    """
+    Collapses the setup, call and teardown reports of a test into its final outcome:
+    failed if any phase failed, skipped if any was skipped, passed otherwise.
+    """
+
+    def __init__(self):
+        self._failed = set()
+        self._skipped = set()
+
+    def final_outcome(self, report):
+        """Return the test's outcome on its last report, or None while more reports are due."""
+        if report.failed:
+            self._failed.add(report.nodeid)
+        elif report.skipped:
+            self._skipped.add(report.nodeid)
+        # A crashed xdist worker reports its test once, with when='???' and no teardown
+        if report.when in ("setup", "call"):
+            return None
+        if report.nodeid in self._failed:
+            outcome = FAILED
+        elif report.nodeid in self._skipped:
+            outcome = SKIPPED
+        else:
+            outcome = PASSED
+        self._failed.discard(report.nodeid)
+        self._skipped.discard(report.nodeid)
+        return outcome
+
+
+class JournalRecorder:
+    """
+    Pytest plugin for the controller process: journals when each test starts and how it ends.
+    With pytest-xdist a crashed worker is reported as a failure of the test it was running,
+    so only that row is run again on resume.
+    """
+
+    def __init__(self, journal):
+        self.journal = journal
+        self.outcomes = OutcomeTracker()
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self.journal.record(history_key(nodeid), STARTED, nodeid=nodeid)
+
+    def pytest_runtest_logreport(self, report):
+        outcome = self.outcomes.final_outcome(report)
+        if outcome is not None:
+            self.journal.record(history_key(report.nodeid), outcome, nodeid=report.nodeid)
+
+    def pytest_sessionfinish(self, session):
+        self.journal.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resume del diario de ejecución.")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL)
+    args = parser.parse_args()
+
+    entries, _ = read_journal(args.journal)
+    outcomes = latest_outcomes(entries)
+    nodeids = {entry["key"]: entry.get("nodeid", entry["key"]) for entry in entries}
+    counts = {}
+    for key, outcome in sorted(outcomes.items()):
+        counts[outcome] = counts.get(outcome, 0) + 1
+        if outcome != PASSED:
+            print(f"{outcome:<8} {nodeids[key]}")
+    print(", ".join(f"{outcome}: {count}" for outcome, count in sorted(counts.items())) or "Diario vacío")
+
+
+if __name__ == "__main__":
+    main()
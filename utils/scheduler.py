@@ -0,0 +1,315 @@
+"""
+Duration-aware scheduling of the flight rows across pytest-xdist workers.
+
+Every row test carries its row fingerprint in the test id. The controller keeps a history of how
+long each fingerprint took, estimates unseen rows from their passenger clicks, and dispatches the
+longest tests first: each worker holds one running test plus one prefetched, and takes the next
+longest pending test as soon as it finishes one, so early finishers pick up the remaining work.
+
+Usage:
+    pytest -n 4 --schedule=duration
+    python utils/scheduler.py --workers 4      # print the longest-first plan for the Excel rows
+"""
+import bisect
+import heapq
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_HISTORY = os.path.join(project_root, "data", ".cache", "durations.json")
+
+# Estimate for a row never seen before, before any history exists
+DEFAULT_ROW_SECONDS = 10.0
+DEFAULT_SECONDS_PER_CLICK = 0.25
+# Weight of the latest run in the moving average of a row's duration
+HISTORY_SMOOTHING = 0.5
+
+FINGERPRINT_PATTERN = re.compile(r"-([0-9a-f]{16})\]$")
+
+
+def fingerprint_from_nodeid(nodeid):
+    """Return the row fingerprint embedded in a parametrized test id, or None."""
+    match = FINGERPRINT_PATTERN.search(nodeid)
+    return match.group(1) if match else None
+
+
+def history_key(nodeid):
+    """Rows are tracked by fingerprint (stable when rows move in the sheet), other tests by node id."""
+    return fingerprint_from_nodeid(nodeid) or nodeid
+
+
+def passenger_clicks(record, default_adults=1):
+    """Number of counter clicks enter_passengers needs for a row, starting from the default 1 adult."""
+    adult, child, baby = (value if isinstance(value, int) else 0 for value in (record.adult, record.child, record.baby))
+    return abs(adult - default_adults) + child + baby
+
+
+class DurationHistory:
+    """Smoothed per-test durations, persisted as JSON: {key: {"seconds": float, "runs": int, "clicks": int}}."""
+
+    def __init__(self, path=DEFAULT_HISTORY):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as file:
+                    self.entries = json.load(file)
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable duration history %s: %s", path, e)
+
+    def record(self, key, seconds, clicks=None):
+        """Fold a new measurement into the moving average of a test."""
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = {"seconds": seconds, "runs": 0}
+        else:
+            entry["seconds"] += HISTORY_SMOOTHING * (seconds - entry["seconds"])
+        entry["runs"] += 1
+        if clicks is not None:
+            entry["clicks"] = clicks
+
+    def click_model(self):
+        """
+        Fit seconds = base + per_click * clicks on the rows with history (least squares).
+        Falls back to the defaults when the history cannot support a fit.
+        """
+        points = [(entry["clicks"], entry["seconds"]) for entry in self.entries.values() if "clicks" in entry]
+        if not points:
+            return DEFAULT_ROW_SECONDS, DEFAULT_SECONDS_PER_CLICK
+        mean_clicks = sum(clicks for clicks, _ in points) / len(points)
+        mean_seconds = sum(seconds for _, seconds in points) / len(points)
+        spread = sum((clicks - mean_clicks) ** 2 for clicks, _ in points)
+        if spread == 0:
+            return max(mean_seconds - DEFAULT_SECONDS_PER_CLICK * mean_clicks, 0.0), DEFAULT_SECONDS_PER_CLICK
+        per_click = sum((clicks - mean_clicks) * (seconds - mean_seconds) for clicks, seconds in points) / spread
+        per_click = max(per_click, 0.0)
+        return max(mean_seconds - per_click * mean_clicks, 0.0), per_click
+
+    def estimate(self, key, clicks=None, model=None):
+        """Seconds expected for a test: its history, else the click model for rows, else the mean of all tests."""
+        if key in self.entries:
+            return self.entries[key]["seconds"]
+        if clicks is not None:
+            base, per_click = model or self.click_model()
+            return base + per_click * clicks
+        if self.entries:
+            return sum(entry["seconds"] for entry in self.entries.values()) / len(self.entries)
+        return DEFAULT_ROW_SECONDS
+
+    def save(self):
+        """Write the history atomically."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(self.entries, file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def plan_lpt(durations, workers):
+    """
+    Longest-processing-time-first assignment of tests to workers.
+
+    Args:
+        durations (dict): Test -> expected seconds.
+        workers (int): Number of workers.
+
+    Returns:
+        tuple: (list of per-worker test lists, predicted makespan in seconds).
+    """
+    loads = [(0.0, worker) for worker in range(workers)]
+    assignment = [[] for _ in range(workers)]
+    for test, seconds in sorted(durations.items(), key=lambda item: -item[1]):
+        load, worker = heapq.heappop(loads)
+        assignment[worker].append(test)
+        heapq.heappush(loads, (load + seconds, worker))
+    return assignment, max(load for load, _ in loads) if durations else 0.0
+
+
+def ideal_makespan(durations, workers):
+    """Lower bound of the makespan: perfect split of the total, but never below the longest test."""
+    durations = list(durations)
+    if not durations:
+        return 0.0
+    return max(sum(durations) / workers, max(durations))
+
+
+def balance_report(worker_busy, test_durations):
+    """
+    Compare the achieved makespan of a run with the ideal one.
+
+    Args:
+        worker_busy (dict): Worker id -> seconds spent running tests.
+        test_durations (list[float]): Duration of every test in the run.
+    """
+    workers = max(len(worker_busy), 1)
+    achieved = max(worker_busy.values(), default=0.0)
+    ideal = ideal_makespan(test_durations, workers)
+    return {
+        "workers": workers,
+        "tests": len(test_durations),
+        "achieved_makespan_s": round(achieved, 3),
+        "ideal_makespan_s": round(ideal, 3),
+        "balance": round(ideal / achieved, 3) if achieved else 1.0,
+        "worker_busy_s": {worker: round(seconds, 3) for worker, seconds in sorted(worker_busy.items())},
+    }
+
+
+class DurationRecorder:
+    """
+    Pytest plugin for the controller process: feeds test durations into the history and reports
+    the achieved vs ideal balance of the run.
+    """
+
+    def __init__(self, history, clicks=None, report_path=None):
+        """
+        Args:
+            history (DurationHistory): History updated with this run's durations.
+            clicks (callable): Returns row fingerprint -> passenger clicks, kept in the history for the
+                click model. Called on first use so the flight data is not read during startup.
+            report_path (str): Where to write the balance report as JSON.
+        """
+        self.history = history
+        self._clicks_loader = clicks
+        self._clicks = None
+        self.report_path = report_path
+        self.durations = {}  # nodeid -> seconds (setup + call + teardown)
+        self.worker_busy = {}
+        self.report = None
+
+    @property
+    def clicks(self):
+        if self._clicks is None:
+            self._clicks = self._clicks_loader() if self._clicks_loader else {}
+        return self._clicks
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None else "main"
+        self.worker_busy[worker] = self.worker_busy.get(worker, 0.0) + report.duration
+        if report.when == "teardown":
+            key = history_key(report.nodeid)
+            self.history.record(key, self.durations[report.nodeid], self.clicks.get(key))
+
+    def pytest_sessionfinish(self, session):
+        if not self.durations:
+            return
+        self.history.save()
+        self.report = balance_report(self.worker_busy, list(self.durations.values()))
+        if self.report_path:
+            os.makedirs(os.path.dirname(self.report_path), exist_ok=True)
+            with open(self.report_path, "w", encoding="utf-8") as file:
+                json.dump(self.report, file, indent=2)
+        logger.info("Schedule balance: %s", self.report)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.report:
+            terminalreporter.write_line(
+                f"Makespan {self.report['achieved_makespan_s']} s vs ideal {self.report['ideal_makespan_s']} s "
+                f"on {self.report['workers']} worker(s), balance {self.report['balance']:.0%}"
+            )
+
+
+def make_duration_scheduler(config, log, estimate):
+    """
+    Build the xdist scheduler for --schedule=duration. Imported lazily so the module does not
+    need pytest-xdist unless that scheduler is used.
+
+    Args:
+        estimate (callable): Node id -> expected seconds.
+    """
+    from xdist.scheduler import LoadScheduling
+
+    class DurationScheduling(LoadScheduling):
+        """LoadScheduling that sends the longest pending test to whichever worker frees up first."""
+
+        # One test running and one prefetched, so a worker never waits on the controller
+        PREFETCH = 2
+
+        def schedule(self):
+            assert self.collection_is_completed
+            if self.collection is not None:
+                for node in self.nodes:
+                    self.check_schedule(node)
+                return
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
+            self.collection = next(iter(self.node2collection.values()))
+            self._estimates = [estimate(nodeid) for nodeid in self.collection]
+            self.pending[:] = sorted(range(len(self.collection)), key=self._order)
+            # Deal one test per worker per round so the longest tests land on different workers
+            for _ in range(self.PREFETCH):
+                for node in self.nodes:
+                    self._send_tests(node, 1)
+            if not self.pending:
+                for node in self.nodes:
+                    node.shutdown()
+
+        def check_schedule(self, node, duration=0):
+            if node.shutting_down:
+                return
+            if self.pending:
+                missing = self.PREFETCH - len(self.node2pending[node])
+                if missing > 0:
+                    self._send_tests(node, missing)
+            else:
+                node.shutdown()
+
+        def _order(self, index):
+            return -self._estimates[index]
+
+        def _requeue(self, indices):
+            """Insert tests into the pending queue at their longest-first place, before any is dispatched."""
+            for index in indices:
+                bisect.insort(self.pending, index, key=self._order)
+            for node in self.nodes:
+                self.check_schedule(node)
+
+        def mark_test_pending(self, item):
+            self._requeue([self.collection.index(item)])
+
+        def remove_node(self, node):
+            pending = self.node2pending.pop(node)
+            if not pending:
+                return None
+            # The first pending test is the one the node was running when it crashed
+            crashitem = self.collection[pending.pop(0)]
+            self._requeue(pending)
+            return crashitem
+
+    return DurationScheduling(config, log)
+
+
+def main():
+    import argparse
+
+    sys.path.insert(0, project_root)
+    from utils.data_provider import DataProvider
+
+    parser = argparse.ArgumentParser(description="Muestra el reparto longest-first de las filas del Excel entre workers.")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--data", default=os.path.join(project_root, "data", "Iberia_Flight_Data.xlsx"))
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    args = parser.parse_args()
+
+    history = DurationHistory(args.history)
+    model = history.click_model()
+    durations = {}
+    for record in DataProvider.iter_records(args.data):
+        durations[record] = history.estimate(record.fingerprint(), passenger_clicks(record), model)
+    assignment, makespan = plan_lpt(durations, args.workers)
+    for worker, records in enumerate(assignment):
+        load = sum(durations[record] for record in records)
+        print(f"gw{worker}: {load:8.2f} s  " + ", ".join(f"{r.origin}-{r.destiny}" for r in records))
+    print(f"Makespan previsto {makespan:.2f} s, ideal {ideal_makespan(durations.values(), args.workers):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Overlapped session startup: the driver pool is launched and the home page opened in a background
+thread while pytest collects the tests and loads the flight data, with a timeline of every step.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+def process_age():
+    """Seconds since the current process started (from /proc), or None where it is not available."""
+    try:
+        with open("/proc/self/stat", encoding="ascii") as file:
+            start_ticks = int(file.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="ascii") as file:
+            uptime = float(file.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimeline:
+    """Named marks and spans measured from the moment the timeline is created (conftest import)."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.started_at = time.time()
+        self.imports_s = process_age()  # Interpreter start up to the timeline creation
+        self.events = []
+        self._lock = threading.Lock()
+
+    def _elapsed(self):
+        return time.perf_counter() - self.origin
+
+    def mark(self, name):
+        """Record an instant event."""
+        self._add(name, self._elapsed(), 0.0)
+
+    @contextmanager
+    def span(self, name):
+        """Record the duration of the enclosed block."""
+        start = self._elapsed()
+        try:
+            yield
+        finally:
+            self._add(name, start, self._elapsed() - start)
+
+    def _add(self, name, start, duration):
+        with self._lock:
+            self.events.append({
+                "name": name,
+                "start_s": round(start, 3),
+                "duration_s": round(duration, 3),
+                "thread": threading.current_thread().name,
+            })
+
+    def first(self, name):
+        """Return the first event with this name, or None."""
+        with self._lock:
+            return next((event for event in self.events if event["name"] == name), None)
+
+    def as_dict(self):
+        first_interaction = self.first("first_interaction")
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["start_s"])
+        return {
+            "started_at": self.started_at,
+            "imports_s": round(self.imports_s, 3) if self.imports_s is not None else None,
+            "time_to_first_interaction_s": first_interaction["start_s"] if first_interaction else None,
+            "events": events,
+        }
+
+    def format(self):
+        """Plain-text timeline, one event per line in start order."""
+        data = self.as_dict()
+        lines = [f"{'start s':>8} {'took s':>8}  {'thread':<20} event"]
+        for event in data["events"]:
+            lines.append(f"{event['start_s']:>8.3f} {event['duration_s']:>8.3f}  {event['thread']:<20} {event['name']}")
+        lines.append(f"Time to first interaction: {data['time_to_first_interaction_s']} s "
+                     f"(+{data['imports_s']} s interpreter and imports before conftest)")
+        return "\n".join(lines)
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.as_dict(), file, indent=2)
+
+
+class StartupOrchestrator:
+    """
+    Launches the driver pool in a background thread as soon as the session starts and, optionally,
+    opens the first page on one of its browsers. The test thread only waits when it first needs the pool.
+    """
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="startup")
+        self._future = None
+        self._warm_driver = None
+
+    def launch(self, build_pool, warm=None):
+        """
+        Start building the pool in the background.
+
+        Args:
+            build_pool (callable): Returns a ready DriverPool.
+            warm (callable): Optional warm(driver) run on one leased browser, e.g. opening the home page.
+                That browser is handed to the first test through take_warm_driver().
+        """
+        self._future = self._executor.submit(self._launch, build_pool, warm)
+
+    def _launch(self, build_pool, warm):
+        with self.timeline.span("pool_launch"):
+            pool = build_pool()
+        if warm is not None:
+            driver = pool.acquire()
+            try:
+                with self.timeline.span("warm_navigation"):
+                    warm(driver)
+                self._warm_driver = driver
+            except Exception as e:
+                logger.warning("Warm navigation failed, the first test will navigate itself: %s", e)
+                pool.release(driver)
+        return pool
+
+    @property
+    def launched(self):
+        return self._future is not None
+
+    def pool(self):
+        """Return the pool, waiting for the background launch to finish (re-raises its error)."""
+        with self.timeline.span("wait_for_pool"):
+            return self._future.result()
+
+    def take_warm_driver(self):
+        """Return the browser prepared by the warm step once; None afterwards."""
+        driver, self._warm_driver = self._warm_driver, None
+        return driver
+
+    def shutdown(self):
+        """
+        Wait for the background launch and quit the browsers it started. Safe to call more than once
+        and whether or not a test ever claimed the pool (every test may have been deselected).
+        """
+        self._executor.shutdown(wait=True)
+        if self._future is None or self._future.exception() is not None:
+            return
+        pool = self._future.result()
+        pool.close()
+        if pool.snapshot:
+            pool.snapshot.cleanup()